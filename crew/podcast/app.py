@@ -1,13 +1,36 @@
-from flask import Flask, render_template, jsonify, request, send_from_directory
+from flask import (Flask, Response, render_template, jsonify, redirect, request, send_file, send_from_directory,
+                   stream_with_context)
+from werkzeug.security import safe_join
 import os
-import threading
 import json
 import time
+import hashlib
+import mimetypes
 from datetime import datetime
 import uuid
 import logging
 import sys
+import threading
 
+from podcast.src.podcast.audio_delivery import (COMPRESSIBLE_EXTENSIONS, accel_location, audio_dir, cache_max_age,
+                                                compressed_path, content_etag, content_version, offload_mode,
+                                                versioned_audio_url)
+from podcast.src.podcast.batches import Batch, get_batch_store
+from podcast.src.podcast.checkpoints import CREW_TASKS, get_checkpoint_store
+from podcast.src.podcast.events import EventBroker, format_sse
+from podcast.src.podcast.http_client import get_http_client
+from podcast.src.podcast.job_store import FINISHED_STATUSES, JobRepository, JobStore, summarize
+from podcast.src.podcast.live_audio import get_live_episodes
+from podcast.src.podcast.llm_cache import get_llm_cache
+from podcast.src.podcast.metrics import JOB_SECONDS, JOBS_TOTAL, REGISTRY
+from podcast.src.podcast.ollama_pool import get_ollama_pool
+from podcast.src.podcast.registry import get_agent_pool
+from podcast.src.podcast.research_index import get_research_index
+from podcast.src.podcast.scheduler import JobScheduler
+from podcast.src.podcast.search_cache import get_search_cache
+from podcast.src.podcast.tracing import add_event, get_trace, profile_path, trace_job
+from podcast.src.podcast.tts_cache import get_tts_cache
+from podcast.src.podcast.warmup import ModelWarmer, warmup_enabled
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -46,58 +69,121 @@ os.makedirs(os.path.dirname(memory_db_path), exist_ok=True)
 
 app = Flask(__name__)
 
-# Global variables to track state
-podcasts = {}
-current_job = None
-job_queue = []
-
 class PodcastJob:
-    def __init__(self, topic=None, hosts=None):
+    def __init__(self, topic=None, hosts=None, batch_id=None):
         self.id = str(uuid.uuid4())
         self.topic = topic or "Current Events"
         self.hosts = hosts or ["Alex", "Simon"]
+        self.batch_id = batch_id
         self.status = "queued"
         self.progress = 0
         self.stages = ["research", "summarize", "script", "voice", "complete"]
         self.current_stage = ""
+        self.created_at = time.time()
         self.start_time = None
         self.end_time = None
         self.updates = []
+        # Incremented on every update, used for ETags
+        self.version = 0
         self.results = {
             "research": {},
             "summary": "",
             "script": "",
             "audio_url": ""
         }
+        # Called with (job, index, update) after every update
+        self.listeners = []
+        # Streamed LLM output per stage while the crew is running (not persisted)
+        self.partial = {}
+        # "resume" or "revoice" when the job is queued again from its checkpoints
+        self.resume_mode = None
+        # Updates come from pool threads too (TTS, research queries), each must get its own index
+        self._update_lock = threading.Lock()
     
     def to_dict(self):
         return {
             "id": self.id,
             "topic": self.topic,
             "hosts": self.hosts,
+            "batch_id": self.batch_id,
             "status": self.status,
             "progress": self.progress,
             "current_stage": self.current_stage,
+            "created_at": datetime.fromtimestamp(self.created_at).isoformat(),
             "start_time": self.start_time.isoformat() if self.start_time else None,
             "end_time": self.end_time.isoformat() if self.end_time else None,
+            "version": self.version,
             "updates": self.updates,
-            "results": self.results
+            "results": self.results,
+            "partial": self.partial
         }
     
+    def to_record(self):
+        """Serialize the job for the job store (the update log is stored separately)"""
+        record = self.to_dict()
+        del record["updates"]
+        del record["partial"]
+        record["created_at"] = self.created_at
+        record["updates_count"] = len(self.updates)
+        return record
+    
+    def to_summary(self):
+        """Lightweight projection without the update log and results"""
+        return summarize(self.to_record())
+    
+    @classmethod
+    def from_record(cls, record):
+        """Rebuild a job from a stored record"""
+        job = cls(topic=record.get("topic"), hosts=record.get("hosts"), batch_id=record.get("batch_id"))
+        job.id = record["id"]
+        job.status = record.get("status", job.status)
+        job.progress = record.get("progress", 0)
+        job.current_stage = record.get("current_stage", "")
+        job.version = record.get("version") or 0
+        job.created_at = record.get("created_at") or job.created_at
+        job.start_time = datetime.fromisoformat(record["start_time"]) if record.get("start_time") else None
+        job.end_time = datetime.fromisoformat(record["end_time"]) if record.get("end_time") else None
+        job.updates = record.get("updates") or []
+        job.results.update(record.get("results") or {})
+        return job
+    
     def add_update(self, message, stage=None):
-        if stage and stage != self.current_stage:
-            self.current_stage = stage
-            if stage in self.stages:
-                stage_index = self.stages.index(stage)
-                self.progress = int((stage_index / len(self.stages)) * 100)
-        
-        update = {
-            "time": datetime.now().isoformat(),
-            "message": message,
-            "stage": self.current_stage
-        }
-        self.updates.append(update)
+        with self._update_lock:
+            if stage and stage != self.current_stage:
+                self.current_stage = stage
+                if stage in self.stages:
+                    stage_index = self.stages.index(stage)
+                    self.progress = int((stage_index / len(self.stages)) * 100)
+            
+            update = {
+                "time": datetime.now().isoformat(),
+                "message": message,
+                "stage": self.current_stage
+            }
+            self.updates.append(update)
+            index = len(self.updates) - 1
+            self.version += 1
         logger.info(f"Job {self.id}: {message}")
+        add_event(message, stage=update["stage"])
+        
+        for listener in self.listeners:
+            try:
+                listener(self, index, update)
+            except Exception as e:
+                logger.error(f"Job {self.id}: update listener failed: {str(e)}")
+    
+    def add_partial(self, stage, text, offset):
+        """
+        Append streamed LLM output of a stage
+        
+        Returns:
+            bool: False if the chunk does not continue the text received so far
+        """
+        current = self.partial.get(stage, "")
+        if offset != len(current):
+            return False
+        self.partial[stage] = current + text
+        return True
     
     def start(self):
         self.status = "running"
@@ -106,8 +192,12 @@ class PodcastJob:
     
     def complete(self, success=True):
         self.status = "completed" if success else "failed"
+        self.partial = {}
         self.end_time = datetime.now()
         self.progress = 100 if success else self.progress
+        JOBS_TOTAL.inc(status=self.status)
+        if self.start_time:
+            JOB_SECONDS.observe((self.end_time - self.start_time).total_seconds(), status=self.status)
         self.add_update(
             "Podcast creation completed successfully" if success else 
             "Podcast creation failed", 
@@ -115,72 +205,164 @@ class PodcastJob:
         )
 
 def run_podcast_job(job):
-    """Run the CrewAI podcast generation process"""
-    global current_job
+    """
+    Run the CrewAI podcast generation process
     
+    Stages with a checkpoint from an earlier run of the job are not run again,
+    and in "revoice" mode the existing script goes straight to speech synthesis.
+    """
+    pipeline = None
+    live = None
+    revoice = job.resume_mode == "revoice"
+    job.resume_mode = None
+    checkpoints = get_checkpoint_store()
+    saved = checkpoints.load(job.id)
     try:
         # Start the job
         job.start()
+        if warmup_enabled():
+            # Reloads an unloaded model while the research stage runs
+            for warmer in model_warmers:
+                warmer.touch()
         
         # Import podcast crew - do this here to avoid circular imports
         from podcast.src.podcast.crew import PodcastCrew
+        from podcast.src.podcast.pipeline import VoicePipeline, pipelining_enabled
+        from podcast.src.podcast.registry import shared_tool
+        from podcast.src.podcast.research import ResearchEngine
+        from podcast.src.podcast.tools.elevenlabs import ElevenLabsTool
+        from podcast.src.podcast.tools.web_search import WebSearchTool
         
-        # Research stage
-        job.add_update("Starting research on trending topics", "research")
-        time.sleep(2)  # Simulating work - replace with actual research
+        voice_tool = shared_tool("elevenlabs", ElevenLabsTool)
+        output_path = os.path.join(audio_dir(), f"{job.id}.mp3")
         
-        # Example research results - replace with actual implementation
-        job.results["research"] = {
-            "sources": [
-                {"title": "AI Developments in 2025", "url": "https://example.com/ai-news"},
-                {"title": "New Climate Change Policies", "url": "https://example.com/climate"},
-                {"title": "Space Exploration Updates", "url": "https://example.com/space"}
-            ],
-            "topics": ["Artificial Intelligence", "Climate Change", "Space Exploration"]
-        }
-        job.add_update("Research completed, found 3 trending topics", "research")
-        
-        # Create a podcast crew
-        crew = PodcastCrew(
-            topic=job.topic,
-            hosts=job.hosts,
-            job_id=job.id,
-            callback=lambda msg, stage=None: job.add_update(msg, stage)
-        )
+        if revoice:
+            job.add_update("Re-voicing the existing script, the LLM is not used")
+        elif "research" in saved:
+            research = saved["research"]
+            job.results["research"] = research
+            job.add_update(f"Reusing the research checkpoint, {len(research.get('sources', []))} sources", "research")
+        else:
+            # Research stage, every search angle of the topic is queried concurrently
+            with scheduler.stage("research"):
+                job.add_update(f"Starting research on {job.topic}", "research")
+                engine = ResearchEngine(shared_tool("web_search", WebSearchTool)._run)
+                run_research = lambda topic: engine.run(topic, progress=lambda msg: job.add_update(msg, "research"))
+                batch = get_batch_store().get(job.batch_id) if job.batch_id else None
+                if batch:
+                    # Related episodes of the batch share one research run
+                    research, shared_topic = batch.research(job.id, job.topic, run_research)
+                    if shared_topic:
+                        job.add_update(f"Reusing the batch research on \"{shared_topic}\"", "research")
+                else:
+                    research = run_research(job.topic)
+                job.results["research"] = research
+                job.add_update(f"Research completed, found {len(research['sources'])} sources "
+                               f"across {len(research['topics'])} angles", "research")
+            checkpoints.save(job.id, "research", research)
         
         try:
-            # Run the crew
-            result = crew.run()
-            
-            # Debug output of the result type
-            job.add_update(f"Result type: {type(result)}", "debug")
-            
-            # Check if we got an error result
-            if isinstance(result, dict) and "summary" in result and isinstance(result["summary"], str) and result["summary"].startswith("Error:"):
-                raise Exception(result["summary"])
-            elif isinstance(result, str) and result.startswith("Error:"):
-                raise Exception(result)
+            if revoice:
+                # The script is already in the job results
+                job.add_update(f"Script of {len(job.results.get('script', ''))} characters ready", "script")
+            elif "script" in saved:
+                job.results.update(saved["script"])
+                job.add_update("Reusing the script checkpoint", "script")
+            else:
+                # Voice synthesis starts on finished script lines while the writer is still generating
+                if pipelining_enabled():
+                    # Segments synthesized while streaming can already be listened to
+                    live = live_episodes.open(job.id)
+                    pipeline = VoicePipeline(voice_tool, job.hosts, output_path,
+                                             progress_callback=lambda msg, stage=None: job.add_update(msg, stage),
+                                             live=live)
                 
-            # Update the job with results
-            if isinstance(result, dict):
-                # Dictionary handling
-                for key, value in result.items():
-                    if key == "research" and isinstance(value, dict):
-                        job.results["research"] = value
-                    elif key == "summary" and isinstance(value, str):
-                        job.results["summary"] = value
-                    elif key == "script" and isinstance(value, str):
-                        job.results["script"] = value
-                    elif key == "audio_details" and isinstance(value, dict):
-                        job.results["audio_details"] = value
-            elif isinstance(result, str):
-                # Handle string results
-                job.results["script"] = result
-                job.results["summary"] = "Generated by CrewAI"
-                job.results["audio_details"] = {
-                    "voice_instructions": f"Use a conversational tone for {', '.join(job.hosts)}."
-                }
+                def on_stream(stage, text, offset):
+                    publish_partial(job, stage, text, offset)
+                    if pipeline and stage == "script":
+                        pipeline.feed(text)
+                
+                # Crew tasks completed by an earlier run are skipped
+                completed = {name: saved[name] for name, _ in CREW_TASKS if name in saved}
+                if completed:
+                    job.add_update(f"Resuming the crew after {', '.join(completed)}", "script")
                 
+                # Create a podcast crew
+                crew = PodcastCrew(
+                    topic=job.topic,
+                    hosts=job.hosts,
+                    job_id=job.id,
+                    callback=lambda msg, stage=None: job.add_update(msg, stage),
+                    stream_callback=on_stream,
+                    research=job.results["research"],
+                    completed=completed,
+                    task_output_callback=lambda name, output: checkpoints.save(job.id, name, output)
+                )
+                
+                # Run the crew (LLM generation is limited by the "script" stage slots)
+                with scheduler.stage("script"):
+                    result = crew.run()
+                
+                # Debug output of the result type
+                job.add_update(f"Result type: {type(result)}", "debug")
+                
+                # Check if we got an error result
+                if isinstance(result, dict) and "summary" in result and isinstance(result["summary"], str) and result["summary"].startswith("Error:"):
+                    raise Exception(result["summary"])
+                elif isinstance(result, str) and result.startswith("Error:"):
+                    raise Exception(result)
+                    
+                # Update the job with results
+                if isinstance(result, dict):
+                    # Dictionary handling
+                    for key, value in result.items():
+                        if key == "research" and isinstance(value, dict):
+                            # Keep the sources of the research stage unless it found nothing
+                            if not job.results["research"].get("sources"):
+                                job.results["research"] = value
+                        elif key == "summary" and isinstance(value, str):
+                            job.results["summary"] = value
+                        elif key == "script" and isinstance(value, str):
+                            job.results["script"] = value
+                        elif key == "audio_details" and isinstance(value, dict):
+                            job.results["audio_details"] = value
+                elif isinstance(result, str):
+                    # Handle string results
+                    job.results["script"] = result
+                    job.results["summary"] = "Generated by CrewAI"
+                    job.results["audio_details"] = {
+                        "voice_instructions": f"Use a conversational tone for {', '.join(job.hosts)}."
+                    }
+                
+                if job.results.get("script"):
+                    checkpoints.save(job.id, "script", {
+                        key: job.results.get(key) for key in ("summary", "script", "audio_details")
+                    })
+                
+            # Voice stage, segments synthesized while the script streamed in are reused
+            if job.results.get("script"):
+                with scheduler.stage("voice"):
+                    job.add_update("Generating podcast audio", "voice")
+                    try:
+                        if pipeline:
+                            audio = pipeline.finish(job.results["script"])
+                        else:
+                            live = live_episodes.open(job.id)
+                            audio = voice_tool.process_podcast_script(
+                                job.results["script"], job.hosts, output_path,
+                                progress_callback=lambda msg, stage=None: job.add_update(msg, stage),
+                                live=live)
+                        # The content version lets players cache the episode as immutable
+                        job.results["audio_url"] = versioned_audio_url(audio.get("audio_url", ""))
+                        job.add_update(audio.get("message", "Podcast audio generated"), "voice")
+                    except Exception as e:
+                        logger.error(f"Job {job.id}: audio generation failed: {str(e)}")
+                        job.add_update(f"Audio generation failed: {str(e)}", "voice")
+            
+            if job.results.get("audio_url"):
+                # Nothing left to resume, a new voicing only needs the script
+                checkpoints.clear(job.id)
+            
             job.add_update("Podcast generated successfully", "complete")
             job.complete(True)
             
@@ -205,24 +387,77 @@ def run_podcast_job(job):
         logger.error(f"Error in podcast job: {str(e)}")
         job.add_update(f"Error: {str(e)}")
         job.complete(False)
-    
-    # Process next job in queue
-    global job_queue
-    current_job = None
-    if job_queue:
-        next_job = job_queue.pop(0)
-        process_next_job(next_job)
+    finally:
+        if pipeline:
+            # Stop synthesis of a script that was never finished
+            pipeline.cancel()
+        if live:
+            # Listeners finish with the frames released so far, new ones get the final file
+            live_episodes.close(live)
 
-def process_next_job(job):
-    """Start processing the next job in the queue"""
-    global current_job
-    current_job = job
-    podcasts[job.id] = job
-    
-    # Start a new thread to run the job
-    thread = threading.Thread(target=run_podcast_job, args=(job,))
-    thread.daemon = True
-    thread.start()
+def run_traced_job(job):
+    """Run a podcast job inside its trace, see /api/podcast/<job_id>/trace"""
+    with trace_job(job.id, topic=job.topic, resume_mode=job.resume_mode):
+        run_podcast_job(job)
+
+# Jobs are persisted in SQLite next to the CrewAI memory DB (PODCAST_JOB_DB_PATH overrides);
+# finished jobs are kept in memory in an LRU set of PODCAST_HOT_JOBS entries
+job_store = JobStore()
+interrupted_jobs = job_store.mark_interrupted()
+if interrupted_jobs:
+    logger.warning(f"Marked {len(interrupted_jobs)} jobs interrupted by the last shutdown as failed")
+
+# Progress events pushed to Server-Sent Events clients
+event_broker = EventBroker()
+SSE_KEEPALIVE_SECONDS = 15
+
+def publish_job_update(job, index, update):
+    """Job listener: push the new update and the job state to event stream clients"""
+    event_broker.publish("update", {
+        "job_id": job.id,
+        "index": index,
+        "update": update,
+        "topic": job.topic,
+        "hosts": job.hosts,
+        "status": job.status,
+        "progress": job.progress,
+        "current_stage": job.current_stage
+    }, job_id=job.id)
+
+def publish_partial(job, stage, text, offset):
+    """Push a chunk of streamed LLM output to the clients following the job"""
+    if job.add_partial(stage, text, offset):
+        event_broker.publish("partial", {
+            "job_id": job.id,
+            "stage": stage,
+            "text": text,
+            "offset": offset
+        }, job_id=job.id, transient=True)
+
+podcasts = JobRepository(job_store, PodcastJob.from_record, listeners=[publish_job_update])
+
+# Episodes listenable while their audio is being synthesized
+live_episodes = get_live_episodes()
+
+# Worker pool that runs queued jobs; concurrency is set with PODCAST_MAX_WORKERS
+# and per-stage limits with PODCAST_STAGE_LIMITS (e.g. "research=8,script=2,voice=1")
+scheduler = JobScheduler(run_traced_job)
+scheduler.start()
+
+# Every Ollama endpoint (OLLAMA_BASE_URLS, or OLLAMA_BASE_URL) is probed in the background
+# so health checks never block on it, and agent calls are balanced across the healthy ones
+ollama_pool = get_ollama_pool()
+ollama_pool.start()
+READY_MAX_QUEUE = int(os.environ.get('PODCAST_READY_MAX_QUEUE', 20))
+
+# The agents' model is preloaded on every endpoint at startup and kept resident while jobs are queued or running
+model_warmers = [
+    ModelWarmer(base_url=url, busy=lambda: scheduler.queue_length() > 0 or bool(scheduler.running_ids()))
+    for url in ollama_pool.urls
+]
+if warmup_enabled():
+    for warmer in model_warmers:
+        warmer.start()
 
 @app.route('/')
 def home():
@@ -248,21 +483,117 @@ def create_podcast():
         hosts=data.get('hosts', ["Alex", "Jamie"])
     )
     
-    # Add to queue or process immediately
-    if current_job is None:
-        process_next_job(job)
-    else:
-        job_queue.append(job)
-        job.add_update("Job added to queue. Position: " + str(len(job_queue)))
+    # Register the job before a worker can pick it up
+    podcasts.add(job)
     
-    podcasts[job.id] = job
+    # Add to queue, a free worker starts it immediately
+    position = scheduler.submit(job)
+    if position:
+        job.add_update("Job added to queue. Position: " + str(position))
     
     return jsonify({
         "success": True,
         "job_id": job.id,
-        "message": "Podcast creation started" if current_job == job else "Podcast added to queue"
+        "queue_position": position,
+        "message": "Podcast creation started" if position == 0 else "Podcast added to queue"
     })
 
+BATCH_MAX_EPISODES = int(os.environ.get('PODCAST_BATCH_MAX_EPISODES', 20))
+
+@app.route('/api/podcasts/batch', methods=['POST'])
+def create_podcast_batch():
+    """
+    Create several podcasts at once
+    
+    JSON body:
+        episodes: List of {"topic": ..., "hosts": [...]} specs
+    
+    The episodes are queued as one group that takes turns with the other jobs,
+    and episodes on related topics share their research.
+    """
+    data = request.get_json(silent=True) or {}
+    episodes = data.get('episodes')
+    if not isinstance(episodes, list) or not episodes:
+        return jsonify({"error": "episodes must be a non-empty list"}), 400
+    if len(episodes) > BATCH_MAX_EPISODES:
+        return jsonify({"error": f"A batch holds at most {BATCH_MAX_EPISODES} episodes"}), 400
+    for episode in episodes:
+        if not isinstance(episode, dict) or not isinstance(episode.get('topic'), str) or not episode['topic'].strip():
+            return jsonify({"error": "Every episode needs a topic"}), 400
+        if 'hosts' in episode and not (isinstance(episode['hosts'], list) and episode['hosts']):
+            return jsonify({"error": "hosts must be a non-empty list"}), 400
+    
+    jobs = [PodcastJob(topic=episode['topic'].strip(), hosts=episode.get('hosts', ["Alex", "Jamie"]))
+            for episode in episodes]
+    batch = Batch([job.id for job in jobs], [job.topic for job in jobs])
+    get_batch_store().add(batch)
+    
+    positions = []
+    for job in jobs:
+        job.batch_id = batch.id
+        podcasts.add(job)
+        position = scheduler.submit(job, group=batch.id)
+        positions.append(position)
+        if position:
+            job.add_update("Job added to queue. Position: " + str(position))
+    
+    return jsonify({
+        "success": True,
+        "batch_id": batch.id,
+        "episodes": [
+            {"job_id": job.id, "topic": job.topic, "research_group": group, "queue_position": position}
+            for job, group, position in zip(jobs, batch.groups, positions)
+        ]
+    })
+
+@app.route('/api/podcasts/batch/<batch_id>')
+def get_podcast_batch(batch_id):
+    """Get the aggregate progress of a batch and the status and results of its episodes"""
+    batch = get_batch_store().get(batch_id)
+    if not batch:
+        return jsonify({"error": "Batch not found"}), 404
+    
+    jobs = [podcasts.get(job_id) for job_id in batch.job_ids]
+    
+    def build():
+        counts = {}
+        for job in jobs:
+            status = job.status if job else "missing"
+            counts[status] = counts.get(status, 0) + 1
+        finished = sum(counts.get(status, 0) for status in FINISHED_STATUSES + ("missing",))
+        if finished < len(jobs):
+            status = "running" if counts.get("queued", 0) < len(jobs) else "queued"
+        elif counts.get("completed", 0) == len(jobs):
+            status = "completed"
+        else:
+            status = "completed_with_errors" if counts.get("completed") else "failed"
+        return {
+            "batch_id": batch.id,
+            "created_at": datetime.fromtimestamp(batch.created_at).isoformat(),
+            "status": status,
+            "progress": round(sum(job.progress for job in jobs if job) / len(jobs)),
+            "counts": counts,
+            "episodes": [
+                {
+                    "job_id": job_id,
+                    "topic": topic,
+                    "research_group": group,
+                    **({
+                        "status": job.status,
+                        "progress": job.progress,
+                        "current_stage": job.current_stage,
+                        "queue_position": scheduler.position(job_id),
+                        "audio_url": job.results.get("audio_url", ""),
+                        "summary": job.results.get("summary", ""),
+                    } if job else {"status": "missing"})
+                }
+                for job_id, topic, group, job in zip(batch.job_ids, batch.topics, batch.groups, jobs)
+            ]
+        }
+    
+    versions = [(job.version, scheduler.position(job.id)) if job else None for job in jobs]
+    return conditional_json(make_etag(batch.id, versions), build)
+
 @app.route('/podcast/<job_id>')
 def view_podcast(job_id):
     """View a specific podcast"""
@@ -272,28 +603,438 @@ def view_podcast(job_id):
     
     return render_template('podcast.html', job_id=job_id)
 
+MAX_PAGE_SIZE = 200
+
+def make_etag(*parts):
+    """Build an ETag value from the parts that determine a response"""
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+def conditional_json(etag, build):
+    """Answer 304 if the client already has ``etag``, otherwise build the JSON response"""
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = jsonify(build())
+    response.set_etag(etag)
+    return response
+
+def parse_fields(value):
+    """Parse a comma separated ?fields= list"""
+    return [field.strip() for field in (value or '').split(',') if field.strip()]
+
+def select_fields(data, fields):
+    """Keep only the requested fields of a job dictionary"""
+    if not fields:
+        return data
+    return {field: data[field] for field in fields if field in data}
+
 @app.route('/api/podcast/<job_id>')
 def get_podcast_status(job_id):
-    """Get the status of a podcast job"""
+    """
+    Get the status of a podcast job
+    
+    Query parameters:
+        updates_since: Only return update records from this index on
+        fields: Comma separated list of fields to return
+    """
     job = podcasts.get(job_id)
     if not job:
         return jsonify({"error": "Podcast not found"}), 404
     
-    return jsonify(job.to_dict())
+    try:
+        updates_since = max(0, int(request.args.get('updates_since', 0)))
+    except ValueError:
+        return jsonify({"error": "updates_since must be an integer"}), 400
+    fields = parse_fields(request.args.get('fields'))
+    position = scheduler.position(job_id)
+    
+    def build():
+        data = job.to_dict()
+        data["queue_position"] = position
+        data["updates"] = job.updates[updates_since:]
+        data["updates_since"] = updates_since
+        data["updates_total"] = len(job.updates)
+        return select_fields(data, fields)
+    
+    return conditional_json(make_etag(job.id, job.version, position, updates_since, fields), build)
 
-@app.route('/api/podcasts')
-def list_podcasts():
-    """List all podcasts"""
+RESUME_MODES = ("resume", "revoice")
+resume_lock = threading.Lock()
+
+@app.route('/api/podcast/<job_id>/resume', methods=['POST'])
+def resume_podcast(job_id):
+    """
+    Queue a finished podcast job again
+    
+    JSON body:
+        mode: "resume" (default) restarts from the first stage without a checkpoint,
+              "revoice" synthesizes the existing script again without invoking the LLM
+    """
+    job = podcasts.get(job_id)
+    if not job:
+        return jsonify({"error": "Podcast not found"}), 404
+    
+    data = request.get_json(silent=True) or {}
+    mode = data.get('mode', 'resume')
+    if mode not in RESUME_MODES:
+        return jsonify({"error": f"mode must be one of: {', '.join(RESUME_MODES)}"}), 400
+    
+    # Two concurrent requests must not queue the job twice
+    with resume_lock:
+        if job.status not in FINISHED_STATUSES:
+            return jsonify({"error": "Podcast is still being processed"}), 409
+        if mode == "revoice" and not job.results.get("script"):
+            return jsonify({"error": "Podcast has no script to voice"}), 409
+        if mode == "resume" and job.status == "completed" and job.results.get("audio_url"):
+            return jsonify({"error": "Podcast is already complete, use mode \"revoice\" to voice it again"}), 409
+        
+        job.resume_mode = mode
+        job.status = "queued"
+        job.end_time = None
+        stages = list(get_checkpoint_store().load(job.id))
+        job.add_update("Re-voicing requested" if mode == "revoice" else
+                       f"Resume requested, checkpoints: {', '.join(stages) or 'none'}")
+    
+    position = scheduler.submit(job, group=job.batch_id)
+    if position:
+        job.add_update("Job added to queue. Position: " + str(position))
+    
     return jsonify({
-        "podcasts": [job.to_dict() for job in podcasts.values()],
-        "current_job": current_job.id if current_job else None,
-        "queue_length": len(job_queue)
+        "success": True,
+        "job_id": job.id,
+        "mode": mode,
+        "checkpoints": stages,
+        "queue_position": position
     })
 
+@app.route('/api/podcast/<job_id>/trace')
+def get_podcast_trace(job_id):
+    """
+    Get the span timeline of a podcast job's last run
+    
+    The trace is in the Chrome trace-event format, it can be loaded in
+    chrome://tracing or Perfetto. Spans of a running job are included so far.
+    """
+    trace = get_trace(job_id)
+    if trace is None:
+        return jsonify({"error": "No trace recorded for this podcast"}), 404
+    return jsonify(trace)
+
+@app.route('/api/podcast/<job_id>/profile')
+def get_podcast_profile(job_id):
+    """Download the cProfile stats of a job sampled by PODCAST_PROFILE_SAMPLE_RATE"""
+    path = profile_path(job_id)
+    if not os.path.exists(path):
+        return jsonify({"error": "This podcast was not profiled"}), 404
+    return send_from_directory(os.path.dirname(os.path.abspath(path)), os.path.basename(path),
+                               mimetype='application/octet-stream', as_attachment=True)
+
+@app.route('/api/podcast/<job_id>/live.mp3')
+def stream_live_episode(job_id):
+    """
+    Listen to a podcast while its audio is being synthesized
+    
+    Streams the MP3 frames of the segments synthesized so far, in script order,
+    then follows new segments until the episode is complete. A finished episode
+    redirects to its audio file; until the first segment is synthesized the
+    answer is a 409 with Retry-After.
+    """
+    job = podcasts.get(job_id)
+    if not job:
+        return jsonify({"error": "Podcast not found"}), 404
+    
+    live = live_episodes.get(job_id)
+    if live is None or not live.published:
+        if job.results.get("audio_url"):
+            return redirect(job.results["audio_url"])
+        if job.status in FINISHED_STATUSES:
+            return jsonify({"error": "Podcast has no audio"}), 404
+        response = jsonify({"error": "Audio synthesis has not started", "status": job.status,
+                            "current_stage": job.current_stage})
+        response.status_code = 409
+        response.headers['Retry-After'] = '5'
+        return response
+    
+    return Response(stream_with_context(live.read()), mimetype='audio/mpeg', headers={
+        'Cache-Control': 'no-cache',
+        # Keep proxies from buffering the stream
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/api/podcast/<job_id>/events')
+def podcast_events(job_id):
+    """
+    Stream the updates of a podcast job as Server-Sent Events.
+    
+    Each update event carries its index in the job's update log as event id, so a
+    reconnecting client resumes after its Last-Event-ID header (or from ?since=<index>).
+    Streamed LLM output is sent live as "partial" events with the character offset
+    of the chunk in its stage's text.
+    """
+    job = podcasts.get(job_id)
+    if not job:
+        return jsonify({"error": "Podcast not found"}), 404
+    
+    next_index = 0
+    last_event_id = request.headers.get('Last-Event-ID')
+    try:
+        if last_event_id is not None:
+            next_index = int(last_event_id) + 1
+        elif request.args.get('since') is not None:
+            next_index = int(request.args['since'])
+    except ValueError:
+        return jsonify({"error": "Invalid event cursor"}), 400
+    
+    def stream():
+        nonlocal next_index
+        
+        def replay_updates():
+            nonlocal next_index
+            for index, update in enumerate(job.updates[next_index:], start=next_index):
+                next_index = index + 1
+                yield format_sse("update", {
+                    "job_id": job.id,
+                    "index": index,
+                    "update": update,
+                    "status": job.status,
+                    "progress": job.progress,
+                    "current_stage": job.current_stage
+                }, event_id=index)
+        
+        # Subscribe before replaying so nothing published in between is lost
+        subscription = event_broker.subscribe(job_id=job.id)
+        try:
+            yield "retry: 3000\n\n"
+            yield from replay_updates()
+            
+            while job.status not in FINISHED_STATUSES:
+                event = subscription.get(timeout=SSE_KEEPALIVE_SECONDS)
+                if subscription.overflowed:
+                    # The client reconnects and resumes from its last event id
+                    return
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                if event.name == "partial":
+                    # No event id, so the resume position stays on the last update
+                    yield format_sse(event.name, event.data)
+                    continue
+                if event.data["index"] < next_index:
+                    continue
+                next_index = event.data["index"] + 1
+                yield format_sse(event.name, event.data, event_id=event.data["index"])
+            
+            # Send the final updates that raced with the completion check
+            yield from replay_updates()
+            yield format_sse("end", {"job_id": job.id, "status": job.status})
+        finally:
+            subscription.close()
+    
+    return Response(stream_with_context(stream()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/api/events')
+def all_events():
+    """
+    Stream updates of all podcast jobs as Server-Sent Events.
+    
+    A reconnecting client resumes after its Last-Event-ID; when the server no longer
+    has those events a "reset" event tells it to reload the podcast list.
+    """
+    try:
+        last_seq = int(request.headers.get('Last-Event-ID', 0))
+    except ValueError:
+        last_seq = 0
+    
+    def stream():
+        nonlocal last_seq
+        subscription = event_broker.subscribe()
+        try:
+            yield "retry: 3000\n\n"
+            if last_seq:
+                backlog = event_broker.replay(last_seq)
+                if backlog is None:
+                    yield format_sse("reset", {})
+                    backlog = []
+                for event in backlog:
+                    last_seq = event.seq
+                    yield format_sse(event.name, event.data, event_id=event.seq)
+            
+            while True:
+                event = subscription.get(timeout=SSE_KEEPALIVE_SECONDS)
+                if subscription.overflowed:
+                    return
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                if event.seq <= last_seq:
+                    continue
+                last_seq = event.seq
+                yield format_sse(event.name, event.data, event_id=event.seq)
+        finally:
+            subscription.close()
+    
+    return Response(stream_with_context(stream()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/api/podcasts')
+def list_podcasts():
+    """
+    List podcasts, newest first
+    
+    Query parameters:
+        limit: Page size (default 50, at most MAX_PAGE_SIZE)
+        cursor: next_cursor value returned with the previous page
+        status: Comma separated list of statuses to include
+        view: "summary" (default, no updates or results) or "full"
+        fields: Comma separated list of fields to return
+    """
+    try:
+        limit = max(1, min(int(request.args.get('limit', 50)), MAX_PAGE_SIZE))
+        summaries, next_cursor = podcasts.page(
+            statuses=parse_fields(request.args.get('status')),
+            limit=limit,
+            cursor=request.args.get('cursor')
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    fields = parse_fields(request.args.get('fields'))
+    full = request.args.get('view') == 'full' or any(field in ("updates", "results") for field in fields)
+    running_jobs = scheduler.running_ids()
+    queue_length = scheduler.queue_length()
+    
+    def build():
+        if full:
+            jobs = [podcasts.get(summary["id"]) for summary in summaries]
+            items = [job.to_dict() for job in jobs if job]
+        else:
+            items = summaries
+        return {
+            "podcasts": [select_fields(item, fields) for item in items],
+            "next_cursor": next_cursor,
+            "current_job": running_jobs[0] if running_jobs else None,
+            "running_jobs": running_jobs,
+            "queue_length": queue_length
+        }
+    
+    etag = make_etag(
+        request.query_string,
+        [(summary["id"], summary.get("version")) for summary in summaries],
+        running_jobs,
+        queue_length
+    )
+    return conditional_json(etag, build)
+
 @app.route('/audio/<path:filename>')
 def serve_audio(filename):
-    """Serve generated audio files"""
-    return send_from_directory('data/podcasts', filename)
+    """
+    Serve generated audio files
+    
+    Byte ranges are answered with 206 and the ETag is the content hash. A URL
+    carrying the current content version (?v=) is cached as immutable, others
+    are revalidated. With AUDIO_OFFLOAD the proxy sends the bytes
+    (X-Accel-Redirect or X-Sendfile), otherwise the file is streamed through
+    the server's file wrapper (sendfile where the WSGI server supports it).
+    """
+    path = safe_join(audio_dir(), filename)
+    if path is None or not os.path.isfile(path):
+        return "Audio not found", 404
+    try:
+        etag = content_etag(path)
+        versioned = request.args.get('v') == content_version(path)
+    except OSError:
+        return "Audio not found", 404
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    
+    # Text files (metadata) are sent pre-compressed, MP3 is already compressed
+    send_path, send_name, encoding = path, filename, None
+    if request.accept_encodings['gzip']:
+        gz_path = compressed_path(path)
+        if gz_path:
+            send_path, send_name, encoding = gz_path, f"{filename}.gz", 'gzip'
+            etag = f"{etag}-gz"
+    
+    mode = offload_mode()
+    if not mode:
+        response = send_file(send_path, mimetype=mimetype, conditional=True, etag=etag)
+    elif request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+    else:
+        # The proxy answers range requests from the file itself
+        response = Response(mimetype=mimetype)
+        response.set_etag(etag)
+        if mode == 'x-accel':
+            response.headers['X-Accel-Redirect'] = accel_location(send_name)
+        else:
+            response.headers['X-Sendfile'] = send_path
+    
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    if path.endswith(COMPRESSIBLE_EXTENSIONS):
+        response.vary.add('Accept-Encoding')
+    if versioned:
+        response.headers['Cache-Control'] = f"public, max-age={cache_max_age()}, immutable"
+    else:
+        response.headers['Cache-Control'] = "public, no-cache"
+    return response
+
+@REGISTRY.collector
+def collect_metrics():
+    """Worker utilization and cache counters, read from their owners when /metrics is scraped"""
+    stats = scheduler.stats()
+    yield "podcast_workers", "gauge", "Worker threads", [({}, stats["max_workers"])]
+    yield "podcast_workers_busy", "gauge", "Worker threads running a job", [({}, stats["busy_workers"])]
+    yield "podcast_worker_utilization", "gauge", "Share of worker threads running a job", [
+        ({}, round(stats["busy_workers"] / stats["max_workers"], 3) if stats["max_workers"] else 0.0)
+    ]
+    yield "podcast_queue_length", "gauge", "Jobs waiting for a worker", [({}, stats["queue_length"])]
+    yield "podcast_stage_active", "gauge", "Jobs inside each scheduler stage", [
+        ({"stage": stage}, count) for stage, count in stats["stage_active"].items()
+    ]
+    
+    search = get_search_cache().stats()
+    tts = get_tts_cache().stats()
+    llm = get_llm_cache().stats()
+    agents = get_agent_pool().stats()
+    caches = {
+        "search": (search["memory_hits"] + search["disk_hits"] + search["coalesced"], search["misses"]),
+        "tts": (tts["hits"], tts["misses"]),
+        "llm": (llm["hits"], llm["misses"]),
+        "agent_pool": (agents["reused"], agents["built"]),
+    }
+    yield "podcast_cache_hits_total", "counter", "Cache lookups served from the cache", [
+        ({"cache": name}, hits) for name, (hits, _) in caches.items()
+    ]
+    yield "podcast_cache_misses_total", "counter", "Cache lookups that had to compute the value", [
+        ({"cache": name}, misses) for name, (_, misses) in caches.items()
+    ]
+    yield "podcast_cache_hit_ratio", "gauge", "Share of cache lookups served from the cache", [
+        ({"cache": name}, round(hits / (hits + misses), 3) if hits + misses else 0.0)
+        for name, (hits, misses) in caches.items()
+    ]
+    
+    endpoints = ollama_pool.stats()["endpoints"]
+    yield "podcast_ollama_outstanding_requests", "gauge", "LLM calls in flight per Ollama endpoint", [
+        ({"endpoint": endpoint["url"]}, endpoint["outstanding"]) for endpoint in endpoints
+    ]
+    yield "podcast_ollama_latency_ms", "gauge", "Moving average LLM call latency per Ollama endpoint", [
+        ({"endpoint": endpoint["url"]}, endpoint["latency_ms"]) for endpoint in endpoints
+        if endpoint["latency_ms"] is not None
+    ]
+    yield "podcast_ollama_healthy", "gauge", "Whether an Ollama endpoint accepts calls", [
+        ({"endpoint": endpoint["url"]}, int(endpoint["healthy"])) for endpoint in endpoints
+    ]
+
+@app.route('/metrics')
+def metrics():
+    """Metrics in the Prometheus text format"""
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
 
 @app.route('/health')
 def health_check():
@@ -304,6 +1045,7 @@ def health_check():
         "time": datetime.now().isoformat(),
         "configuration": {
             "ollama_url": os.environ.get('OLLAMA_BASE_URL', 'http://localhost:11434'),
+            "ollama_urls": ollama_pool.urls,
             "serper": bool(os.environ.get('SERPER_API_KEY')),
             "elevenlabs": bool(os.environ.get('ELEVENLABS_API_KEY'))
         },
@@ -311,35 +1053,60 @@ def health_check():
         "version": "1.0.0"
     }
     
-    # Check if we can connect to Ollama
-    import requests
-    try:
-        response = requests.get(f"{os.environ.get('OLLAMA_BASE_URL', 'http://localhost:11434')}/api/tags")
-        if response.status_code == 200:
-            status["ollama_connection"] = "ok"
-            models = response.json().get("models", [])
-            status["available_models"] = [model["name"] for model in models]
-            
-            # Check if our configured model is available
+    # Ollama status from the last background probe
+    probe = ollama_pool.snapshot()
+    status["ollama_connection"] = probe["ollama_connection"]
+    status["available_models"] = probe["available_models"]
+    status["ollama_checked_at"] = probe["checked_at"]
+    if probe["ollama_connection"] == "ok":
+        if not probe["model_available"]:
             configured_model = os.environ.get('MODEL', 'deepseek-coder:7b-instruct')
-            model_base = configured_model.split(':')[0] if ':' in configured_model else configured_model
-            available_models = [m.split(':')[0] for m in status["available_models"]]
-            
-            if model_base not in available_models:
-                status["status"] = "degraded"
-                status["message"] = f"Configured model '{configured_model}' not found in available Ollama models"
-        else:
-            status["ollama_connection"] = "failed"
             status["status"] = "degraded"
-            status["message"] = "Could not retrieve model list from Ollama API"
-    except requests.RequestException as e:
-        status["ollama_connection"] = "error"
-        status["ollama_error"] = str(e)
+            status["message"] = f"Configured model '{configured_model}' not found in available Ollama models"
+    elif probe["ollama_connection"] == "failed":
+        status["status"] = "degraded"
+        status["message"] = "Could not retrieve model list from Ollama API"
+    elif probe["ollama_connection"] == "error":
+        status["ollama_error"] = probe.get("ollama_error")
         status["status"] = "degraded"
-        status["message"] = f"Failed to connect to Ollama at {os.environ.get('OLLAMA_BASE_URL', 'http://localhost:11434')}"
+        status["message"] = f"Failed to connect to Ollama at {', '.join(ollama_pool.urls)}"
+    
+    # Load state of the agents' model (loading, loaded, unloaded after idling, error)
+    if warmup_enabled():
+        status["model_warmup"] = [warmer.snapshot() for warmer in model_warmers]
     
     return jsonify(status)
 
+@app.route('/health/live')
+def liveness_check():
+    """Liveness probe, the process is up and serving requests"""
+    return jsonify({"status": "alive", "time": datetime.now().isoformat()})
+
+@app.route('/health/ready')
+def readiness_check():
+    """Readiness probe, reflects Ollama reachability and worker pool saturation"""
+    stats = scheduler.stats()
+    probe = ollama_pool.snapshot()
+    saturated = stats["busy_workers"] >= stats["max_workers"] and stats["queue_length"] >= READY_MAX_QUEUE
+    
+    reasons = []
+    if probe["ollama_connection"] not in ("ok", "unknown"):
+        reasons.append("ollama unreachable")
+    if saturated:
+        reasons.append(f"queue depth {stats['queue_length']} >= {READY_MAX_QUEUE}")
+    
+    result = {
+        "status": "not_ready" if reasons else "ready",
+        "reasons": reasons,
+        "busy_workers": stats["busy_workers"],
+        "max_workers": stats["max_workers"],
+        "queue_length": stats["queue_length"],
+        "max_queue": READY_MAX_QUEUE,
+        "ollama_connection": probe["ollama_connection"],
+        "ollama_checked_at": probe["checked_at"]
+    }
+    return jsonify(result), 503 if reasons else 200
+
 @app.route('/api/voices')
 def list_voices():
     """List available text-to-speech voices"""
@@ -372,7 +1139,8 @@ def list_models():
     import requests
     
     try:
-        response = requests.get(f"{os.environ.get('OLLAMA_BASE_URL', 'http://localhost:11434')}/api/tags")
+        base_url = (ollama_pool.healthy_urls() or ollama_pool.urls)[0]
+        response = get_http_client().get(f"{base_url}/api/tags", timeout=5)
         if response.status_code == 200:
             models = response.json().get("models", [])
             return jsonify({
@@ -393,36 +1161,43 @@ def debug_panel():
     status = {
         "env_vars": {k: "***" if "key" in k.lower() else v for k, v in os.environ.items()},
         "podcasts": len(podcasts),
-        "queue": len(job_queue),
-        "current_job": current_job.id if current_job else None,
+        "queue": scheduler.queue_length(),
+        "running_jobs": scheduler.running_ids(),
+        "scheduler": scheduler.stats(),
+        "tts_cache": get_tts_cache().stats(),
+        "http": get_http_client().stats(),
+        "search_cache": get_search_cache().stats(),
+        "research_index": get_research_index().stats(),
+        "llm_cache": get_llm_cache().stats(),
+        "agent_pool": get_agent_pool().stats(),
+        "model_warmup": [warmer.snapshot() for warmer in model_warmers],
+        "ollama_pool": ollama_pool.stats(),
         "directories": {
-            "data_podcasts": os.path.exists("data/podcasts"),
+            "data_podcasts": os.path.exists(audio_dir()),
             "data_research": os.path.exists("data/research"),
             "memory_db": os.path.exists(os.environ.get('CREWAI_MEMORY_DB_PATH', '/app/data/memory.db'))
         }
     }
     
     # Add Ollama connection status
-    import requests
-    try:
-        response = requests.get(f"{os.environ.get('OLLAMA_BASE_URL', 'http://localhost:11434')}/api/tags")
-        status["ollama_connection"] = "OK" if response.status_code == 200 else f"Error: {response.status_code}"
-        if response.status_code == 200:
-            models = response.json().get("models", [])
-            status["ollama_models"] = [model["name"] for model in models]
-    except requests.RequestException as e:
-        status["ollama_connection"] = f"Connection Error: {str(e)}"
+    probe = ollama_pool.snapshot()
+    status["health_probe"] = probe
+    if probe["ollama_connection"] == "ok":
+        status["ollama_connection"] = "OK"
+        status["ollama_models"] = probe["available_models"]
+    else:
+        status["ollama_connection"] = f"Error: {probe.get('ollama_error', probe['ollama_connection'])}"
     
     return render_template('debug.html', status=status)
 
 if __name__ == "__main__":
     # Create necessary directories
-    os.makedirs('data/podcasts', exist_ok=True)
+    os.makedirs(audio_dir(), exist_ok=True)
     os.makedirs('data/research', exist_ok=True)
     
     # Log startup information
     logger.info("=== CrewAI Podcast Generator Starting ===")
-    logger.info(f"Ollama URL: {os.environ.get('OLLAMA_BASE_URL', 'http://localhost:11434')}")
+    logger.info(f"Ollama URLs: {', '.join(ollama_pool.urls)}")
     logger.info(f"API Keys configured: Serper: {'Yes' if os.environ.get('SERPER_API_KEY') else 'No'}, "
                 f"ElevenLabs: {'Yes' if os.environ.get('ELEVENLABS_API_KEY') else 'No'}")
     logger.info(f"Using model: {os.environ.get('MODEL', 'deepseek-coder:7b-instruct')}")
@@ -0,0 +1,78 @@
+"""
+Benchmark episode assembly: repeated ``combined_audio += segment`` versus AudioAssembler.
+
+Run from the crew directory (requires pydub and ffmpeg):
+
+    python -m podcast.benchmarks.audio_assembly --segments 120
+"""
+import os
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+
+from pydub import AudioSegment
+from pydub.generators import Sine
+
+from podcast.src.podcast.audio_assembly import AudioAssembler
+
+
+def make_segments(directory, count, min_ms, max_ms):
+    """Write ``count`` synthetic MP3 segments like the ones ElevenLabs returns."""
+    paths = []
+    for i in range(count):
+        tone = Sine(220 + (i % 2) * 110).to_audio_segment(duration=random.randint(min_ms, max_ms))
+        tone = tone.set_frame_rate(44100).set_channels(1)
+        path = os.path.join(directory, f"segment_{i}.mp3")
+        tone.export(path, format="mp3", bitrate="128k")
+        paths.append(path)
+    return paths
+
+
+def naive_assembly(paths, output_path):
+    """The original approach from process_podcast_script."""
+    combined_audio = None
+    for path in paths:
+        segment_audio = AudioSegment.from_mp3(path)
+        if combined_audio is None:
+            combined_audio = segment_audio
+        else:
+            combined_audio += segment_audio
+    combined_audio.export(output_path, format="mp3")
+
+
+def measure(label, func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<20} {elapsed:8.2f}s   peak {peak / 1024 / 1024:8.1f} MB")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--segments", type=int, default=120)
+    parser.add_argument("--min-ms", type=int, default=2000)
+    parser.add_argument("--max-ms", type=int, default=8000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"Generating {args.segments} segments...")
+        paths = make_segments(directory, args.segments, args.min_ms, args.max_ms)
+        speakers = ["Alex" if i % 2 == 0 else "Simon" for i in range(len(paths))]
+
+        measure("naive +=", lambda: naive_assembly(paths, os.path.join(directory, "naive.mp3")))
+        measure("frame concat", lambda: AudioAssembler(speaker_gap_ms=0).assemble(
+            paths, os.path.join(directory, "frames.mp3"), speakers))
+        measure("frames + gaps", lambda: AudioAssembler(speaker_gap_ms=300).assemble(
+            paths, os.path.join(directory, "gaps.mp3"), speakers))
+        measure("pcm single pass", lambda: AudioAssembler(speaker_gap_ms=0)._assemble_pcm(
+            paths, os.path.join(directory, "pcm.mp3"), [0] * len(paths)))
+
+
+if __name__ == "__main__":
+    main()
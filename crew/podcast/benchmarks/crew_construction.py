@@ -0,0 +1,76 @@
+"""
+Benchmark PodcastCrew construction: agents built per task versus the agent pool.
+
+Run from the crew directory (requires crewai):
+
+    python -m podcast.benchmarks.crew_construction --jobs 20
+"""
+import time
+import argparse
+import tracemalloc
+
+from crewai import Agent, Crew, Process, Task
+
+from podcast.src.podcast.crew import PodcastCrew
+from podcast.src.podcast.registry import AgentPool, llm_config
+from podcast.src.podcast.tools.elevenlabs import ElevenLabsTool
+from podcast.src.podcast.tools.web_search import WebSearchTool
+
+AGENTS = [
+    ("Spécialiste de recherche sur {topic}", "Effectuer des recherches complètes sur le sujet du podcast"),
+    ("Curateur de sujets de podcast", "Sélectionner et affiner les sujets les plus captivants"),
+    ("Rédacteur de scripts de podcast", "Transformer les résultats de recherche en un script conversationnel"),
+    ("Spécialiste de production audio de podcast", "Fournir des conseils pour la production audio du podcast"),
+]
+
+
+def legacy_crew(topic):
+    """The original construction: every agent is built for the crew and again for its task."""
+    def build(index):
+        role, goal = AGENTS[index]
+        return Agent(role=role.format(topic=topic), goal=goal, backstory="Benchmark",
+                     verbose=True, llm_config=llm_config())
+
+    agents = [build(i) for i in range(len(AGENTS))]
+    tasks = []
+    for i in range(len(AGENTS)):
+        task = Task(description=f"Task {i} about {topic}", expected_output="Output", agent=build(i))
+        if i == 0:
+            task.tools = [WebSearchTool()]
+        elif i == 3:
+            task.tools = [ElevenLabsTool()]
+        tasks.append(task)
+    return Crew(agents=agents, tasks=tasks, process=Process.sequential, verbose=True)
+
+
+def pooled_crew(topic, pool):
+    podcast_crew = PodcastCrew(topic, agent_pool=pool)
+    crew = podcast_crew.crew()
+    podcast_crew.release_agents()
+    return crew
+
+
+def measure(label, func, jobs):
+    tracemalloc.start()
+    start = time.perf_counter()
+    for i in range(jobs):
+        func(f"Sujet {i}")
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<20} {elapsed / jobs * 1000:8.1f} ms/crew   peak {peak / 1024 / 1024:8.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=20)
+    args = parser.parse_args()
+
+    pool = AgentPool(max_idle=1)
+    measure("legacy", legacy_crew, args.jobs)
+    measure("pooled", lambda topic: pooled_crew(topic, pool), args.jobs)
+    print(f"agent pool: {pool.stats()}")
+
+
+if __name__ == "__main__":
+    main()
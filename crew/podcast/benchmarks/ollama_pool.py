@@ -0,0 +1,104 @@
+"""
+Benchmark OllamaPool against local stub Ollama servers.
+
+Each stub answers /api/chat after a fixed delay and serves one request at a
+time, like a CPU-only Ollama node. Concurrent jobs are run first against a
+single endpoint, then balanced across all of them; one stub can be made to
+fail to show ejection. Run from the crew directory:
+
+    python -m podcast.benchmarks.ollama_pool --endpoints 3 --jobs 6 --calls 4
+"""
+import json
+import time
+import argparse
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from podcast.src.podcast.ollama_pool import OllamaPool
+
+
+def start_stub(delay, failing=False):
+    """Start a stub Ollama server, returns its URL."""
+    busy = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if failing:
+                self.send_response(500)
+                self.end_headers()
+                return
+            # One generation at a time per node
+            with busy:
+                time.sleep(delay)
+            body = json.dumps({"message": {"role": "assistant", "content": "ok"}}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+class StubLLM:
+    """Stands in for a CrewAI LLM, calling the Ollama chat API of its api_base."""
+
+    model = "ollama/stub"
+
+    def __init__(self, base_url):
+        self.base_url = self.api_base = base_url
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None):
+        request = urllib.request.Request(f"{self.api_base}/api/chat", method="POST",
+                                         data=json.dumps({"messages": messages}).encode(),
+                                         headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return json.loads(response.read())["message"]["content"]
+
+
+def run_jobs(llms, calls):
+    """Run one job per LLM concurrently, each making ``calls`` sequential calls."""
+    def job(llm):
+        for i in range(calls):
+            llm.call([{"role": "user", "content": f"call {i}"}])
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(llms)) as executor:
+        list(executor.map(job, llms))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--endpoints", type=int, default=3)
+    parser.add_argument("--jobs", type=int, default=6)
+    parser.add_argument("--calls", type=int, default=4)
+    parser.add_argument("--delay", type=float, default=0.1, help="Seconds per generation")
+    parser.add_argument("--failing", action="store_true", help="Add an endpoint that always fails")
+    args = parser.parse_args()
+
+    urls = [start_stub(args.delay) for _ in range(args.endpoints)]
+    if args.failing:
+        urls.append(start_stub(args.delay, failing=True))
+
+    elapsed = run_jobs([StubLLM(urls[0]) for _ in range(args.jobs)], args.calls)
+    print(f"single endpoint          {elapsed:7.2f}s")
+
+    pool = OllamaPool(urls, probe=False)
+    elapsed = run_jobs([pool.wrap(StubLLM(urls[0])) for _ in range(args.jobs)], args.calls)
+    print(f"pool of {len(urls)} endpoints      {elapsed:7.2f}s")
+    for endpoint in pool.stats()["endpoints"]:
+        print(f"  {endpoint['url']:<24} requests {endpoint['requests']:3}  failures {endpoint['failures']:3}  "
+              f"avg {endpoint['avg_latency_ms']} ms  healthy {endpoint['healthy']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark script parsing: the original re.split parser versus ScriptParser.
+
+Run from the crew directory:
+
+    python -m podcast.benchmarks.script_parser --megabytes 8
+"""
+import re
+import time
+import random
+import argparse
+import tracemalloc
+
+from podcast.src.podcast.script_parser import ScriptParser, parse_script
+
+HOSTS = ["Alex", "Simon"]
+WORDS = ("le podcast parle de technologie et de culture au Québec avec des invités "
+         "tabarnouche pantoute c'est pas pire une analyse des tendances actuelles").split()
+
+
+def make_script(size):
+    """Build a script of roughly ``size`` characters with sections and alternating multi-line turns."""
+    lines = ["# Podcast de référence", ""]
+    length = 0
+    section = 0
+    turn = 0
+    while length < size:
+        if random.random() < 0.02:
+            section += 1
+            lines.extend(["", f"## Section {section}"])
+        turn += 1
+        turn_lines = [" ".join(random.choices(WORDS, k=random.randint(8, 40)))
+                      for _ in range(random.randint(1, 4))]
+        turn_lines[0] = f"{HOSTS[turn % 2]}: {turn_lines[0]}"
+        lines.extend(turn_lines)
+        length += sum(len(line) + 1 for line in turn_lines)
+    return "\n".join(lines)
+
+
+def legacy_parse(script, hosts):
+    """The original parse_podcast_script."""
+    segments = []
+    current_text = ""
+    current_host = None
+    hosts_pattern = '|'.join([re.escape(host) for host in hosts])
+    pattern = f"({hosts_pattern}):\\s*"
+    parts = re.split(f"({pattern})", script)
+    i = 0
+    while i < len(parts):
+        if i + 1 < len(parts) and parts[i+1].strip().endswith(':'):
+            if current_host and current_text.strip():
+                segments.append({"host": current_host, "text": current_text.strip()})
+            current_host = parts[i+1].strip()[:-1]
+            current_text = parts[i+2] if i+2 < len(parts) else ""
+            i += 3
+        else:
+            if not current_host:
+                current_host = "narrator"
+            current_text += parts[i]
+            i += 1
+    if current_host and current_text.strip():
+        segments.append({"host": current_host, "text": current_text.strip()})
+    return segments
+
+
+def chunked_parse(script, hosts, chunk_size):
+    """Feed the script in LLM-token sized chunks."""
+    parser = ScriptParser(hosts)
+    segments = []
+    for start in range(0, len(script), chunk_size):
+        segments.extend(parser.feed(script[start:start + chunk_size]))
+    segments.extend(parser.close())
+    return segments
+
+
+def measure(label, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+
+    # Memory in a separate run, tracemalloc slows down many small allocations
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<24} {elapsed:8.3f}s   peak {peak / 1024 / 1024:8.1f} MB   {len(result)} segments")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--megabytes", type=float, default=8)
+    parser.add_argument("--chunk-size", type=int, default=16)
+    args = parser.parse_args()
+
+    random.seed(0)
+    script = make_script(int(args.megabytes * 1024 * 1024))
+    print(f"Script: {len(script) / 1024 / 1024:.1f} MB")
+
+    measure("legacy re.split", lambda: legacy_parse(script, HOSTS))
+    whole = measure("ScriptParser whole", lambda: parse_script(script, HOSTS))
+    chunked = measure(f"ScriptParser {args.chunk_size}B chunks", lambda: chunked_parse(script, HOSTS, args.chunk_size))
+    if chunked != whole:
+        raise SystemExit("Chunked parsing differs from parsing the whole script")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""
+Linear-time assembly of podcast audio segments.
+
+When every segment uses the same MPEG audio encoding (the normal case for
+ElevenLabs output), MP3 frames are concatenated directly without decoding.
+Otherwise each segment is decoded once into a preallocated PCM buffer and the
+episode is encoded in a single pass.
+"""
+import os
+import logging
+
+from pydub import AudioSegment
+
+from podcast.src.podcast.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Bitrates in kbps indexed by [version is MPEG-1][layer][bitrate index]
+BITRATES = {
+    True: {
+        1: [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+        2: [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+        3: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    },
+    False: {
+        1: [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+        2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+        3: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    },
+}
+
+SAMPLE_RATES = {
+    3: [44100, 48000, 32000],   # MPEG-1
+    2: [22050, 24000, 16000],   # MPEG-2
+    0: [11025, 12000, 8000],    # MPEG-2.5
+}
+
+LAYERS = {3: 1, 2: 2, 1: 3}
+
+
+class IncompatibleAudioError(Exception):
+    """Raised when segments cannot be joined at the MP3 frame level."""
+
+
+def parse_frame_header(data, offset=0):
+    """
+    Parse the MPEG audio frame header at ``offset``
+
+    Returns:
+        dict: Frame properties, or None if there is no valid header there
+    """
+    if offset + 4 > len(data):
+        return None
+    b1, b2, b3 = data[offset + 1], data[offset + 2], data[offset + 3]
+    if data[offset] != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version_bits = (b1 >> 3) & 0x03
+    layer_bits = (b1 >> 1) & 0x03
+    bitrate_index = (b2 >> 4) & 0x0F
+    sample_rate_index = (b2 >> 2) & 0x03
+    if version_bits == 1 or layer_bits == 0 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    mpeg1 = version_bits == 3
+    layer = LAYERS[layer_bits]
+    bitrate = BITRATES[mpeg1][layer][bitrate_index] * 1000
+    sample_rate = SAMPLE_RATES[version_bits][sample_rate_index]
+    padding = (b2 >> 1) & 0x01
+
+    if layer == 1:
+        samples = 384
+        length = (12 * bitrate // sample_rate + padding) * 4
+    elif layer == 3 and not mpeg1:
+        samples = 576
+        length = 72 * bitrate // sample_rate + padding
+    else:
+        samples = 1152
+        length = 144 * bitrate // sample_rate + padding
+
+    return {
+        "version": version_bits,
+        "layer": layer,
+        "bitrate": bitrate,
+        "sample_rate": sample_rate,
+        "channels": 1 if (b3 >> 6) == 3 else 2,
+        "protected": not (b1 & 0x01),
+        "samples": samples,
+        "length": length,
+    }
+
+
+def _id3v2_size(data):
+    """Size of a leading ID3v2 tag, 0 if there is none."""
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _is_info_frame(data, offset, header):
+    """True if the frame holds a Xing/Info/VBRI header rather than audio."""
+    if header["layer"] != 3:
+        return False
+    if header["version"] == 3:
+        side_info = 17 if header["channels"] == 1 else 32
+    else:
+        side_info = 9 if header["channels"] == 1 else 17
+    tag_offset = offset + 4 + (2 if header["protected"] else 0) + side_info
+    tag = bytes(data[tag_offset:tag_offset + 4])
+    return tag in (b"Xing", b"Info") or bytes(data[offset + 36:offset + 40]) == b"VBRI"
+
+
+def extract_frames(data):
+    """
+    Strip tags and metadata frames from an MP3 file
+
+    Returns:
+        tuple: (audio frame bytes, header of the first frame, number of frames)
+
+    Raises:
+        IncompatibleAudioError: If no MPEG audio frames are found
+    """
+    offset = _id3v2_size(data)
+    first = None
+    while offset < len(data):
+        first = parse_frame_header(data, offset)
+        if first:
+            break
+        offset += 1
+    if not first:
+        raise IncompatibleAudioError("No MPEG audio frames found")
+
+    if _is_info_frame(data, offset, first):
+        offset += first["length"]
+
+    start = offset
+    frames = 0
+    while True:
+        header = parse_frame_header(data, offset)
+        if not header or offset + header["length"] > len(data):
+            break
+        offset += header["length"]
+        frames += 1
+
+    return bytes(data[start:offset]), first, frames
+
+
+def silence_frame(header):
+    """Build a silent frame matching ``header`` (no CRC, no padding, empty side info)."""
+    version_bits = header["version"]
+    layer_bits = {1: 3, 2: 2, 3: 1}[header["layer"]]
+    mpeg1 = version_bits == 3
+    bitrate_index = BITRATES[mpeg1][header["layer"]].index(header["bitrate"] // 1000)
+    sample_rate_index = SAMPLE_RATES[version_bits].index(header["sample_rate"])
+    channel_mode = 3 if header["channels"] == 1 else 0
+
+    frame_header = bytes([
+        0xFF,
+        0xE0 | (version_bits << 3) | (layer_bits << 1) | 0x01,
+        (bitrate_index << 4) | (sample_rate_index << 2),
+        channel_mode << 6,
+    ])
+    length = parse_frame_header(frame_header)["length"]
+    return frame_header + bytes(length - 4)
+
+
+class Mp3FrameWriter:
+    """Write an MP3 file by appending the frames of compatible segments.
+
+    The file is written as ``<path>.part`` and renamed when closed, so
+    readers never see a partially written final file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.part_path = f"{path}.part"
+        self.header = None
+        self.frames = 0
+        self.bytes_written = 0
+        self._file = open(self.part_path, "wb")
+
+    def append(self, data):
+        """Append the audio frames of an MP3 segment."""
+        frames, header, count = extract_frames(data)
+        if self.header is None:
+            self.header = header
+        elif (header["version"], header["layer"], header["sample_rate"], header["channels"]) != (
+                self.header["version"], self.header["layer"], self.header["sample_rate"], self.header["channels"]):
+            raise IncompatibleAudioError("Segment encoding differs from the previous segments")
+
+        self._write(frames)
+        self.frames += count
+
+    def append_silence(self, duration_ms):
+        """Append silent frames, requires at least one segment to be appended first."""
+        if not duration_ms or self.header is None:
+            return
+        samples = self.header["sample_rate"] * duration_ms // 1000
+        count = max(1, -(-samples // self.header["samples"]))
+        self._write(silence_frame(self.header) * count)
+        self.frames += count
+
+    def duration_ms(self):
+        if self.header is None:
+            return 0
+        return self.frames * self.header["samples"] * 1000 // self.header["sample_rate"]
+
+    def close(self):
+        """Finish the file and move it to its final path."""
+        self._file.close()
+        os.replace(self.part_path, self.path)
+
+    def abort(self):
+        """Discard the partially written file."""
+        self._file.close()
+        try:
+            os.remove(self.part_path)
+        except OSError:
+            pass
+
+    def _write(self, data):
+        self._file.write(data)
+        self._file.flush()
+        self.bytes_written += len(data)
+
+
+class AudioAssembler:
+    """Join segment files into a single episode in one pass."""
+
+    def __init__(self, speaker_gap_ms=None, bitrate="192k"):
+        """
+        Initialize the assembler
+
+        Args:
+            speaker_gap_ms (int, optional): Silence inserted when the speaker changes,
+                defaults to PODCAST_SPEAKER_GAP_MS (0)
+            bitrate (str, optional): Bitrate used when the episode has to be re-encoded
+        """
+        if speaker_gap_ms is None:
+            speaker_gap_ms = int(os.environ.get('PODCAST_SPEAKER_GAP_MS', 0))
+        self.speaker_gap_ms = speaker_gap_ms
+        self.bitrate = bitrate
+
+    def _gaps(self, speakers, count):
+        """Silence to insert before each segment."""
+        gaps = [0] * count
+        if speakers and self.speaker_gap_ms:
+            for i in range(1, count):
+                if speakers[i] != speakers[i - 1]:
+                    gaps[i] = self.speaker_gap_ms
+        return gaps
+
+    def assemble(self, paths, output_path, speakers=None):
+        """
+        Assemble segment files into ``output_path``
+
+        Args:
+            paths (list): Segment MP3 files in playback order
+            output_path (str): Final MP3 file
+            speakers (list, optional): Speaker of each segment, used for inter-speaker gaps
+
+        Returns:
+            dict: "method" ("frames" or "pcm"), "segments" and "duration_ms"
+        """
+        gaps = self._gaps(speakers, len(paths))
+        try:
+            return self._assemble_frames(paths, output_path, gaps)
+        except IncompatibleAudioError as e:
+            logger.info(f"Falling back to PCM assembly: {str(e)}")
+            return self._assemble_pcm(paths, output_path, gaps)
+
+    def _assemble_frames(self, paths, output_path, gaps):
+        writer = Mp3FrameWriter(output_path)
+        try:
+            with span("join mp3 frames", "audio", segments=len(paths)):
+                for path, gap in zip(paths, gaps):
+                    with open(path, "rb") as f:
+                        data = f.read()
+                    writer.append_silence(gap)
+                    writer.append(data)
+        except Exception:
+            writer.abort()
+            raise
+        with span("write episode", "io", bytes=writer.bytes_written):
+            writer.close()
+        return {"method": "frames", "segments": len(paths), "duration_ms": writer.duration_ms()}
+
+    def _assemble_pcm(self, paths, output_path, gaps):
+        # Decode every segment once
+        with span("decode segments", "audio", segments=len(paths)):
+            decoded = [AudioSegment.from_file(path) for path in paths]
+        if not decoded:
+            raise IncompatibleAudioError("No segments to assemble")
+
+        # Convert everything to the parameters of the first segment
+        first = decoded[0]
+        frame_rate, channels, sample_width = first.frame_rate, first.channels, first.sample_width
+        frame_width = channels * sample_width
+        chunks = []
+        for segment, gap in zip(decoded, gaps):
+            segment = segment.set_frame_rate(frame_rate).set_channels(channels).set_sample_width(sample_width)
+            chunks.append((frame_rate * gap // 1000 * frame_width, segment.raw_data))
+
+        # Copy into a single preallocated buffer, silence is left zeroed
+        buffer = bytearray(sum(silence + len(raw) for silence, raw in chunks))
+        view = memoryview(buffer)
+        position = 0
+        for silence, raw in chunks:
+            position += silence
+            view[position:position + len(raw)] = raw
+            position += len(raw)
+
+        episode = AudioSegment(data=bytes(buffer), sample_width=sample_width,
+                               frame_rate=frame_rate, channels=channels)
+        with span("encode episode", "audio", bitrate=self.bitrate):
+            episode.export(output_path, format="mp3", bitrate=self.bitrate)
+        return {"method": "pcm", "segments": len(paths), "duration_ms": len(episode)}
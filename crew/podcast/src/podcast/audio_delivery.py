@@ -0,0 +1,139 @@
+"""
+Delivery of generated audio files.
+
+Episodes are served with strong ETags derived from their content, so
+players revalidate with a 304 and byte ranges can be checked with If-Range.
+An episode URL carries its content version (?v=), which lets responses to
+versioned URLs be cached as immutable: re-voicing an episode changes the
+version instead of the URL staying the same with new content.
+
+The bytes can also be handed off to a front proxy or sidecar through
+X-Accel-Redirect (nginx) or X-Sendfile (Apache, lighttpd), so the Flask
+worker is not kept busy streaming large files.
+"""
+import os
+import gzip
+import shutil
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Text files worth compressing (MP3 is already compressed)
+COMPRESSIBLE_EXTENSIONS = (".json", ".txt", ".md")
+
+OFFLOAD_MODES = ("", "x-accel", "x-sendfile")
+
+
+def audio_dir():
+    """Absolute directory of the generated episodes (PODCAST_AUDIO_DIR, default data/podcasts)."""
+    return os.path.abspath(os.environ.get('PODCAST_AUDIO_DIR', 'data/podcasts'))
+
+
+def offload_mode():
+    """How file bytes are handed off to a proxy (AUDIO_OFFLOAD: "", "x-accel" or "x-sendfile")."""
+    mode = os.environ.get('AUDIO_OFFLOAD', '').lower()
+    if mode not in OFFLOAD_MODES:
+        logger.warning(f"Unknown AUDIO_OFFLOAD mode {mode}, serving files directly")
+        return ""
+    return mode
+
+
+def accel_location(filename):
+    """Internal location an X-Accel-Redirect points the proxy to (AUDIO_ACCEL_PREFIX)."""
+    prefix = os.environ.get('AUDIO_ACCEL_PREFIX', '/protected-audio/')
+    return prefix.rstrip("/") + "/" + filename.lstrip("/")
+
+
+def cache_max_age():
+    """Seconds versioned audio URLs may be cached (AUDIO_CACHE_MAX_AGE, default one year)."""
+    return int(os.environ.get('AUDIO_CACHE_MAX_AGE', 31536000))
+
+
+class ContentHashes:
+    """SHA-256 of files, computed once per file version (size and modification time)."""
+
+    def __init__(self, max_entries=1024, chunk_size=1024 * 1024):
+        self.max_entries = max_entries
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()
+        self._hashes = OrderedDict()
+
+    def get(self, path):
+        """
+        Return the content hash of a file
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        stat = os.stat(path)
+        key = (path, stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            digest = self._hashes.get(key)
+            if digest is not None:
+                self._hashes.move_to_end(key)
+                return digest
+
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.chunk_size), b""):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+
+        with self._lock:
+            self._hashes[key] = digest
+            while len(self._hashes) > self.max_entries:
+                self._hashes.popitem(last=False)
+        return digest
+
+
+_hashes = ContentHashes()
+
+
+def content_etag(path):
+    """Strong ETag value of a file."""
+    return _hashes.get(path)[:32]
+
+
+def content_version(path):
+    """Short content version used in the ?v= parameter of audio URLs."""
+    return _hashes.get(path)[:12]
+
+
+def versioned_audio_url(audio_url):
+    """
+    Add the content version of an episode to its /audio/ URL
+
+    URLs of files that do not exist (simulated audio) are returned unchanged.
+    """
+    if not audio_url or not audio_url.startswith("/audio/"):
+        return audio_url
+    path = os.path.join(audio_dir(), audio_url[len("/audio/"):].split("?", 1)[0])
+    try:
+        return f"{audio_url.split('?', 1)[0]}?v={content_version(path)}"
+    except OSError:
+        return audio_url
+
+
+def compressed_path(path):
+    """
+    Return a gzip copy of a compressible file, written next to it on first use
+
+    Returns:
+        str: Path of the .gz file, or None when the file is not worth compressing
+    """
+    if not path.endswith(COMPRESSIBLE_EXTENSIONS):
+        return None
+    gz_path = f"{path}.gz"
+    try:
+        if not os.path.exists(gz_path) or os.path.getmtime(gz_path) < os.path.getmtime(path):
+            part_path = f"{gz_path}.{threading.get_ident()}.part"
+            with open(path, "rb") as source, gzip.open(part_path, "wb") as target:
+                shutil.copyfileobj(source, target)
+            os.replace(part_path, gz_path)
+    except OSError as e:
+        logger.warning(f"Could not compress {path}: {str(e)}")
+        return None
+    return gz_path
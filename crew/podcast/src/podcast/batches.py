@@ -0,0 +1,252 @@
+"""
+Batches of podcast episodes created together.
+
+A batch (e.g. a daily episode set) is queued as one scheduler group, so the
+queue interleaves its episodes with other batches and standalone jobs
+instead of running the whole batch first. Episodes on related topics, whose
+topics share most of their words, also share one research run: the first
+of them to reach the research stage searches the web, the others reuse its
+sources ranked for their own topic, completed with matching past research.
+An episode waits for the first one at most PODCAST_BATCH_RESEARCH_WAIT
+seconds, then runs its own research.
+"""
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from collections import Counter, OrderedDict
+
+from podcast.src.podcast.research import normalize_url
+from podcast.src.podcast.research_index import InvertedIndex, get_research_index, tokenize
+from podcast.src.podcast.storage import connect, data_path
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS batches (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_batches_created_at ON batches (created_at);
+"""
+
+
+def related(a, b, threshold):
+    """True when the topics share at least ``threshold`` of the words of the shorter one."""
+    a, b = set(tokenize(a)), set(tokenize(b))
+    if not a or not b:
+        return a == b
+    return len(a & b) / min(len(a), len(b)) >= threshold
+
+
+def group_topics(topics, threshold=None):
+    """
+    Group related topics
+
+    A topic joins the first group containing a related topic.
+
+    Args:
+        topics (list): Episode topics
+        threshold (float, optional): Share of common words that makes two topics related
+            (PODCAST_BATCH_RELATED_THRESHOLD, default 0.5)
+
+    Returns:
+        list: Group number of each topic
+    """
+    if threshold is None:
+        threshold = float(os.environ.get('PODCAST_BATCH_RELATED_THRESHOLD', 0.5))
+    groups = []
+    members = []
+    for topic in topics:
+        for number, group in enumerate(members):
+            if any(related(topic, other, threshold) for other in group):
+                group.append(topic)
+                groups.append(number)
+                break
+        else:
+            members.append([topic])
+            groups.append(len(members) - 1)
+    return groups
+
+
+def rank_for_topic(research, topic, extra=None):
+    """
+    Rank the sources of a research result for another topic
+
+    Sources matching the topic's words come first (BM25 over title and
+    snippet), the others keep their order. ``extra`` sources (past research)
+    not already present are appended before ranking.
+
+    Returns:
+        dict: A research result shaped like ResearchEngine.run()
+    """
+    sources = [dict(source) for source in research.get("sources", [])]
+    seen = {normalize_url(source["url"]) for source in sources}
+    for result in extra or []:
+        key = normalize_url(result["url"])
+        if key not in seen:
+            seen.add(key)
+            sources.append({"title": result.get("title", ""), "url": result["url"],
+                            "snippet": result.get("snippet", ""), "date": result.get("date"),
+                            "queries": []})
+
+    index = InvertedIndex()
+    for i, source in enumerate(sources):
+        index.add(i, source["title"], source["snippet"])
+    scores = index.search(tokenize(topic))
+    order = sorted(range(len(sources)), key=lambda i: (-scores.get(i, 0.0), i))
+    return {
+        "sources": [sources[i] for i in order],
+        "topics": list(research.get("topics", [])),
+        "queries": list(research.get("queries", [])),
+    }
+
+
+class Batch:
+    """Episodes of a batch with their research groups."""
+
+    def __init__(self, job_ids, topics, batch_id=None, created_at=None, research_wait=None):
+        """
+        Initialize the batch
+
+        Args:
+            job_ids (list): Episode jobs
+            topics (list): Episode topics
+            batch_id (str, optional): Batch id, generated when not given
+            created_at (float, optional): Creation timestamp
+            research_wait (float, optional): Seconds an episode waits for the shared research of its
+                group before running its own (PODCAST_BATCH_RESEARCH_WAIT, default 300)
+        """
+        self.id = batch_id or str(uuid.uuid4())
+        self.job_ids = list(job_ids)
+        self.topics = list(topics)
+        self.created_at = created_at or time.time()
+        self.groups = group_topics(self.topics)
+        self.research_wait = float(research_wait or os.environ.get('PODCAST_BATCH_RESEARCH_WAIT', 300))
+        self._group_locks = {group: threading.Lock() for group in set(self.groups)}
+        self._lock = threading.Lock()
+        # Research of each group, with the topic it was run for, until every member took it
+        self._research = {}
+        self._waiting = Counter(self.groups)
+
+    def to_record(self):
+        return {"id": self.id, "job_ids": self.job_ids, "topics": self.topics, "created_at": self.created_at}
+
+    @classmethod
+    def from_record(cls, record):
+        return cls(record["job_ids"], record["topics"], batch_id=record["id"], created_at=record["created_at"])
+
+    def group_of(self, job_id):
+        return self.groups[self.job_ids.index(job_id)]
+
+    def research(self, job_id, topic, run):
+        """
+        Research for an episode, shared with the related episodes of the batch
+
+        Args:
+            job_id (str): Episode job
+            topic (str): Episode topic
+            run (callable): Researches a topic, as ResearchEngine.run
+
+        Returns:
+            tuple: (research result, topic the shared research was run for or None
+            when the episode ran its own)
+        """
+        group = self.group_of(job_id)
+        # Related episodes wait for the first one instead of searching the same angles,
+        # but not forever: its research may be stuck, or it may not be running at all
+        lock = self._group_locks[group]
+        if not lock.acquire(timeout=self.research_wait):
+            logger.warning(f"Batch {self.id}: shared research not ready after {self.research_wait:.0f}s, "
+                           f"job {job_id} runs its own")
+            self._take(group)
+            return run(topic), None
+        try:
+            with self._lock:
+                shared = self._research.get(group)
+            if shared is None:
+                research = run(topic)
+                with self._lock:
+                    if self._waiting[group] > 1:
+                        self._research[group] = (topic, research)
+                self._take(group)
+                return research, None
+            self._take(group)
+        finally:
+            lock.release()
+
+        source_topic, research = shared
+        try:
+            past = get_research_index().search(topic, limit=10)
+        except Exception as e:
+            logger.warning(f"Research index lookup failed: {str(e)}")
+            past = []
+        return rank_for_topic(research, topic, past), source_topic
+
+    def _take(self, group):
+        """Count a member of the group as done, the shared research is dropped after the last one."""
+        with self._lock:
+            self._waiting[group] -= 1
+            if self._waiting[group] <= 0:
+                self._research.pop(group, None)
+
+
+class BatchStore:
+    """SQLite store of batches, recent ones are kept in memory."""
+
+    def __init__(self, path=None, hot_size=100):
+        """
+        Open the batch database
+
+        Args:
+            path (str, optional): Database file, defaults to batches.db on the data volume
+            hot_size (int, optional): Batches kept in memory
+        """
+        self.path = path or data_path('batches.db', 'PODCAST_BATCH_DB_PATH')
+        self.hot_size = hot_size
+        self._lock = threading.Lock()
+        self._batches = OrderedDict()
+        self._conn = connect(self.path)
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def add(self, batch):
+        with self._lock:
+            self._remember(batch)
+            self._conn.execute("INSERT OR REPLACE INTO batches (id, data, created_at) VALUES (?, ?, ?)",
+                               (batch.id, json.dumps(batch.to_record()), batch.created_at))
+            self._conn.commit()
+
+    def get(self, batch_id):
+        """Return a batch by id, loading it from the database if needed."""
+        with self._lock:
+            batch = self._batches.get(batch_id)
+            if batch is None:
+                row = self._conn.execute("SELECT data FROM batches WHERE id = ?", (batch_id,)).fetchone()
+                if row is None:
+                    return None
+                batch = Batch.from_record(json.loads(row["data"]))
+            self._remember(batch)
+            return batch
+
+    def _remember(self, batch):
+        self._batches[batch.id] = batch
+        self._batches.move_to_end(batch.id)
+        while len(self._batches) > self.hot_size:
+            self._batches.popitem(last=False)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_batch_store():
+    """Return the process-wide batch store."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = BatchStore()
+        return _store
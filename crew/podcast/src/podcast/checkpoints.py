@@ -0,0 +1,101 @@
+"""
+Per-stage checkpoints of podcast jobs.
+
+Research, every crew task and the final script save their output as soon
+as they complete. A failed job can then be resumed from its first incomplete
+stage instead of running from research again. The audio is not
+checkpointed: a job resumed with its script checkpoint goes straight to the
+voice stage, which synthesizes the whole script again (segments already
+synthesized are served from the TTS cache). Checkpoints live in SQLite on
+the data volume and are deleted once a job completes.
+"""
+import json
+import time
+import logging
+import threading
+
+from podcast.src.podcast.storage import connect, data_path
+
+logger = logging.getLogger(__name__)
+
+# Crew tasks in execution order, with the job stage their output belongs to
+CREW_TASKS = (
+    ("research_task", "research"),
+    ("topic_curation_task", "summarize"),
+    ("script_writing_task", "script"),
+    ("audio_production_task", "voice"),
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    job_id TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (job_id, stage)
+) WITHOUT ROWID;
+"""
+
+
+class CheckpointStore:
+    """SQLite store of stage outputs keyed by job and stage."""
+
+    def __init__(self, path=None):
+        """
+        Open the checkpoint database
+
+        Args:
+            path (str, optional): Database file, defaults to checkpoints.db on the data volume
+        """
+        self.path = path or data_path('checkpoints.db', 'PODCAST_CHECKPOINT_DB_PATH')
+        self._lock = threading.Lock()
+        self._conn = connect(self.path)
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def save(self, job_id, stage, data):
+        """Save the output of a completed stage, replacing an earlier one."""
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO checkpoints (job_id, stage, data, created_at) VALUES (?, ?, ?, ?)",
+                    (job_id, stage, json.dumps(data), time.time())
+                )
+                self._conn.commit()
+        except Exception as e:
+            # A missing checkpoint only means the stage runs again on resume
+            logger.warning(f"Could not save {stage} checkpoint of job {job_id}: {str(e)}")
+
+    def load(self, job_id):
+        """
+        Return the saved stages of a job
+
+        Returns:
+            dict: Output of every checkpointed stage, keyed by stage name
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT stage, data FROM checkpoints WHERE job_id = ?", (job_id,)).fetchall()
+        return {row["stage"]: json.loads(row["data"]) for row in rows}
+
+    def clear(self, job_id, stages=None):
+        """Delete the checkpoints of a job, or only the given stages."""
+        with self._lock:
+            if stages is None:
+                self._conn.execute("DELETE FROM checkpoints WHERE job_id = ?", (job_id,))
+            else:
+                self._conn.executemany("DELETE FROM checkpoints WHERE job_id = ? AND stage = ?",
+                                       [(job_id, stage) for stage in stages])
+            self._conn.commit()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_checkpoint_store():
+    """Return the process-wide checkpoint store."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = CheckpointStore()
+        return _store
@@ -2,6 +2,7 @@
 Podcast creation crew module for generating podcast content using CrewAI.
 """
 import os
+import time
 import traceback
 from datetime import datetime
 
@@ -9,6 +10,15 @@ from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 import dotenv
 
+from podcast.src.podcast.checkpoints import CREW_TASKS
+from podcast.src.podcast.llm_cache import get_llm_cache
+from podcast.src.podcast.metrics import CREW_TASK_SECONDS, instrument_llm
+from podcast.src.podcast.ollama_pool import get_ollama_pool, ollama_urls
+from podcast.src.podcast.registry import get_agent_pool, llm_config, shared_tool
+from podcast.src.podcast.research_index import get_research_index
+from podcast.src.podcast.streaming import TokenCoalescer, get_stream_router, streaming_enabled
+from podcast.src.podcast.tracing import finish_span, start_span
+
 # Load environment variables from .env file if it exists
 dotenv.load_dotenv()
 
@@ -20,7 +30,16 @@ class PodcastCrew:
     agents_config = 'config/agents.yaml'
     tasks_config = 'config/tasks.yaml'
 
-    def __init__(self, topic, hosts=None, job_id=None, callback=None):
+    # Job stage each agent's output belongs to
+    AGENT_STAGES = {
+        "researcher": "research",
+        "topic_curator": "summarize",
+        "script_writer": "script",
+        "audio_director": "voice",
+    }
+
+    def __init__(self, topic, hosts=None, job_id=None, callback=None, agent_pool=None, stream_callback=None,
+                 research=None, completed=None, task_output_callback=None):
         """
         Initialize the podcast crew with specific parameters
         
@@ -29,124 +48,157 @@ class PodcastCrew:
             hosts (list, optional): List of podcast hosts
             job_id (str, optional): Unique job identifier
             callback (callable, optional): Callback function for job updates
+            agent_pool (AgentPool, optional): Pool to check agents out of, defaults to the process-wide pool
+            stream_callback (callable, optional): Called with (stage, text, offset) as LLM tokens are generated
+            research (dict, optional): Results of the research stage ("sources", "topics") given to the researcher
+            completed (dict, optional): Raw outputs of tasks completed by an earlier run, keyed by task name;
+                these tasks are skipped and their outputs given to the remaining ones
+            task_output_callback (callable, optional): Called with (task name, raw output) as each task completes
         """
         self.topic = topic
         self.hosts = hosts or ["Alex", "Jamie"]
         self.job_id = job_id
         self.callback = callback
+        self.agent_pool = agent_pool or get_agent_pool()
+        self.stream_callback = stream_callback
+        self.research = research or {}
+        self.completed = completed or {}
+        # Raw output of every task, completed by an earlier run or by this one
+        self.outputs = dict(self.completed)
+        self.task_output_callback = task_output_callback
+        self.stream_router = get_stream_router() if stream_callback and streaming_enabled() else None
+        # Agents checked out by this crew, built or reused once per job
+        self._agents = {}
+        self._streams = {}
+        self._finished_tasks = 0
+        self._task_started = None
+        self._task_span = None
+
+    def _agent(self, name, build):
+        """Return the agent ``name`` of this crew, checking it out of the pool on first use."""
+        if name not in self._agents:
+            config = llm_config()
+            instance = self.agent_pool.acquire(name, config, build)
+            # Pooled agents are wrapped once: calls are spread across the Ollama
+            # endpoints and repeated prompts skip the model
+            llm = getattr(instance, "llm", None)
+            get_ollama_pool().wrap(llm)
+            instrument_llm(llm)
+            get_llm_cache().wrap(llm)
+            self._agents[name] = (config, instance)
+            self._stream(name, instance)
+        return self._agents[name][1]
+
+    def _stream(self, name, instance):
+        """Route the tokens of an agent's LLM to the stream callback."""
+        llm = getattr(instance, "llm", None)
+        if self.stream_router is None or llm is None or not hasattr(llm, "stream"):
+            return
+        stage = self.AGENT_STAGES.get(name, name)
+        coalescer = TokenCoalescer(lambda text, offset: self.stream_callback(stage, text, offset))
+        self._streams[name] = (llm, llm.stream, coalescer)
+        llm.stream = True
+        self.stream_router.register(llm, coalescer)
+
+    def release_agents(self):
+        """Return the agents of this crew to the pool."""
+        streams, self._streams = self._streams, {}
+        for llm, was_streaming, coalescer in streams.values():
+            self.stream_router.unregister(llm)
+            coalescer.flush()
+            llm.stream = was_streaming
+
+        agents, self._agents = self._agents, {}
+        for name, (config, instance) in agents.items():
+            self.agent_pool.release(name, config, instance)
 
     @agent
     def researcher(self) -> Agent:
         """Creates the researcher agent."""
-        return Agent(
-            role=f"Spécialiste de recherche sur {self.topic}",
+        # {topic} is interpolated from the kickoff inputs, so the agent can be reused across topics
+        return self._agent("researcher", lambda config: Agent(
+            role="Spécialiste de recherche sur {topic}",
             goal="Effectuer des recherches complètes sur le sujet du podcast",
             backstory="Vous êtes un chercheur québécois spécialisé en recherche d'information",
             verbose=True,
-            llm_config={
-                "provider": "ollama",
-                "config": {
-                    "model": os.environ.get('MODEL', 'deepseek-coder:7b'),
-                    "temperature": 0.7,
-                    "base_url": os.environ.get('OLLAMA_BASE_URL', 'http://localhost:11434'),
-                }
-            }
-        )
+            llm_config=config
+        ))
 
     @agent
     def topic_curator(self) -> Agent:
         """Creates the topic curator agent."""
-        return Agent(
+        return self._agent("topic_curator", lambda config: Agent(
             role="Curateur de sujets de podcast",
             goal="Sélectionner et affiner les sujets les plus captivants",
             backstory="Vous avez un sens aigu pour identifier les sujets tendance québécois",
             verbose=True,
-            llm_config={
-                "provider": "ollama",
-                "config": {
-                    "model": os.environ.get('MODEL', 'deepseek-coder:7b'),
-                    "temperature": 0.7,
-                    "base_url": os.environ.get('OLLAMA_BASE_URL', 'http://localhost:11434'),
-                }
-            }
-        )
+            llm_config=config
+        ))
 
     @agent
     def script_writer(self) -> Agent:
         """Creates the script writer agent."""
-        return Agent(
+        return self._agent("script_writer", lambda config: Agent(
             role="Rédacteur de scripts de podcast",
             goal="Transformer les résultats de recherche en un script conversationnel",
             backstory="Vous maîtrisez le français québécois et ses expressions colorées",
             verbose=True,
-            llm_config={
-                "provider": "ollama",
-                "config": {
-                    "model": os.environ.get('MODEL', 'deepseek-coder:7b'),
-                    "temperature": 0.7,
-                    "base_url": os.environ.get('OLLAMA_BASE_URL', 'http://localhost:11434'),
-                }
-            }
-        )
+            llm_config=config
+        ))
 
     @agent
     def audio_director(self) -> Agent:
         """Creates the audio director agent."""
-        return Agent(
+        return self._agent("audio_director", lambda config: Agent(
             role="Spécialiste de production audio de podcast",
             goal="Fournir des conseils pour la production audio du podcast",
             backstory="Vous connaissez les nuances de l'accent québécois",
             verbose=True,
-            llm_config={
-                "provider": "ollama",
-                "config": {
-                    "model": os.environ.get('MODEL', 'deepseek-coder:7b'),
-                    "temperature": 0.7,
-                    "base_url": os.environ.get('OLLAMA_BASE_URL', 'http://localhost:11434'),
-                }
-            }
-        )
+            llm_config=config
+        ))
 
     @task
     def research_task(self) -> Task:
         """Creates the research task."""
         try:
+            from podcast.tools.research_index import ResearchIndexTool
             from podcast.tools.web_search import WebSearchTool
-            
-            task_instance = Task(
-                description=f"Research on {self.topic} for a French Quebec podcast",
-                expected_output=f"Comprehensive research information about {self.topic} including key facts, trends, and expert opinions",
-                agent=self.researcher()
-            )
-            
-            # Add tools separately
-            task_instance.tools = [WebSearchTool()]
-            
-            # Callback is handled at the Crew level, not task level in newer CrewAI versions
-            
-            return task_instance
         except ImportError:
             # Fallback to local import if package import fails
+            from podcast.src.podcast.tools.research_index import ResearchIndexTool
             from podcast.src.podcast.tools.web_search import WebSearchTool
-            
-            task_instance = Task(
-                description=f"Research on {self.topic} for a French Quebec podcast",
-                expected_output=f"Comprehensive research information about {self.topic} including key facts, trends, and expert opinions",
-                agent=self.researcher()
+        
+        description = f"Research on {self.topic} for a French Quebec podcast"
+        sources = self.research.get("sources") or []
+        if sources:
+            # Start from the sources already found by the research stage
+            description += "\n\nSources already found:\n" + "\n".join(
+                f"- {source['title']} ({source['url']}): {source.get('snippet', '')}"
+                for source in sources[:10]
             )
-            
-            # Add tools separately
-            task_instance.tools = [WebSearchTool()]
-            
-            # Callback is handled at the Crew level, not task level in newer CrewAI versions
-            
-            return task_instance
+        
+        task_instance = Task(
+            description=description,
+            expected_output=f"Comprehensive research information about {self.topic} including key facts, trends, and expert opinions",
+            agent=self.researcher()
+        )
+        
+        # Add tools separately, the tools are stateless and shared by every job
+        task_instance.tools = [
+            shared_tool("research_index", ResearchIndexTool),
+            shared_tool("web_search", WebSearchTool),
+        ]
+        
+        # Callback is handled at the Crew level, not task level in newer CrewAI versions
+        
+        return task_instance
 
     @task
     def topic_curation_task(self) -> Task:
         """Creates the topic curation task."""
         task_instance = Task(
-            description=f"Curate topics about {self.topic} for a French Quebec podcast",
+            description=f"Curate topics about {self.topic} for a French Quebec podcast" +
+                        self._earlier_outputs("topic_curation_task"),
             expected_output=f"A curated list of engaging subtopics and angles for a podcast about {self.topic}, tailored for a Quebec audience",
             agent=self.topic_curator()
         )
@@ -159,7 +211,8 @@ class PodcastCrew:
     def script_writing_task(self) -> Task:
         """Creates the script writing task."""
         task_instance = Task(
-            description=f"Write a podcast script in French Quebec style about {self.topic} for hosts {self.hosts[0]} and {self.hosts[1]}",
+            description=f"Write a podcast script in French Quebec style about {self.topic} for hosts {self.hosts[0]} and {self.hosts[1]}" +
+                        self._earlier_outputs("script_writing_task"),
             expected_output="A complete podcast script with dialogue for both hosts, formatted with clear sections and including Quebec French expressions",
             agent=self.script_writer()
         )
@@ -173,35 +226,23 @@ class PodcastCrew:
         """Creates the audio production task."""
         try:
             from podcast.tools.elevenlabs import ElevenLabsTool
-            
-            task_instance = Task(
-                description=f"Create audio production guidelines for a French Quebec podcast about {self.topic} using ElevenLabs voices Alex and Simon",
-                expected_output="Detailed audio production guidelines including voice profiles, tone instructions, and technical specifications for a Quebec-accent podcast",
-                agent=self.audio_director()
-            )
-            
-            # Add tools separately
-            task_instance.tools = [ElevenLabsTool()]
-            
-            # Callback is handled at the Crew level, not task level in newer CrewAI versions
-            
-            return task_instance
         except ImportError:
             # Fallback to local import if package import fails
             from podcast.src.podcast.tools.elevenlabs import ElevenLabsTool
-            
-            task_instance = Task(
-                description=f"Create audio production guidelines for a French Quebec podcast about {self.topic} using ElevenLabs voices Alex and Simon",
-                expected_output="Detailed audio production guidelines including voice profiles, tone instructions, and technical specifications for a Quebec-accent podcast",
-                agent=self.audio_director()
-            )
-            
-            # Add tools separately
-            task_instance.tools = [ElevenLabsTool()]
-            
-            # Callback is handled at the Crew level, not task level in newer CrewAI versions
-            
-            return task_instance
+        
+        task_instance = Task(
+            description=f"Create audio production guidelines for a French Quebec podcast about {self.topic} using ElevenLabs voices Alex and Simon" +
+                        self._earlier_outputs("audio_production_task"),
+            expected_output="Detailed audio production guidelines including voice profiles, tone instructions, and technical specifications for a Quebec-accent podcast",
+            agent=self.audio_director()
+        )
+        
+        # Add tools separately, the tool is stateless and shared by every job
+        task_instance.tools = [shared_tool("elevenlabs", ElevenLabsTool)]
+        
+        # Callback is handled at the Crew level, not task level in newer CrewAI versions
+        
+        return task_instance
 
     @crew
     def crew(self) -> Crew:
@@ -213,16 +254,64 @@ class PodcastCrew:
                 self.script_writer(),
                 self.audio_director()
             ],
+            # Tasks completed by an earlier run of the job are not run again
             tasks=[
-                self.research_task(),
-                self.topic_curation_task(),
-                self.script_writing_task(),
-                self.audio_production_task()
+                build() for name, build in (
+                    ("research_task", self.research_task),
+                    ("topic_curation_task", self.topic_curation_task),
+                    ("script_writing_task", self.script_writing_task),
+                    ("audio_production_task", self.audio_production_task),
+                ) if name not in self.completed
             ],
             process=Process.sequential,
             verbose=True,
+            task_callback=self._on_task_done,
         )
 
+    def remaining_tasks(self):
+        """Names of the tasks still to run, in execution order."""
+        return [name for name, _ in CREW_TASKS if name not in self.completed]
+
+    def _earlier_outputs(self, task_name):
+        """Outputs of skipped tasks preceding ``task_name``, which the crew no longer passes as context."""
+        names = [name for name, _ in CREW_TASKS]
+        earlier = [name for name in names[:names.index(task_name)] if name in self.completed]
+        if not earlier:
+            return ""
+        return "\n\nResults of the previous steps:\n" + "\n\n".join(
+            f"### {name}\n{self.completed[name]}" for name in earlier
+        )
+
+    def _on_task_done(self, task_output=None):
+        """Emit the tokens still buffered when a task finishes and report its output."""
+        for _, _, coalescer in list(self._streams.values()):
+            coalescer.flush()
+
+        remaining = self.remaining_tasks()
+        name = getattr(task_output, "name", None)
+        if name not in remaining:
+            # Tasks complete in order, older CrewAI versions do not name their outputs
+            name = remaining[self._finished_tasks] if self._finished_tasks < len(remaining) else None
+        self._finished_tasks += 1
+        now = time.perf_counter()
+        if name and self._task_started is not None:
+            CREW_TASK_SECONDS.observe(now - self._task_started, task=name, stage=dict(CREW_TASKS).get(name, ""))
+        self._task_started = now
+        finish_span(self._task_span)
+        self._task_span = None
+        if self._finished_tasks < len(remaining):
+            self._task_span = start_span(remaining[self._finished_tasks], "task")
+        if name:
+            raw = getattr(task_output, "raw", None)
+            self.outputs[name] = raw if isinstance(raw, str) else str(task_output)
+        if name and self.task_output_callback:
+            try:
+                self.task_output_callback(name, self.outputs[name])
+            except Exception as e:
+                if self.callback:
+                    self.callback(f"Could not record the output of {name}: {str(e)}", "warning")
+        return task_output
+
     def run(self):
         """
         Run the podcast creation process
@@ -230,8 +319,36 @@ class PodcastCrew:
         Returns:
             dict: Results of the podcast creation process
         """
+        try:
+            if not self.remaining_tasks():
+                # Every task completed in an earlier run, the crew's final output is the last task's
+                result = self._convert_string_result(self.completed[CREW_TASKS[-1][0]])
+            else:
+                result = self._kickoff()
+            return self._with_script(result)
+        finally:
+            finish_span(self._task_span)
+            self._task_span = None
+            # Agents go back to the pool for the next job
+            self.release_agents()
+
+    def _with_script(self, result):
+        """
+        Use the script writer's output as the script of the results
+
+        The crew's final output is the audio director's, which comments on the
+        script rather than being it; the script streamed to speech synthesis
+        is the script writer's.
+        """
+        script = self.outputs.get("script_writing_task")
+        if isinstance(result, dict) and script and script.strip():
+            result["script"] = script
+        return result
+
+    def _kickoff(self):
+        """Kick off the crew and convert its results."""
         # Check configuration
-        ollama_base_url = os.environ.get('OLLAMA_BASE_URL', 'http://localhost:11434')
+        ollama_base_url = ", ".join(ollama_urls())
         serper_key = os.environ.get('SERPER_API_KEY')
         elevenlabs_key = os.environ.get('ELEVENLABS_API_KEY')
         memory_db_path = os.environ.get('CREWAI_MEMORY_DB_PATH')
@@ -320,6 +437,8 @@ class PodcastCrew:
             if self.callback:
                 self.callback("Starting CrewAI execution with inputs: " + str(inputs), "debug")
                 
+            self._task_started = time.perf_counter()
+            self._task_span = start_span(self.remaining_tasks()[0], "task")
             results = crew_instance.kickoff(inputs=inputs)
             
             # Debug the results in detail
@@ -521,8 +640,9 @@ class PodcastCrew:
         topic = inputs.get('topic', self.topic)
         hosts = inputs.get('hosts', self.hosts)
         
-        # 1. Research task - create simulated data in French
-        research_data = {
+        # 1. Research task - reuse past research on the topic, or create simulated data in French
+        past_results = get_research_index().search(topic, limit=5)
+        research_data = {"results": past_results} if past_results else {
             "results": [
                 {
                     "title": f"Comprendre {topic}",
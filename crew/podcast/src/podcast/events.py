@@ -0,0 +1,116 @@
+"""
+In-process event broker used to push job progress to Server-Sent Events clients.
+"""
+import json
+import queue
+import threading
+from collections import deque, namedtuple
+
+Event = namedtuple("Event", ["seq", "job_id", "name", "data"])
+
+
+def format_sse(name, data, event_id=None):
+    """Format a single Server-Sent Events message."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {name}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+class Subscription:
+    """Stream of events delivered to a single client."""
+
+    def __init__(self, broker, job_id=None, max_pending=1000):
+        self.broker = broker
+        self.job_id = job_id
+        self.overflowed = False
+        self._queue = queue.Queue(maxsize=max_pending)
+
+    def deliver(self, event):
+        if self.job_id is None and event.seq is None:
+            # Transient events only go to the subscribers of their job
+            return
+        if self.job_id is not None and event.job_id != self.job_id:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            # Slow client: stop delivering, it will resume from its last event id
+            self.overflowed = True
+
+    def get(self, timeout=None):
+        """Return the next event, or None if nothing arrived within ``timeout``."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class EventBroker:
+    """Fan-out of job events to subscribers with a bounded replay history."""
+
+    def __init__(self, history_size=1000):
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._history = deque(maxlen=history_size)
+        self._subscribers = set()
+
+    def publish(self, name, data, job_id=None, transient=False):
+        """
+        Publish an event to all subscribers and return its sequence number.
+
+        Transient events (such as streamed partial output) are only delivered
+        live to the subscribers of ``job_id``; they get no sequence number and
+        are not kept for replay.
+        """
+        if transient:
+            event = Event(None, job_id, name, data)
+            with self._lock:
+                subscribers = list(self._subscribers)
+            for subscription in subscribers:
+                subscription.deliver(event)
+            return None
+
+        # Delivered under the lock (queue puts never block), so every subscriber
+        # receives events in sequence order and never skips one as already seen
+        with self._lock:
+            self._seq += 1
+            event = Event(self._seq, job_id, name, data)
+            self._history.append(event)
+            for subscription in self._subscribers:
+                subscription.deliver(event)
+        return event.seq
+
+    def subscribe(self, job_id=None):
+        """Subscribe to all events, or only to the events of one job."""
+        subscription = Subscription(self, job_id)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def replay(self, last_seq, job_id=None):
+        """
+        Return the events published after ``last_seq``.
+
+        Returns:
+            list: Events in order, or None if the history no longer reaches
+            back to ``last_seq`` and the client has to reload its state
+        """
+        with self._lock:
+            events = list(self._history)
+            current_seq = self._seq
+        if last_seq > current_seq or (events and last_seq < events[0].seq - 1):
+            return None
+        return [
+            event for event in events
+            if event.seq > last_seq and (job_id is None or event.job_id == job_id)
+        ]
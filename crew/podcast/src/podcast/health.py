@@ -0,0 +1,105 @@
+"""
+Background health probing.
+
+Ollama reachability and its model list are refreshed by a daemon thread on a
+fixed interval, so health endpoints answer from memory instead of making a
+network call on every request.
+"""
+import os
+import time
+import logging
+import threading
+from datetime import datetime
+
+import requests
+
+from podcast.src.podcast.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+
+class OllamaProber:
+    """Periodically checks Ollama and caches the last result."""
+
+    def __init__(self, base_url=None, model=None, interval=None, timeout=None):
+        """
+        Initialize the prober
+
+        Args:
+            base_url (str, optional): Ollama URL, defaults to OLLAMA_BASE_URL
+            model (str, optional): Configured model, defaults to MODEL
+            interval (float, optional): Seconds between probes (HEALTH_PROBE_INTERVAL, default 15)
+            timeout (float, optional): Probe timeout in seconds (HEALTH_PROBE_TIMEOUT, default 3)
+        """
+        self.base_url = base_url or os.environ.get('OLLAMA_BASE_URL', 'http://localhost:11434')
+        self.model = model or os.environ.get('MODEL', 'deepseek-coder:7b-instruct')
+        self.interval = float(interval or os.environ.get('HEALTH_PROBE_INTERVAL', 15))
+        self.timeout = float(timeout or os.environ.get('HEALTH_PROBE_TIMEOUT', 3))
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._state = {
+            "ollama_connection": "unknown",
+            "available_models": [],
+            "model_available": False,
+            "checked_at": None,
+        }
+
+    def start(self):
+        """Run a first probe in the background and keep probing on the interval."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="health-prober", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def snapshot(self):
+        """Return a copy of the last probe result."""
+        with self._lock:
+            state = dict(self._state)
+        state["available_models"] = list(state["available_models"])
+        if state["checked_at"] is not None:
+            state["age_seconds"] = round(time.time() - state["checked_at"], 1)
+            state["checked_at"] = datetime.fromtimestamp(state["checked_at"]).isoformat()
+        return state
+
+    def probe(self):
+        """Check Ollama now and update the cached result."""
+        start = time.perf_counter()
+        state = {"available_models": [], "model_available": False}
+        try:
+            response = get_http_client().get(f"{self.base_url}/api/tags", timeout=self.timeout)
+            if response.status_code == 200:
+                models = [model["name"] for model in response.json().get("models", [])]
+                state["ollama_connection"] = "ok"
+                state["available_models"] = models
+
+                # Compare model names without their tags
+                model_base = self.model.split(':')[0]
+                state["model_available"] = model_base in [m.split(':')[0] for m in models]
+            else:
+                state["ollama_connection"] = "failed"
+                state["ollama_error"] = f"HTTP {response.status_code}"
+        except (requests.RequestException, ValueError) as e:
+            state["ollama_connection"] = "error"
+            state["ollama_error"] = str(e)
+
+        state["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        state["checked_at"] = time.time()
+        with self._lock:
+            previous = self._state.get("ollama_connection")
+            self._state = state
+        if previous != state["ollama_connection"]:
+            logger.info(f"Ollama connection: {previous} -> {state['ollama_connection']}")
+        return state
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.probe()
+            except Exception as e:
+                logger.error(f"Health probe failed: {str(e)}")
+            self._stop.wait(self.interval)
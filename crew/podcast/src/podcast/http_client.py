@@ -0,0 +1,161 @@
+"""
+Shared HTTP client with pooled keep-alive connections.
+
+Every external call (Serper, ElevenLabs, Ollama) goes through one process-wide
+client that keeps a requests.Session per host, so connections are reused
+instead of opening a new TCP/TLS connection per request. Requests get default
+connect/read timeouts and idempotent requests are retried on connection
+errors and 502/503/504 responses.
+"""
+import os
+import time
+import logging
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from podcast.src.podcast.metrics import HTTP_REQUEST_SECONDS, HTTP_REQUESTS_TOTAL
+from podcast.src.podcast.tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+class HttpClient:
+    """Per-host pooled sessions with timeouts, retries and request metrics."""
+
+    def __init__(self, pool_maxsize=None, connect_timeout=None, read_timeout=None, retries=None):
+        """
+        Initialize the client
+
+        Args:
+            pool_maxsize (int, optional): Connections kept per host (HTTP_POOL_MAXSIZE, default 10)
+            connect_timeout (float, optional): Connect timeout in seconds (HTTP_CONNECT_TIMEOUT, default 5)
+            read_timeout (float, optional): Read timeout in seconds (HTTP_READ_TIMEOUT, default 60)
+            retries (int, optional): Retries of idempotent requests (HTTP_RETRIES, default 2)
+        """
+        self.pool_maxsize = int(pool_maxsize or os.environ.get('HTTP_POOL_MAXSIZE', 10))
+        self.connect_timeout = float(connect_timeout or os.environ.get('HTTP_CONNECT_TIMEOUT', 5))
+        self.read_timeout = float(read_timeout or os.environ.get('HTTP_READ_TIMEOUT', 60))
+        self.retries = int(retries if retries is not None else os.environ.get('HTTP_RETRIES', 2))
+
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._stats = {}
+
+    def session(self, url):
+        """Return the pooled session for the host of ``url``."""
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = self._create_session()
+                self._sessions[host] = session
+                self._stats[host] = {"requests": 0, "errors": 0, "seconds": 0.0}
+            return session
+
+    def request(self, method, url, timeout=None, **kwargs):
+        """
+        Send a request through the pooled session of the target host
+
+        Args:
+            method (str): HTTP method
+            url (str): Request URL
+            timeout (float or tuple, optional): Overrides the default (connect, read) timeouts
+            **kwargs: Passed on to requests.Session.request
+
+        Returns:
+            requests.Response: The response
+
+        Raises:
+            requests.RequestException: If the request fails
+        """
+        session = self.session(url)
+        host = "{0.scheme}://{0.netloc}".format(urlsplit(url))
+        start = time.perf_counter()
+        error = False
+        try:
+            with span(f"{method} {host}", "http", path=urlsplit(url).path) as current:
+                response = session.request(method, url, timeout=timeout or (self.connect_timeout, self.read_timeout),
+                                           **kwargs)
+                if current is not None:
+                    current.set(status=response.status_code, bytes=response.headers.get("Content-Length"))
+            error = response.status_code >= 400
+            return response
+        except requests.RequestException:
+            error = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_REQUEST_SECONDS.observe(elapsed, host=host)
+            HTTP_REQUESTS_TOTAL.inc(host=host, outcome="error" if error else "ok")
+            with self._lock:
+                stats = self._stats[host]
+                stats["requests"] += 1
+                stats["seconds"] += elapsed
+                if error:
+                    stats["errors"] += 1
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def stats(self):
+        """Return request counts, error counts, latency and pool usage per host."""
+        with self._lock:
+            hosts = {host: dict(stats) for host, stats in self._stats.items()}
+            sessions = dict(self._sessions)
+
+        for host, stats in hosts.items():
+            stats["avg_ms"] = round(stats["seconds"] / stats["requests"] * 1000, 1) if stats["requests"] else 0.0
+            stats["connections"] = 0
+            stats["idle_connections"] = 0
+            adapter = sessions[host].get_adapter(host)
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                stats["connections"] += pool.num_connections
+                # Unused slots of the pool queue hold None
+                stats["idle_connections"] += sum(1 for conn in list(pool.pool.queue) if conn) if pool.pool else 0
+        return {
+            "pool_maxsize": self.pool_maxsize,
+            "timeouts": [self.connect_timeout, self.read_timeout],
+            "hosts": hosts,
+        }
+
+    def _create_session(self):
+        retry = Retry(
+            total=self.retries,
+            connect=self.retries,
+            read=0,
+            status=self.retries,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(["GET", "HEAD", "OPTIONS"]),
+            backoff_factor=0.3,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize, max_retries=retry)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """Return the process-wide HTTP client."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
@@ -0,0 +1,387 @@
+"""
+Durable storage for podcast jobs.
+
+JobStore persists job records and their update log in SQLite (WAL mode).
+Update events are buffered and written in batches by a background thread.
+JobRepository sits in front of the store and keeps active jobs plus an LRU
+set of recently finished jobs in memory; everything else is loaded on demand.
+"""
+import os
+import json
+import time
+import base64
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from podcast.src.podcast.storage import connect, data_path
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUSES = ("completed", "failed")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    topic TEXT,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    data TEXT NOT NULL,
+    summary TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status);
+CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs (created_at);
+
+CREATE TABLE IF NOT EXISTS job_updates (
+    job_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    time TEXT,
+    message TEXT,
+    stage TEXT,
+    PRIMARY KEY (job_id, idx)
+) WITHOUT ROWID;
+"""
+
+
+def summarize(record):
+    """Summary projection of a job record: everything except results and updates."""
+    return {key: value for key, value in record.items() if key not in ("results", "updates")}
+
+
+def encode_cursor(created_at, job_id):
+    """Encode a listing position as an opaque cursor."""
+    return base64.urlsafe_b64encode(json.dumps([created_at, job_id]).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Decode a cursor made by encode_cursor. Raises ValueError if it is malformed."""
+    try:
+        created_at, job_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(created_at), str(job_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+class JobStore:
+    """SQLite backed store for job records and their update events."""
+
+    def __init__(self, path=None, flush_interval=1.0, batch_size=100):
+        """
+        Open (and create if needed) the job database
+
+        Args:
+            path (str, optional): Database file, defaults to jobs.db on the data volume
+            flush_interval (float, optional): Seconds between background flushes
+            batch_size (int, optional): Pending updates that trigger an early flush
+        """
+        self.path = path or data_path('jobs.db', 'PODCAST_JOB_DB_PATH')
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+
+        self._conn = connect(self.path)
+        self._conn.executescript(SCHEMA)
+        columns = [row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")]
+        if "summary" not in columns:
+            # Databases created before summaries were stored
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN summary TEXT")
+        self._conn.commit()
+
+        self._lock = threading.Lock()
+        self._pending = threading.Condition(threading.Lock())
+        self._pending_updates = []
+        self._pending_records = {}
+        self._closed = False
+
+        self._flusher = threading.Thread(target=self._flush_loop, name="job-store-flusher")
+        self._flusher.daemon = True
+        self._flusher.start()
+
+    def save_job(self, record):
+        """Write a job record immediately (used on creation and status changes)."""
+        with self._pending:
+            self._pending_records.pop(record["id"], None)
+        with self._lock:
+            self._write_records([record])
+            self._conn.commit()
+
+    def mark_dirty(self, record):
+        """Schedule a job record to be written with the next batch."""
+        with self._pending:
+            self._pending_records[record["id"]] = record
+
+    def append_update(self, job_id, index, update):
+        """Buffer an update event for a batched write."""
+        with self._pending:
+            self._pending_updates.append((
+                job_id, index, update.get("time"), update.get("message"), update.get("stage")
+            ))
+            if len(self._pending_updates) >= self.batch_size:
+                self._pending.notify()
+
+    def flush(self):
+        """Write all buffered records and updates in a single transaction."""
+        # The batch is taken under the write lock, so a record saved meanwhile by
+        # save_job cannot be written before the older buffered snapshot of the job
+        with self._lock:
+            with self._pending:
+                updates, self._pending_updates = self._pending_updates, []
+                records, self._pending_records = list(self._pending_records.values()), {}
+            if not updates and not records:
+                return
+
+            try:
+                self._write_records(records)
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO job_updates (job_id, idx, time, message, stage) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    updates
+                )
+                self._conn.commit()
+            except Exception as e:
+                self._conn.rollback()
+                logger.error(f"Failed to flush job store: {str(e)}")
+
+    def load(self, job_id):
+        """Load a job record with its full update log, or None if unknown."""
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if not row:
+            return None
+
+        record = json.loads(row["data"])
+        record["updates"] = self.load_updates(job_id)
+        return record
+
+    def load_updates(self, job_id, since=0):
+        """Load the update log of a job starting at index ``since``."""
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT time, message, stage FROM job_updates "
+                "WHERE job_id = ? AND idx >= ? ORDER BY idx",
+                (job_id, since)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def page(self, statuses=None, limit=50, cursor=None):
+        """
+        List job summaries newest first, one page at a time
+
+        Args:
+            statuses (list, optional): Only return jobs with one of these statuses
+            limit (int, optional): Maximum number of summaries in the page
+            cursor (str, optional): Cursor returned with the previous page
+
+        Returns:
+            tuple: (list of summaries, cursor of the next page or None)
+        """
+        query = "SELECT id, created_at, COALESCE(summary, data) AS summary FROM jobs"
+        conditions = []
+        params = []
+        if statuses:
+            conditions.append(f"status IN ({', '.join('?' for _ in statuses)})")
+            params.extend(statuses)
+        if cursor:
+            created_at, job_id = decode_cursor(cursor)
+            conditions.append("(created_at < ? OR (created_at = ? AND id < ?))")
+            params.extend([created_at, created_at, job_id])
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY created_at DESC, id DESC LIMIT ?"
+        params.append(int(limit) + 1)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+        return [json.loads(row["summary"]) for row in rows], next_cursor
+
+    def count(self):
+        """Return the number of stored jobs."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def mark_interrupted(self, message="Job interrupted by server restart"):
+        """
+        Fail jobs left queued or running by a previous process
+
+        Returns:
+            list: Ids of the interrupted jobs
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM jobs WHERE status IN ('queued', 'running')"
+            ).fetchall()
+            interrupted = []
+            for row in rows:
+                record = json.loads(row["data"])
+                next_index = self._conn.execute(
+                    "SELECT COALESCE(MAX(idx) + 1, 0) FROM job_updates WHERE job_id = ?",
+                    (record["id"],)
+                ).fetchone()[0]
+                record["status"] = "failed"
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO job_updates (job_id, idx, time, message, stage) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (record["id"], next_index, datetime.now().isoformat(), message,
+                     record.get("current_stage"))
+                )
+                interrupted.append(record)
+            self._write_records(interrupted)
+            self._conn.commit()
+        return [record["id"] for record in interrupted]
+
+    def close(self):
+        """Flush pending writes and stop the background flusher."""
+        with self._pending:
+            self._closed = True
+            self._pending.notify()
+        self._flusher.join(timeout=5)
+        self.flush()
+
+    def _write_records(self, records):
+        # A snapshot older than the stored record (lower job version) is not written
+        now = time.time()
+        self._conn.executemany(
+            "INSERT INTO jobs (id, topic, status, created_at, updated_at, data, summary) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (id) DO UPDATE SET topic = excluded.topic, status = excluded.status, "
+            "created_at = excluded.created_at, updated_at = excluded.updated_at, "
+            "data = excluded.data, summary = excluded.summary "
+            "WHERE COALESCE(json_extract(excluded.data, '$.version'), 0) "
+            ">= COALESCE(json_extract(jobs.data, '$.version'), 0)",
+            [
+                (record["id"], record.get("topic"), record.get("status"),
+                 record.get("created_at") or now, now, json.dumps(record, default=str),
+                 json.dumps(summarize(record), default=str))
+                for record in records
+            ]
+        )
+
+    def _flush_loop(self):
+        while True:
+            with self._pending:
+                if not self._closed:
+                    self._pending.wait(self.flush_interval)
+                closed = self._closed
+            self.flush()
+            if closed:
+                return
+
+
+class JobRepository:
+    """In-memory view of the job store.
+
+    Queued and running jobs are always kept in memory. Finished jobs are kept
+    in an LRU hot set of bounded size and reloaded from the store when needed.
+    """
+
+    def __init__(self, store, job_factory, hot_size=None, listeners=None):
+        """
+        Initialize the repository
+
+        Args:
+            store (JobStore): Persistent job store
+            job_factory (callable): Builds a job object from a stored record
+            hot_size (int, optional): Number of finished jobs kept in memory
+            listeners (list, optional): Extra update listeners attached to every tracked job
+        """
+        self.store = store
+        self.job_factory = job_factory
+        self.hot_size = int(hot_size or os.environ.get('PODCAST_HOT_JOBS', 100))
+        self.listeners = listeners or []
+
+        self._lock = threading.RLock()
+        self._active = {}
+        self._hot = OrderedDict()
+        self._statuses = {}
+
+    def add(self, job):
+        """Register a new job and persist it."""
+        with self._lock:
+            self._track(job)
+        self.store.save_job(job.to_record())
+
+    def get(self, job_id):
+        """Return a job by id, loading it from the store if needed."""
+        with self._lock:
+            job = self._active.get(job_id)
+            if job:
+                return job
+            job = self._hot.get(job_id)
+            if job:
+                self._hot.move_to_end(job_id)
+                return job
+
+        record = self.store.load(job_id)
+        if not record:
+            return None
+
+        with self._lock:
+            # Another thread may have loaded it in the meantime
+            job = self._active.get(job_id) or self._hot.get(job_id)
+            if job:
+                return job
+            job = self.job_factory(record)
+            self._track(job)
+            return job
+
+    def page(self, statuses=None, limit=50, cursor=None):
+        """
+        List job summaries newest first. Jobs held in memory are summarized
+        from their live state, the others come straight from the store.
+
+        Returns:
+            tuple: (list of summaries, cursor of the next page or None)
+        """
+        summaries, next_cursor = self.store.page(statuses=statuses, limit=limit, cursor=cursor)
+        with self._lock:
+            for i, summary in enumerate(summaries):
+                job = self._active.get(summary["id"]) or self._hot.get(summary["id"])
+                if job:
+                    summaries[i] = summarize(job.to_record())
+        return summaries, next_cursor
+
+    def __contains__(self, job_id):
+        return self.get(job_id) is not None
+
+    def __len__(self):
+        return self.store.count()
+
+    def _track(self, job):
+        self._statuses[job.id] = job.status
+        for listener in [self._on_update] + self.listeners:
+            if listener not in job.listeners:
+                job.listeners.append(listener)
+
+        if job.status in FINISHED_STATUSES:
+            self._active.pop(job.id, None)
+            self._hot[job.id] = job
+            self._hot.move_to_end(job.id)
+            while len(self._hot) > self.hot_size:
+                evicted_id, _ = self._hot.popitem(last=False)
+                self._statuses.pop(evicted_id, None)
+        else:
+            self._hot.pop(job.id, None)
+            self._active[job.id] = job
+
+    def _on_update(self, job, index, update):
+        """Job listener: persist the update and follow status changes."""
+        self.store.append_update(job.id, index, update)
+
+        with self._lock:
+            status_changed = self._statuses.get(job.id) != job.status
+            if status_changed:
+                self._track(job)
+
+        if status_changed:
+            self.store.save_job(job.to_record())
+            if job.status in FINISHED_STATUSES:
+                self.store.flush()
+        else:
+            self.store.mark_dirty(job.to_record())
@@ -0,0 +1,143 @@
+"""
+Live streams of episodes while their audio is being synthesized.
+
+The voice stage publishes every synthesized segment to the job's
+LiveEpisode. Segments may finish out of order; they are released in script
+order as MP3 frames (tags and info frames stripped), so a listener can
+start playback after the first segment and the stream plays as one MP3.
+Listeners read the released frames from the start and then follow new ones
+until the episode is closed.
+"""
+import os
+import logging
+import threading
+
+from podcast.src.podcast.audio_assembly import IncompatibleAudioError, extract_frames
+
+logger = logging.getLogger(__name__)
+
+
+class LiveEpisode:
+    """MP3 frames of an episode released in script order as segments finish."""
+
+    def __init__(self, job_id, read_timeout=None):
+        """
+        Initialize the episode
+
+        Args:
+            job_id (str): Job producing the episode
+            read_timeout (float, optional): Seconds a listener waits for the next segment
+                before the stream is ended (PODCAST_LIVE_READ_TIMEOUT, default 300)
+        """
+        self.job_id = job_id
+        self.read_timeout = float(read_timeout or os.environ.get('PODCAST_LIVE_READ_TIMEOUT', 300))
+        self.chunks = []
+        self.header = None
+        self.closed = False
+        self._pending = {}
+        self._next = 0
+        self._cond = threading.Condition()
+
+    @property
+    def published(self):
+        """Number of segments released to listeners (skipped ones included)."""
+        with self._cond:
+            return self._next
+
+    def add(self, index, data):
+        """Publish the MP3 audio of segment ``index``, None when the segment failed."""
+        frames = None
+        if data is not None:
+            try:
+                frames, header, _ = extract_frames(data)
+            except IncompatibleAudioError as e:
+                logger.warning(f"Live episode {self.job_id}: segment {index} skipped: {str(e)}")
+            else:
+                if self.header is None:
+                    self.header = header
+                elif (header["version"], header["layer"], header["sample_rate"], header["channels"]) != (
+                        self.header["version"], self.header["layer"], self.header["sample_rate"],
+                        self.header["channels"]):
+                    # Players cannot switch encodings mid-stream
+                    logger.warning(f"Live episode {self.job_id}: segment {index} skipped, encoding differs")
+                    frames = None
+
+        with self._cond:
+            if self.closed or index < self._next:
+                return
+            self._pending[index] = frames
+            while self._next in self._pending:
+                chunk = self._pending.pop(self._next)
+                if chunk:
+                    self.chunks.append(chunk)
+                self._next += 1
+            self._cond.notify_all()
+
+    def close(self):
+        """End the stream, listeners stop after the frames released so far."""
+        with self._cond:
+            self.closed = True
+            self._pending.clear()
+            self._cond.notify_all()
+
+    def read(self):
+        """
+        Yield the released frames from the start, then follow new ones
+
+        Ends once the episode is closed, or when no segment was released for
+        read_timeout seconds.
+        """
+        position = 0
+        while True:
+            with self._cond:
+                if position >= len(self.chunks) and not self.closed:
+                    self._cond.wait_for(lambda: position < len(self.chunks) or self.closed, self.read_timeout)
+                chunks = self.chunks[position:]
+                done = self.closed or not chunks
+            for chunk in chunks:
+                yield chunk
+            position += len(chunks)
+            if done and position >= len(self.chunks):
+                return
+
+
+class LiveEpisodes:
+    """Live episodes of the jobs currently in their voice stage."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._episodes = {}
+
+    def open(self, job_id):
+        """Start the live episode of a job, replacing one left by an earlier run."""
+        episode = LiveEpisode(job_id)
+        with self._lock:
+            previous = self._episodes.get(job_id)
+            self._episodes[job_id] = episode
+        if previous is not None:
+            previous.close()
+        return episode
+
+    def get(self, job_id):
+        with self._lock:
+            return self._episodes.get(job_id)
+
+    def close(self, episode):
+        """Close a live episode; listeners already following it finish reading."""
+        episode.close()
+        with self._lock:
+            if self._episodes.get(episode.job_id) is episode:
+                del self._episodes[episode.job_id]
+
+
+_episodes = None
+_episodes_lock = threading.Lock()
+
+
+def get_live_episodes():
+    """Return the process-wide live episode registry."""
+    global _episodes
+    with _episodes_lock:
+        if _episodes is None:
+            _episodes = LiveEpisodes()
+        return _episodes
@@ -0,0 +1,227 @@
+"""
+Cache of the LLM calls made by the crew agents.
+
+The task descriptions of PodcastCrew are built deterministically from the
+topic and hosts, so running a topic again, or recovering a crashed job,
+sends Ollama the same prompts. With the cache enabled, responses are stored
+in SQLite keyed by (model, temperature, full prompt) and returned without
+calling the model again.
+
+Modes (LLM_CACHE_MODE):
+
+- ``off`` (default): every call goes to the model
+- ``readwrite``: responses are reused until LLM_CACHE_TTL expires
+- ``replay``: stored responses are reused whatever their age and a call that
+  was never recorded fails immediately instead of reaching the model, so
+  repeated test jobs run in seconds. Record them first in ``readwrite`` mode.
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+import functools
+
+from podcast.src.podcast.storage import connect, data_path
+
+logger = logging.getLogger(__name__)
+
+MODES = ("off", "readwrite", "replay")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache (last_used);
+"""
+
+
+class LLMCacheMiss(RuntimeError):
+    """A prompt without recorded response was sent in replay mode."""
+
+
+def prompt_key(model, temperature, messages, tools=None):
+    """Stable key of an LLM call."""
+    payload = json.dumps({
+        "model": model,
+        "temperature": temperature,
+        "messages": messages,
+        "tools": tools,
+    }, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """SQLite cache of LLM responses with TTL, size limit and replay mode."""
+
+    def __init__(self, path=None, mode=None, ttl=None, max_entries=None):
+        """
+        Open the cache
+
+        Args:
+            path (str, optional): Database file, defaults to llm_cache.db on the data volume
+            mode (str, optional): "off", "readwrite" or "replay" (LLM_CACHE_MODE, default "off")
+            ttl (float, optional): Seconds a response is reused in readwrite mode (LLM_CACHE_TTL, default 7 days)
+            max_entries (int, optional): Responses kept, least recently used are evicted first
+                (LLM_CACHE_MAX_ENTRIES, default 5000)
+        """
+        self.path = path or data_path('llm_cache.db', 'LLM_CACHE_DB_PATH')
+        mode = (mode or os.environ.get('LLM_CACHE_MODE', 'off')).lower()
+        if mode not in MODES:
+            logger.warning(f"Unknown LLM_CACHE_MODE '{mode}', LLM cache disabled")
+            mode = "off"
+        self.mode = mode
+        self.ttl = float(ttl if ttl is not None else os.environ.get('LLM_CACHE_TTL', 7 * 86400))
+        self.max_entries = int(max_entries or os.environ.get('LLM_CACHE_MAX_ENTRIES', 5000))
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        self._conn = None
+        if self.enabled:
+            try:
+                self._conn = connect(self.path)
+                self._conn.executescript(SCHEMA)
+                self._conn.commit()
+            except Exception as e:
+                logger.warning(f"LLM cache database unavailable, LLM cache disabled: {str(e)}")
+                self._conn = None
+                self.mode = "off"
+
+    @property
+    def enabled(self):
+        return self.mode != "off"
+
+    def get(self, key):
+        """Return the stored response for a key, or None."""
+        if self._conn is None:
+            return None
+        now = time.time()
+        with self._lock:
+            try:
+                if self.mode == "replay":
+                    row = self._conn.execute("SELECT response FROM llm_cache WHERE key = ?", (key,)).fetchone()
+                else:
+                    row = self._conn.execute(
+                        "SELECT response FROM llm_cache WHERE key = ? AND created_at >= ?", (key, now - self.ttl)
+                    ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                self._conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+                self.hits += 1
+                return row["response"]
+            except Exception as e:
+                logger.warning(f"Could not read LLM cache: {str(e)}")
+                return None
+
+    def put(self, key, model, response):
+        """Store a response, evicting the least recently used ones beyond the size limit."""
+        if self._conn is None:
+            return
+        now = time.time()
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, model, response, created_at, last_used) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, model, response, now, now)
+                )
+                count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+                if count > self.max_entries:
+                    self._conn.execute(
+                        "DELETE FROM llm_cache WHERE key IN "
+                        "(SELECT key FROM llm_cache ORDER BY last_used LIMIT ?)",
+                        (count - self.max_entries,)
+                    )
+                    self.evictions += count - self.max_entries
+                self._conn.commit()
+            except Exception as e:
+                logger.warning(f"Could not write LLM cache entry: {str(e)}")
+
+    def wrap(self, llm):
+        """
+        Route the calls of an LLM through the cache
+
+        The instance's ``call`` is replaced, so agents built once and reused
+        keep using the cache. Does nothing when the cache is off.
+
+        Args:
+            llm (LLM): CrewAI LLM instance
+
+        Returns:
+            LLM: The same instance
+        """
+        if not self.enabled or llm is None or getattr(llm, "_llm_cache", None) is self:
+            return llm
+        call = llm.call
+
+        @functools.wraps(call)
+        def cached_call(messages, tools=None, *args, **kwargs):
+            model = str(getattr(llm, "model", ""))
+            key = prompt_key(model, getattr(llm, "temperature", None), messages, tools)
+            response = self.get(key)
+            if response is not None:
+                return response
+            if self.mode == "replay":
+                raise LLMCacheMiss(f"No recorded response for this {model} prompt (LLM_CACHE_MODE=replay)")
+            response = call(messages, tools, *args, **kwargs)
+            # Only text answers are stored, native tool calls must really run
+            if isinstance(response, str) and response:
+                self.put(key, model, response)
+            return response
+
+        # Instance attributes shadow the class method without touching other LLMs
+        object.__setattr__(llm, "call", cached_call)
+        object.__setattr__(llm, "_llm_cache", self)
+        return llm
+
+    def clear(self):
+        """Delete every stored response."""
+        if self._conn is None:
+            return
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def stats(self):
+        """Return hit/miss counters."""
+        with self._lock:
+            entries = 0
+            if self._conn is not None:
+                try:
+                    entries = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+                except Exception:
+                    pass
+            lookups = self.hits + self.misses
+            return {
+                "mode": self.mode,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "entries": entries,
+                "evictions": self.evictions,
+                "ttl": self.ttl,
+                "max_entries": self.max_entries,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """Return the process-wide LLM cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache()
+        return _cache
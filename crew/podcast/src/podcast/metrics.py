@@ -0,0 +1,260 @@
+"""
+In-process metrics in the Prometheus text format.
+
+Counters and histograms are aggregated in memory: recording a value is a
+dict lookup and a few additions under a per-metric lock, so instruments can
+sit on hot paths (every HTTP request, LLM call or streamed chunk). Values
+that other components already track (cache counters, worker usage) are read
+by collectors when /metrics is scraped instead of being duplicated.
+"""
+import time
+import logging
+import threading
+import functools
+from bisect import bisect_left
+
+from podcast.src.podcast.tracing import span
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    type = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for key, value in values.items():
+            yield self.name, _format_labels(self.labelnames, key), value
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    type = "gauge"
+
+    def set(self, value, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets."""
+
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # Per label values: [count per bucket (last is +Inf), sum]
+        self._values = {}
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def time(self, **labels):
+        """Context manager observing the duration of its block."""
+        return _Timer(self, labels)
+
+    def samples(self):
+        with self._lock:
+            values = {key: (list(counts), total) for key, (counts, total) in self._values.items()}
+        bounds = self.buckets + (float("inf"),)
+        for key, (counts, total) in values.items():
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                yield f"{self.name}_bucket", _format_labels(self.labelnames, key, ("le", _format_value(float(bound)))), cumulative
+            yield f"{self.name}_sum", _format_labels(self.labelnames, key), total
+            yield f"{self.name}_count", _format_labels(self.labelnames, key), cumulative
+
+
+class _Timer:
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+
+
+class MetricsRegistry:
+    """Metrics and scrape-time collectors rendered together."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = []
+        self._collectors = []
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def collector(self, collect):
+        """
+        Register a function called on every scrape
+
+        ``collect`` returns an iterable of (name, type, help, samples) where
+        samples is a list of (labels dict, value).
+        """
+        with self._lock:
+            self._collectors.append(collect)
+        return collect
+
+    def render(self):
+        """Return every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics)
+            collectors = list(self._collectors)
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {_format_value(value)}")
+
+        for collect in collectors:
+            try:
+                families = list(collect())
+            except Exception as e:
+                logger.error(f"Metrics collector failed: {str(e)}")
+                continue
+            for name, metric_type, documentation, samples in families:
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for labels, value in samples:
+                    label_names = tuple(labels)
+                    label_text = _format_labels(label_names, tuple(labels[key] for key in label_names))
+                    lines.append(f"{name}{label_text} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+
+REGISTRY = MetricsRegistry()
+
+# Pipeline
+QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    "podcast_queue_wait_seconds", "Time jobs waited in the queue for a worker")
+STAGE_WAIT_SECONDS = REGISTRY.histogram(
+    "podcast_stage_wait_seconds", "Time jobs waited for a slot of a concurrency-limited stage", ["stage"])
+STAGE_SECONDS = REGISTRY.histogram(
+    "podcast_stage_seconds", "Duration of the scheduler stages (research, script, voice)", ["stage"])
+CREW_TASK_SECONDS = REGISTRY.histogram(
+    "podcast_crew_task_seconds", "Duration of each crew task and the job stage it belongs to", ["task", "stage"])
+JOB_SECONDS = REGISTRY.histogram(
+    "podcast_job_seconds", "Duration of finished jobs", ["status"])
+JOBS_TOTAL = REGISTRY.counter(
+    "podcast_jobs_total", "Finished jobs", ["status"])
+
+# LLM
+LLM_CALL_SECONDS = REGISTRY.histogram(
+    "podcast_llm_call_seconds", "Latency of agent LLM calls that reached the model", ["model"])
+LLM_CALLS_TOTAL = REGISTRY.counter(
+    "podcast_llm_calls_total", "Agent LLM calls that reached the model", ["model", "outcome"])
+LLM_OUTPUT_CHARACTERS = REGISTRY.counter(
+    "podcast_llm_output_characters_total", "Characters generated by the model", ["model"])
+LLM_STREAM_CHUNKS = REGISTRY.counter(
+    "podcast_llm_stream_chunks_total", "Chunk events received from streaming LLM calls")
+
+# External services (Serper, ElevenLabs, Ollama API)
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "podcast_http_request_seconds", "Latency of outgoing HTTP requests", ["host"])
+HTTP_REQUESTS_TOTAL = REGISTRY.counter(
+    "podcast_http_requests_total", "Outgoing HTTP requests", ["host", "outcome"])
+TTS_CHARACTERS = REGISTRY.counter(
+    "podcast_tts_characters_total", "Characters synthesized by ElevenLabs (TTS cache misses)")
+
+
+def instrument_llm(llm):
+    """
+    Record the latency and output of the calls of a CrewAI LLM, with a trace span per call
+
+    Wraps the instance's ``call`` once; placed inside the LLM cache so only
+    calls that reach the model are measured.
+    """
+    if llm is None or getattr(llm, "_metrics_instrumented", False):
+        return llm
+    call = llm.call
+
+    @functools.wraps(call)
+    def instrumented_call(*args, **kwargs):
+        model = str(getattr(llm, "model", ""))
+        start = time.perf_counter()
+        try:
+            with span("llm call", "llm", model=model):
+                response = call(*args, **kwargs)
+        except Exception:
+            LLM_CALLS_TOTAL.inc(model=model, outcome="error")
+            raise
+        finally:
+            LLM_CALL_SECONDS.observe(time.perf_counter() - start, model=model)
+        LLM_CALLS_TOTAL.inc(model=model, outcome="ok")
+        if isinstance(response, str):
+            LLM_OUTPUT_CHARACTERS.inc(len(response), model=model)
+        return response
+
+    object.__setattr__(llm, "call", instrumented_call)
+    object.__setattr__(llm, "_metrics_instrumented", True)
+    return llm
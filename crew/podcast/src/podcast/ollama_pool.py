@@ -0,0 +1,222 @@
+"""
+Load balancing of agent LLM calls across several Ollama endpoints.
+
+OLLAMA_BASE_URLS lists the Ollama nodes (OLLAMA_BASE_URL alone is a pool of
+one). Every LLM call of an agent is sent to the healthy endpoint with the
+fewest requests in flight, so concurrent jobs spread across nodes instead of
+queuing on one. Each endpoint is probed in the background by an
+OllamaProber, as the health check does, and an endpoint is also ejected for
+a while after consecutive failed calls.
+"""
+import os
+import time
+import logging
+import threading
+import functools
+
+from podcast.src.podcast.health import OllamaProber
+
+logger = logging.getLogger(__name__)
+
+# Weight of the latest call in the moving average latency
+LATENCY_ALPHA = 0.2
+
+
+def ollama_urls():
+    """Ollama endpoints from OLLAMA_BASE_URLS (comma separated), or OLLAMA_BASE_URL."""
+    urls = [url.strip().rstrip("/") for url in os.environ.get('OLLAMA_BASE_URLS', '').split(",") if url.strip()]
+    return urls or [os.environ.get('OLLAMA_BASE_URL', 'http://localhost:11434').rstrip("/")]
+
+
+class Endpoint:
+    """An Ollama node with its probe, load and latency counters."""
+
+    def __init__(self, url, prober=None):
+        self.url = url
+        self.prober = prober
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.latency_ms = None
+        self.total_latency_ms = 0.0
+        self.max_latency_ms = 0.0
+
+    def probe_ok(self):
+        if self.prober is None:
+            return True
+        return self.prober.snapshot()["ollama_connection"] in ("ok", "unknown")
+
+    def stats(self, now):
+        completed = self.requests - self.outstanding
+        return {
+            "url": self.url,
+            "healthy": self.probe_ok() and now >= self.ejected_until,
+            "ejected_for": round(max(0.0, self.ejected_until - now), 1),
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "failures": self.failures,
+            "latency_ms": round(self.latency_ms, 1) if self.latency_ms is not None else None,
+            "avg_latency_ms": round(self.total_latency_ms / completed, 1) if completed > 0 else None,
+            "max_latency_ms": round(self.max_latency_ms, 1),
+        }
+
+
+class OllamaPool:
+    """Least-outstanding-requests balancer with health-based ejection."""
+
+    def __init__(self, urls=None, probe=True, eject_after=None, eject_seconds=None):
+        """
+        Initialize the pool
+
+        Args:
+            urls (list, optional): Endpoint URLs, defaults to ollama_urls()
+            probe (bool, optional): Probe every endpoint in the background
+            eject_after (int, optional): Consecutive failed calls that eject an endpoint (OLLAMA_EJECT_AFTER, default 3)
+            eject_seconds (float, optional): How long an endpoint stays ejected (OLLAMA_EJECT_SECONDS, default 30)
+        """
+        self.urls = list(urls or ollama_urls())
+        self.eject_after = int(eject_after or os.environ.get('OLLAMA_EJECT_AFTER', 3))
+        self.eject_seconds = float(eject_seconds or os.environ.get('OLLAMA_EJECT_SECONDS', 30))
+        self.endpoints = [Endpoint(url, OllamaProber(base_url=url) if probe else None) for url in self.urls]
+        self._lock = threading.Lock()
+        self._next = 0
+
+    def start(self):
+        """Start the background probes."""
+        for endpoint in self.endpoints:
+            if endpoint.prober is not None:
+                endpoint.prober.start()
+
+    def acquire(self, exclude=()):
+        """
+        Pick the endpoint for a call and count it as outstanding
+
+        Healthy endpoints with the fewest calls in flight are preferred, ties go
+        to the lowest latency and then round robin. When no endpoint is healthy
+        the least loaded one is used anyway.
+        """
+        now = time.time()
+        with self._lock:
+            candidates = [endpoint for endpoint in self.endpoints if endpoint not in exclude] or self.endpoints
+            healthy = [endpoint for endpoint in candidates if now >= endpoint.ejected_until and endpoint.probe_ok()]
+            candidates = healthy or candidates
+            # Rotate the starting point so equal endpoints take turns
+            self._next = (self._next + 1) % len(self.endpoints)
+            order = {id(endpoint): (i - self._next) % len(self.endpoints) for i, endpoint in enumerate(self.endpoints)}
+            endpoint = min(candidates, key=lambda e: (
+                e.outstanding,
+                e.latency_ms if e.latency_ms is not None else 0.0,
+                order[id(e)],
+            ))
+            endpoint.outstanding += 1
+            endpoint.requests += 1
+            return endpoint
+
+    def release(self, endpoint, elapsed_ms, ok=True):
+        """Record the end of a call on an endpoint."""
+        with self._lock:
+            endpoint.outstanding -= 1
+            endpoint.total_latency_ms += elapsed_ms
+            endpoint.max_latency_ms = max(endpoint.max_latency_ms, elapsed_ms)
+            if endpoint.latency_ms is None:
+                endpoint.latency_ms = elapsed_ms
+            else:
+                endpoint.latency_ms += LATENCY_ALPHA * (elapsed_ms - endpoint.latency_ms)
+            if ok:
+                endpoint.consecutive_failures = 0
+                return
+            endpoint.failures += 1
+            endpoint.consecutive_failures += 1
+            if endpoint.consecutive_failures >= self.eject_after and len(self.endpoints) > 1:
+                endpoint.ejected_until = time.time() + self.eject_seconds
+                endpoint.consecutive_failures = 0
+                logger.warning(f"Ollama endpoint {endpoint.url} ejected for {self.eject_seconds:.0f}s "
+                               f"after {self.eject_after} failed calls")
+
+    def wrap(self, llm):
+        """
+        Send the calls of an Ollama LLM to the pool's endpoints
+
+        Only needed with several endpoints; a failed call is retried once on
+        another endpoint. Agents are used by one crew at a time, so the
+        endpoint can be set on the LLM for the duration of each call.
+
+        Args:
+            llm (LLM): CrewAI LLM instance
+
+        Returns:
+            LLM: The same instance
+        """
+        if (len(self.endpoints) < 2 or llm is None or getattr(llm, "_ollama_pool", None) is self
+                or not str(getattr(llm, "model", "")).startswith("ollama")):
+            return llm
+        call = llm.call
+
+        @functools.wraps(call)
+        def balanced_call(*args, **kwargs):
+            tried = []
+            while True:
+                endpoint = self.acquire(exclude=tried)
+                tried.append(endpoint)
+                llm.base_url = llm.api_base = endpoint.url
+                start = time.perf_counter()
+                try:
+                    response = call(*args, **kwargs)
+                except Exception as e:
+                    self.release(endpoint, (time.perf_counter() - start) * 1000, ok=False)
+                    if len(tried) >= min(2, len(self.endpoints)):
+                        raise
+                    logger.warning(f"LLM call on {endpoint.url} failed, retrying on another endpoint: {str(e)}")
+                    continue
+                self.release(endpoint, (time.perf_counter() - start) * 1000)
+                return response
+
+        object.__setattr__(llm, "call", balanced_call)
+        object.__setattr__(llm, "_ollama_pool", self)
+        return llm
+
+    def healthy_urls(self):
+        """URLs of the endpoints currently accepting calls."""
+        now = time.time()
+        with self._lock:
+            return [endpoint.url for endpoint in self.endpoints
+                    if now >= endpoint.ejected_until and endpoint.probe_ok()]
+
+    def snapshot(self):
+        """
+        Combined probe result of the endpoints, shaped like OllamaProber.snapshot()
+
+        The pool is "ok" when any endpoint is, and the model counts as available
+        when any reachable endpoint has it.
+        """
+        probes = [endpoint.prober.snapshot() for endpoint in self.endpoints if endpoint.prober is not None]
+        if not probes:
+            return {"ollama_connection": "unknown", "available_models": [], "model_available": False,
+                    "checked_at": None, "endpoints": []}
+        ok = [probe for probe in probes if probe["ollama_connection"] == "ok"]
+        state = dict(ok[0] if ok else probes[0])
+        state["available_models"] = sorted({model for probe in ok for model in probe["available_models"]})
+        state["model_available"] = any(probe["model_available"] for probe in ok)
+        state["endpoints"] = [dict(probe, url=endpoint.url) for endpoint, probe in zip(self.endpoints, probes)]
+        return state
+
+    def stats(self):
+        """Return load and latency per endpoint."""
+        now = time.time()
+        with self._lock:
+            return {"endpoints": [endpoint.stats(now) for endpoint in self.endpoints]}
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_ollama_pool():
+    """Return the process-wide Ollama endpoint pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = OllamaPool()
+        return _pool
@@ -0,0 +1,191 @@
+"""
+Pipelined script-to-audio production.
+
+While the script writer is still generating, every host segment closed in
+the streamed script is synthesized right away and appended, in script order,
+to the episode file. When the final script is known the remaining segments
+are synthesized, so the voice stage only waits for the tail of the script
+instead of starting from scratch.
+"""
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from podcast.src.podcast.audio_assembly import IncompatibleAudioError, Mp3FrameWriter
+from podcast.src.podcast.script_parser import ScriptParser
+from podcast.src.podcast.synthesis import call_with_retries
+from podcast.src.podcast.tracing import span, traced
+
+logger = logging.getLogger(__name__)
+
+
+def pipelining_enabled():
+    return os.environ.get('PODCAST_PIPELINE_TTS', 'true').lower() == 'true'
+
+
+class VoicePipeline:
+    """Synthesizes and assembles host segments as the script streams in."""
+
+    def __init__(self, tool, hosts, output_path, progress_callback=None, max_in_flight=None, live=None):
+        """
+        Initialize the pipeline
+
+        Args:
+            tool (ElevenLabsTool): Tool used for synthesis and metadata
+            hosts (list): Podcast hosts
+            output_path (str): Episode MP3 file
+            progress_callback (callable, optional): Called with (message, stage) as segments finish
+            max_in_flight (int, optional): Concurrent TTS requests, defaults to ELEVENLABS_MAX_IN_FLIGHT (4)
+            live (LiveEpisode, optional): Live stream the segments are published to as they finish
+        """
+        if max_in_flight is None:
+            max_in_flight = int(os.environ.get('ELEVENLABS_MAX_IN_FLIGHT', 4))
+        self.tool = tool
+        self.hosts = list(hosts)
+        self.output_path = output_path
+        self.progress_callback = progress_callback
+        self.live = live
+        self.host_voices = tool.assign_host_voices(hosts)
+        self.retries = int(os.environ.get('ELEVENLABS_MAX_RETRIES', 3))
+        self.backoff = float(os.environ.get('ELEVENLABS_RETRY_BACKOFF', 1.0))
+
+        self.parser = ScriptParser(self.hosts)
+        self.segments = []
+        self.failed_segments = []
+        self._futures = []
+        self._next = 0
+        self._lock = threading.Lock()
+        self._writer = None
+        self._incompatible = False
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_in_flight), thread_name_prefix="tts-pipeline")
+
+    @property
+    def active(self):
+        """True while streamed segments can still be synthesized (an API key is configured)."""
+        return bool(self.tool.api_key) and not self._closed
+
+    def feed(self, text):
+        """Consume a chunk of the streamed script."""
+        if not self.active:
+            return
+        for segment in self.parser.feed(text):
+            self._submit(segment)
+
+    def finish(self, script):
+        """
+        Produce the episode for the final script
+
+        Segments synthesized while streaming are kept when they match the start
+        of the final script; otherwise the script is processed from scratch (the
+        already synthesized segments are then TTS cache hits).
+
+        Returns:
+            dict: Result of the audio processing, as ElevenLabsTool.process_podcast_script
+        """
+        final = self._host_segments(self.tool.parse_podcast_script(script, self.hosts))
+        streamed = list(self.segments)
+
+        if not self.active or self._incompatible or final[:len(streamed)] != streamed:
+            if streamed:
+                logger.info("Streamed script differs from the final script, synthesizing it again")
+            return self._fallback(script)
+
+        for segment in final[len(streamed):]:
+            self._submit(segment)
+        wait(self._futures)
+        self._drain()
+        self._shutdown()
+
+        if self._incompatible or self._writer is None:
+            self._abort()
+            return self._fallback(script)
+
+        writer, self._writer = self._writer, None
+        with span("write episode", "io"):
+            writer.close()
+        assembly = {"method": "frames", "segments": len(final), "duration_ms": writer.duration_ms()}
+        return self.tool.save_podcast_metadata(script, self.hosts, self.host_voices, len(final),
+                                               self.failed_segments, assembly, self.output_path)
+
+    def cancel(self):
+        """Stop synthesizing and discard the partial episode."""
+        self._shutdown()
+        self._abort()
+
+    def _host_segments(self, segments):
+        # Narration (titles, stage directions) is not voiced by the pipeline
+        return [segment for segment in segments if segment["host"] in self.host_voices]
+
+    def _submit(self, segment):
+        if segment["host"] not in self.host_voices:
+            return
+        with self._lock:
+            index = len(self.segments)
+            self.segments.append(segment)
+            future = self._executor.submit(traced(self._synthesize), index, segment)
+            self._futures.append(future)
+        future.add_done_callback(traced(lambda _: self._drain()))
+
+    def _synthesize(self, index, segment):
+        voice_id = self.tool._resolve_voice_id(self.host_voices[segment["host"]])
+        with span("synthesize segment", "tts", index=index):
+            return call_with_retries(lambda: self.tool._request_audio(segment["text"], voice_id),
+                                     self.retries, self.backoff)
+
+    def _drain(self):
+        """Append finished segments to the episode in script order."""
+        with self._lock:
+            start = self._next
+            while self._next < len(self._futures) and self._futures[self._next].done():
+                index = self._next
+                self._next += 1
+                future = self._futures[index]
+                if future.cancelled():
+                    self.failed_segments.append(index)
+                    continue
+                if future.exception() is not None:
+                    self.failed_segments.append(index)
+                    logger.warning(f"Failed to generate audio for segment {index}: {str(future.exception())}")
+                    if self.live:
+                        self.live.add(index, None)
+                    continue
+                if self.live:
+                    self.live.add(index, future.result())
+                if self._incompatible or self._closed:
+                    continue
+                try:
+                    if self._writer is None:
+                        os.makedirs(os.path.dirname(self.output_path) or ".", exist_ok=True)
+                        self._writer = Mp3FrameWriter(self.output_path)
+                    with span("append segment", "io", index=index):
+                        self._writer.append(future.result())
+                except IncompatibleAudioError as e:
+                    # The final pass re-encodes from the TTS cache instead
+                    logger.info(f"Streamed assembly stopped: {str(e)}")
+                    self._incompatible = True
+            done = self._next
+            total = len(self.segments)
+        if self.progress_callback and done > start:
+            self.progress_callback(f"Synthesized {done}/{total} audio segments", None)
+
+    def _fallback(self, script):
+        self.cancel()
+        live = self.live
+        if live and live.published:
+            # Listeners already heard the streamed segments, which the final script does not continue
+            live.close()
+            live = None
+        return self.tool.process_podcast_script(script, self.hosts, self.output_path,
+                                                progress_callback=self.progress_callback, live=live)
+
+    def _shutdown(self):
+        self._closed = True
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _abort(self):
+        with self._lock:
+            if self._writer is not None:
+                self._writer.abort()
+                self._writer = None
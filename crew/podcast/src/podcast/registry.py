@@ -0,0 +1,122 @@
+"""
+Process-wide registry of crew agents and tools.
+
+Agents are expensive to build (LLM client, executor, tool wiring) and the
+same four agents are needed by every job. The pool keeps built agents keyed
+by their name and LLM configuration and hands each one to a single crew at a
+time, so agents are reused across tasks and jobs without being shared by two
+jobs running concurrently. Stateless tools are plain process-wide singletons.
+"""
+import os
+import json
+import logging
+import threading
+from collections import defaultdict
+
+logger = logging.getLogger(__name__)
+
+
+def llm_config(temperature=0.7):
+    """LLM configuration of the crew agents, read from the environment."""
+    return {
+        "provider": "ollama",
+        "config": {
+            "model": os.environ.get('MODEL', 'deepseek-coder:7b'),
+            "temperature": temperature,
+            "base_url": os.environ.get('OLLAMA_BASE_URL', 'http://localhost:11434'),
+        }
+    }
+
+
+def config_key(config):
+    """Stable key of an LLM configuration."""
+    return json.dumps(config, sort_keys=True)
+
+
+class AgentPool:
+    """Idle agents per (name, LLM config), checked out by one crew at a time."""
+
+    def __init__(self, max_idle=None):
+        """
+        Initialize the pool
+
+        Args:
+            max_idle (int, optional): Idle agents kept per name and config
+                (PODCAST_AGENT_POOL_SIZE, default 4); 0 disables reuse
+        """
+        if max_idle is None:
+            max_idle = int(os.environ.get('PODCAST_AGENT_POOL_SIZE', 4))
+        self.max_idle = max_idle
+        self.built = 0
+        self.reused = 0
+        self._lock = threading.Lock()
+        self._idle = defaultdict(list)
+        self._in_use = 0
+
+    def acquire(self, name, config, build):
+        """
+        Check out an agent, building it if none is idle
+
+        Args:
+            name (str): Agent name, e.g. "researcher"
+            config (dict): LLM configuration the agent is built with
+            build (callable): Called with ``config`` to build a new agent
+
+        Returns:
+            Agent: An agent used by no other crew until it is released
+        """
+        key = (name, config_key(config))
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                self.reused += 1
+                self._in_use += 1
+                return idle.pop()
+
+        agent = build(config)
+        with self._lock:
+            self.built += 1
+            self._in_use += 1
+        return agent
+
+    def release(self, name, config, agent):
+        """Return an agent to the pool once its crew has finished."""
+        key = (name, config_key(config))
+        with self._lock:
+            self._in_use -= 1
+            idle = self._idle[key]
+            if len(idle) < self.max_idle:
+                idle.append(agent)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "built": self.built,
+                "reused": self.reused,
+                "in_use": self._in_use,
+                "idle": sum(len(idle) for idle in self._idle.values()),
+                "max_idle": self.max_idle,
+            }
+
+
+_pool = None
+_tools = {}
+_lock = threading.Lock()
+
+
+def get_agent_pool():
+    """Return the process-wide agent pool."""
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = AgentPool()
+        return _pool
+
+
+def shared_tool(name, build):
+    """Return the process-wide instance of a stateless tool, building it on first use."""
+    with _lock:
+        tool = _tools.get(name)
+        if tool is None:
+            tool = _tools[name] = build()
+        return tool
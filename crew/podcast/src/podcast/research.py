@@ -0,0 +1,162 @@
+"""
+Parallel research for the research stage.
+
+A topic is expanded into one search query per angle (config/research.yaml),
+the queries run concurrently with a concurrency cap, and the results are
+merged into the {"sources", "topics"} structure stored in job results, with
+duplicate URLs collapsed.
+"""
+import os
+import json
+import logging
+import threading
+from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from concurrent.futures import ThreadPoolExecutor
+
+import yaml
+
+from podcast.src.podcast.tracing import span, traced
+
+logger = logging.getLogger(__name__)
+
+RESEARCH_CONFIG = os.path.join(os.path.dirname(__file__), "config", "research.yaml")
+
+# Query parameters that only track the visitor
+TRACKING_PREFIXES = ("utm_",)
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "ref_src"}
+
+
+def normalize_url(url):
+    """Canonical form of a URL used to detect duplicate results."""
+    parts = urlsplit((url or "").strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PREFIXES) and key.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower() or "https", host, path, urlencode(query), ""))
+
+
+def load_angles(path=None):
+    """
+    Load the research angles
+
+    Returns:
+        tuple: (list of {"name", "query"} angles, results per query)
+    """
+    with open(path or RESEARCH_CONFIG, encoding="utf-8") as f:
+        config = yaml.safe_load(f) or {}
+    return config.get("angles") or [{"name": "Vue d'ensemble", "query": "{topic}"}], \
+        int(config.get("results_per_query", 5))
+
+
+class ResearchEngine:
+    """Runs the search queries of a topic concurrently and merges their results."""
+
+    def __init__(self, search, max_concurrency=None, angles=None, results_per_query=None):
+        """
+        Initialize the engine
+
+        Args:
+            search (callable): Called with (query, num_results), returns the JSON string of WebSearchTool
+            max_concurrency (int, optional): Queries in flight at once (RESEARCH_MAX_CONCURRENCY, default 6)
+            angles (list, optional): {"name", "query"} angles, defaults to config/research.yaml
+            results_per_query (int, optional): Results requested per query
+        """
+        config_angles, config_results = load_angles() if angles is None else (angles, 5)
+        self.search = search
+        self.angles = config_angles
+        self.results_per_query = results_per_query or config_results
+        self.max_concurrency = int(max_concurrency or os.environ.get('RESEARCH_MAX_CONCURRENCY', 6))
+
+    def queries(self, topic, current_year=None):
+        """Expand a topic into (angle name, query) pairs, dropping duplicate queries."""
+        current_year = current_year or os.environ.get('CURRENT_YEAR', str(datetime.now().year))
+        seen = set()
+        queries = []
+        for angle in self.angles:
+            query = angle["query"].format(topic=topic, current_year=current_year).strip()
+            key = " ".join(query.lower().split())
+            if key and key not in seen:
+                seen.add(key)
+                queries.append((angle.get("name") or query, query))
+        return queries
+
+    def run(self, topic, progress=None, current_year=None):
+        """
+        Research a topic
+
+        Args:
+            topic (str): Podcast topic
+            progress (callable, optional): Called with a message as queries complete, one call at a time
+            current_year (str, optional): Year used in the queries
+
+        Returns:
+            dict: "sources" (unique results, most relevant first), "topics" (angles that
+            returned results) and "queries"
+        """
+        queries = self.queries(topic, current_year)
+        completed = 0
+        lock = threading.Lock()
+
+        def run_query(query):
+            nonlocal completed
+            try:
+                with span("search angle", "research", query=query):
+                    results = json.loads(self.search(query, self.results_per_query)).get("results", [])
+            except Exception as e:
+                logger.warning(f"Research query '{query}' failed: {str(e)}")
+                results = []
+            # Reported under the lock, so job updates arrive one at a time and in count order
+            with lock:
+                completed += 1
+                if progress:
+                    progress(f"Searched {completed}/{len(queries)} angles: {query}")
+            return results
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_concurrency, len(queries))),
+                                thread_name_prefix="research") as executor:
+            # map keeps query order, so merging is deterministic
+            all_results = list(executor.map(traced(run_query), [query for _, query in queries]))
+
+        return self.merge(queries, all_results)
+
+    def merge(self, queries, all_results):
+        """Deduplicate results by URL, ranking sources found by several queries first."""
+        sources = {}
+        topics = []
+        for (name, query), results in zip(queries, all_results):
+            if results:
+                topics.append(name)
+            for rank, result in enumerate(results):
+                url = result.get("url") or result.get("link")
+                if not url:
+                    continue
+                key = normalize_url(url)
+                source = sources.get(key)
+                if source is None:
+                    sources[key] = source = {
+                        "title": result.get("title", ""),
+                        "url": url,
+                        "snippet": result.get("snippet", ""),
+                        "date": result.get("date"),
+                        "queries": [],
+                        "_best_rank": rank,
+                    }
+                source["queries"].append(query)
+                source["_best_rank"] = min(source["_best_rank"], rank)
+                if len(result.get("snippet", "")) > len(source["snippet"]):
+                    source["snippet"] = result["snippet"]
+
+        ranked = sorted(sources.values(), key=lambda source: (-len(source["queries"]), source["_best_rank"]))
+        for source in ranked:
+            del source["_best_rank"]
+        return {
+            "sources": ranked,
+            "topics": topics,
+            "queries": [query for _, query in queries],
+        }
@@ -0,0 +1,297 @@
+"""
+Local index of past research.
+
+Every search result fetched by WebSearchTool is stored once, deduplicated by
+normalized URL and by a hash of its content (the same article syndicated
+under several URLs), and indexed for ranked full-text lookup by topic. Past
+research can then be reused in milliseconds instead of searching again.
+
+The index uses SQLite FTS5 with BM25 ranking. When the SQLite build has no
+FTS5, an in-process inverted index over the same table is used instead.
+"""
+import os
+import math
+import time
+import hashlib
+import logging
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+
+from podcast.src.podcast.research import normalize_url
+from podcast.src.podcast.search_cache import normalize_query
+from podcast.src.podcast.storage import connect, data_path
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    url_key TEXT NOT NULL UNIQUE,
+    content_hash TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    snippet TEXT NOT NULL,
+    date TEXT,
+    query TEXT,
+    hits INTEGER NOT NULL DEFAULT 1,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_documents_last_seen ON documents (last_seen);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    title, snippet, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+# Title matches weigh more than snippet matches
+TITLE_WEIGHT = 2.0
+
+# Words too common to say anything about a topic
+STOPWORDS = {
+    "a", "au", "aux", "avec", "ce", "ces", "dans", "de", "des", "du", "en", "et", "la", "le", "les",
+    "leur", "l", "d", "ou", "par", "pour", "sur", "un", "une", "qu", "que", "qui",
+    "an", "and", "for", "in", "is", "of", "on", "or", "the", "to", "with",
+}
+
+
+def tokenize(text):
+    """Case-folded words of a text without diacritics or stopwords."""
+    text = unicodedata.normalize("NFKD", normalize_query(text))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return [token for token in text.replace("_", " ").split() if token not in STOPWORDS]
+
+
+def content_hash(title, snippet):
+    return hashlib.sha256(f"{' '.join(tokenize(title))}\n{' '.join(tokenize(snippet))}".encode("utf-8")).hexdigest()
+
+
+class InvertedIndex:
+    """BM25 over title and snippet tokens, used when SQLite has no FTS5 and to rank shared batch research."""
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self.postings = defaultdict(dict)
+        self.lengths = {}
+
+    def add(self, doc_id, title, snippet):
+        counts = Counter(tokenize(snippet))
+        for token in tokenize(title):
+            counts[token] += TITLE_WEIGHT
+        for token, count in counts.items():
+            self.postings[token][doc_id] = count
+        self.lengths[doc_id] = sum(counts.values())
+
+    def search(self, tokens):
+        """Return {doc_id: score} for documents matching any token."""
+        if not self.lengths:
+            return {}
+        total = len(self.lengths)
+        average = sum(self.lengths.values()) / total
+        scores = defaultdict(float)
+        for token in set(tokens):
+            postings = self.postings.get(token)
+            if not postings:
+                continue
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, count in postings.items():
+                norm = self.K1 * (1 - self.B + self.B * self.lengths[doc_id] / average)
+                scores[doc_id] += idf * count * (self.K1 + 1) / (count + norm)
+        return scores
+
+
+class ResearchIndex:
+    """Deduplicated store of search results with ranked lookup by topic."""
+
+    def __init__(self, path=None, max_age=None):
+        """
+        Open the index
+
+        Args:
+            path (str, optional): Database file, defaults to research_index.db on the data volume
+            max_age (float, optional): Days after which a result is no longer returned by lookups
+                (RESEARCH_INDEX_MAX_AGE_DAYS, default 30); 0 keeps results forever
+        """
+        self.path = path or data_path('research_index.db', 'RESEARCH_INDEX_DB_PATH')
+        if max_age is None:
+            max_age = float(os.environ.get('RESEARCH_INDEX_MAX_AGE_DAYS', 30))
+        self.max_age = max_age * 86400
+
+        self.added = 0
+        self.duplicates = 0
+        self.lookups = 0
+        self._lock = threading.Lock()
+        self._fallback = None
+
+        self._conn = None
+        try:
+            self._conn = connect(self.path)
+            self._conn.executescript(SCHEMA)
+            try:
+                self._conn.executescript(FTS_SCHEMA)
+            except Exception as e:
+                logger.warning(f"SQLite FTS5 unavailable, using an in-memory index: {str(e)}")
+                self._load_fallback()
+            self._conn.commit()
+        except Exception as e:
+            logger.warning(f"Research index database unavailable, past research will not be reused: {str(e)}")
+            self._conn = None
+
+    @property
+    def available(self):
+        return self._conn is not None
+
+    @property
+    def backend(self):
+        if self._conn is None:
+            return "disabled"
+        return "memory" if self._fallback is not None else "fts5"
+
+    def add(self, results, query=None):
+        """
+        Store search results, skipping URLs and contents already indexed
+
+        Args:
+            results (list): {"title", "url", "snippet", "date"} results
+            query (str, optional): Query the results were found with
+
+        Returns:
+            int: Number of new documents
+        """
+        if self._conn is None:
+            return 0
+        added = 0
+        now = time.time()
+        with self._lock:
+            try:
+                for result in results:
+                    url = result.get("url") or result.get("link")
+                    title = result.get("title") or ""
+                    snippet = result.get("snippet") or ""
+                    if not url or not (title or snippet):
+                        continue
+                    url_key = normalize_url(url)
+                    digest = content_hash(title, snippet)
+
+                    existing = self._conn.execute(
+                        "SELECT id FROM documents WHERE url_key = ? OR content_hash = ?", (url_key, digest)
+                    ).fetchone()
+                    if existing is not None:
+                        self._conn.execute("UPDATE documents SET hits = hits + 1, last_seen = ? WHERE id = ?",
+                                           (now, existing["id"]))
+                        self.duplicates += 1
+                        continue
+
+                    doc_id = self._conn.execute(
+                        "INSERT INTO documents (url_key, content_hash, url, title, snippet, date, query, "
+                        "first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (url_key, digest, url, title, snippet, result.get("date"), query, now, now)
+                    ).lastrowid
+                    if self._fallback is None:
+                        self._conn.execute("INSERT INTO documents_fts (rowid, title, snippet) VALUES (?, ?, ?)",
+                                           (doc_id, title, snippet))
+                    else:
+                        self._fallback.add(doc_id, title, snippet)
+                    added += 1
+                self._conn.commit()
+            except Exception as e:
+                self._conn.rollback()
+                logger.warning(f"Could not index research results: {str(e)}")
+                return 0
+            self.added += added
+        return added
+
+    def search(self, topic, limit=10):
+        """
+        Find past results about a topic, most relevant first
+
+        Args:
+            topic (str): Topic or query
+            limit (int, optional): Maximum number of results
+
+        Returns:
+            list: {"title", "url", "snippet", "date", "score"} results
+        """
+        tokens = list(dict.fromkeys(tokenize(topic)))
+        if self._conn is None or not tokens:
+            return []
+        since = time.time() - self.max_age if self.max_age > 0 else 0
+        with self._lock:
+            self.lookups += 1
+            try:
+                if self._fallback is None:
+                    match = " OR ".join(f'"{token}"' for token in tokens)
+                    rows = self._conn.execute(
+                        "SELECT d.title, d.url, d.snippet, d.date, "
+                        f"-bm25(documents_fts, {TITLE_WEIGHT}, 1.0) AS score "
+                        "FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid "
+                        "WHERE documents_fts MATCH ? AND d.last_seen >= ? "
+                        "ORDER BY score DESC LIMIT ?",
+                        (match, since, int(limit))
+                    ).fetchall()
+                    return [dict(row) for row in rows]
+
+                scores = self._fallback.search(tokens)
+                if not scores:
+                    return []
+                ids = sorted(scores, key=scores.get, reverse=True)
+                results = []
+                # Candidates are read best first, in batches, until enough recent ones are found
+                for start in range(0, len(ids), 200):
+                    batch = ids[start:start + 200]
+                    rows = self._conn.execute(
+                        f"SELECT id, title, url, snippet, date FROM documents "
+                        f"WHERE id IN ({','.join('?' * len(batch))}) AND last_seen >= ?",
+                        (*batch, since)
+                    ).fetchall()
+                    rows = sorted(rows, key=lambda row: scores[row["id"]], reverse=True)
+                    for row in rows:
+                        result = {key: row[key] for key in ("title", "url", "snippet", "date")}
+                        result["score"] = scores[row["id"]]
+                        results.append(result)
+                    if len(results) >= limit:
+                        break
+                return results[:limit]
+            except Exception as e:
+                logger.warning(f"Research index lookup failed: {str(e)}")
+                return []
+
+    def stats(self):
+        """Return index counters."""
+        with self._lock:
+            documents = 0
+            if self._conn is not None:
+                try:
+                    documents = self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+                except Exception:
+                    pass
+            return {
+                "backend": self.backend,
+                "documents": documents,
+                "added": self.added,
+                "duplicates": self.duplicates,
+                "lookups": self.lookups,
+            }
+
+    def _load_fallback(self):
+        self._fallback = InvertedIndex()
+        for row in self._conn.execute("SELECT id, title, snippet FROM documents"):
+            self._fallback.add(row["id"], row["title"], row["snippet"])
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_research_index():
+    """Return the process-wide research index."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = ResearchIndex()
+        return _index
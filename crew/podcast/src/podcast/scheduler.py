@@ -0,0 +1,259 @@
+"""
+Job scheduler for running several podcast jobs concurrently.
+
+Jobs are dispatched to a bounded pool of worker threads from a thread-safe
+priority queue. Jobs submitted as a group (a batch of episodes) take turns
+with the other groups and standalone jobs of their priority. Individual
+pipeline stages can be capped separately so that, for example, many research
+stages run at once while only a couple of jobs synthesize audio at the same
+time.
+"""
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+from podcast.src.podcast.metrics import QUEUE_WAIT_SECONDS, STAGE_SECONDS, STAGE_WAIT_SECONDS
+from podcast.src.podcast.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Priority levels, lowest value is served first
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+PRIORITIES = (PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW)
+
+
+def parse_stage_limits(value):
+    """
+    Parse a stage limit specification such as "research=8,script=2,voice=1".
+
+    Args:
+        value (str): Comma separated list of stage=limit pairs
+
+    Returns:
+        dict: Mapping of stage name to its concurrency limit
+    """
+    limits = {}
+    if not value:
+        return limits
+
+    for item in value.split(','):
+        if '=' not in item:
+            continue
+        stage, limit = item.split('=', 1)
+        try:
+            limits[stage.strip()] = max(1, int(limit))
+        except ValueError:
+            logger.warning(f"Ignoring invalid stage limit: {item}")
+    return limits
+
+
+class JobQueue:
+    """Thread-safe queue with a fixed number of priority levels.
+
+    Each priority level holds a FIFO deque per group. Groups are served round
+    robin: after a job is taken, its group moves to the back of the level, so
+    a large batch does not hold back the jobs queued after it. A job without
+    group is a group of its own. Enqueue and dequeue are O(1).
+    """
+
+    def __init__(self):
+        self._levels = {priority: OrderedDict() for priority in PRIORITIES}
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._closed = False
+
+    def put(self, job, priority=PRIORITY_NORMAL, group=None):
+        """Add a job and return its 1-based position in the queue."""
+        if priority not in self._levels:
+            priority = PRIORITY_NORMAL
+        with self._not_empty:
+            level = self._levels[priority]
+            key = group or job.id
+            if key not in level:
+                level[key] = deque()
+            level[key].append(job)
+            self._not_empty.notify()
+            return self._position_locked(job.id)
+
+    def get(self):
+        """Block until a job is available. Returns None once the queue is closed."""
+        with self._not_empty:
+            while True:
+                for priority in PRIORITIES:
+                    level = self._levels[priority]
+                    if level:
+                        key, jobs = next(iter(level.items()))
+                        job = jobs.popleft()
+                        if jobs:
+                            level.move_to_end(key)
+                        else:
+                            del level[key]
+                        return job
+                if self._closed:
+                    return None
+                self._not_empty.wait()
+
+    def position(self, job_id):
+        """Return the 1-based position of a queued job, or None if not queued."""
+        with self._lock:
+            return self._position_locked(job_id)
+
+    def _position_locked(self, job_id):
+        position = 0
+        for priority in PRIORITIES:
+            # Replay the round robin over the groups of the level
+            groups = list(self._levels[priority].values())
+            for turn in range(max((len(jobs) for jobs in groups), default=0)):
+                for jobs in groups:
+                    if turn < len(jobs):
+                        position += 1
+                        if jobs[turn].id == job_id:
+                            return position
+        return None
+
+    def close(self):
+        """Wake up all waiting workers and stop handing out jobs."""
+        with self._not_empty:
+            self._closed = True
+            self._not_empty.notify_all()
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(jobs) for level in self._levels.values() for jobs in level.values())
+
+
+class JobScheduler:
+    """Bounded worker pool that runs podcast jobs from a priority queue."""
+
+    def __init__(self, runner, max_workers=None, stage_limits=None):
+        """
+        Initialize the scheduler
+
+        Args:
+            runner (callable): Function called with the job to process it
+            max_workers (int, optional): Number of jobs processed concurrently
+            stage_limits (dict, optional): Concurrency limit per pipeline stage
+        """
+        self.runner = runner
+        self.max_workers = max(1, int(max_workers or os.environ.get('PODCAST_MAX_WORKERS', 2)))
+        if stage_limits is None:
+            stage_limits = parse_stage_limits(os.environ.get('PODCAST_STAGE_LIMITS', 'voice=1'))
+        self.stage_limits = stage_limits
+        self.queue = JobQueue()
+
+        self._stage_semaphores = {
+            stage: threading.BoundedSemaphore(limit) for stage, limit in stage_limits.items()
+        }
+        self._lock = threading.Lock()
+        self._running = {}
+        self._stage_counts = {}
+        self._workers = []
+        # Submission time of queued jobs, for the queue wait metric
+        self._enqueued = {}
+
+    def start(self):
+        """Start the worker threads"""
+        with self._lock:
+            if self._workers:
+                return
+            for i in range(self.max_workers):
+                worker = threading.Thread(target=self._worker_loop, name=f"podcast-worker-{i}")
+                worker.daemon = True
+                worker.start()
+                self._workers.append(worker)
+        logger.info(f"Job scheduler started with {self.max_workers} workers, stage limits: {self.stage_limits}")
+
+    def shutdown(self):
+        """Stop handing out jobs. Running jobs finish on their own."""
+        self.queue.close()
+
+    def submit(self, job, priority=PRIORITY_NORMAL, group=None):
+        """
+        Queue a job for processing
+
+        Args:
+            job: Job object with an ``id`` attribute
+            priority (int, optional): One of the PRIORITY_* levels
+            group (str, optional): Group taking turns with the others, such as a batch id
+
+        Returns:
+            int: Number of queued jobs ahead of this one that must start first,
+            0 when a worker is free to pick it up right away
+        """
+        with self._lock:
+            idle_workers = self.max_workers - len(self._running)
+            self._enqueued[job.id] = time.perf_counter()
+        position = self.queue.put(job, priority, group)
+        return max(0, position - idle_workers)
+
+    def position(self, job_id):
+        """Return the 1-based queue position of a job, or None if it is not waiting."""
+        return self.queue.position(job_id)
+
+    def running_ids(self):
+        """Return the ids of the jobs currently being processed."""
+        with self._lock:
+            return list(self._running)
+
+    def queue_length(self):
+        """Return the number of jobs waiting for a worker."""
+        return len(self.queue)
+
+    def stats(self):
+        """Return a snapshot of worker and stage utilization."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "busy_workers": len(self._running),
+                "queue_length": len(self.queue),
+                "stage_limits": dict(self.stage_limits),
+                "stage_active": dict(self._stage_counts),
+            }
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Hold a slot for a pipeline stage while the block runs.
+
+        Stages without a configured limit run without waiting.
+        """
+        semaphore = self._stage_semaphores.get(name)
+        if semaphore:
+            with STAGE_WAIT_SECONDS.time(stage=name), span(f"wait for {name} slot", "wait"):
+                semaphore.acquire()
+        with self._lock:
+            self._stage_counts[name] = self._stage_counts.get(name, 0) + 1
+        start = time.perf_counter()
+        try:
+            with span(name, "stage"):
+                yield
+        finally:
+            STAGE_SECONDS.observe(time.perf_counter() - start, stage=name)
+            with self._lock:
+                self._stage_counts[name] -= 1
+            if semaphore:
+                semaphore.release()
+
+    def _worker_loop(self):
+        while True:
+            job = self.queue.get()
+            if job is None:
+                return
+
+            with self._lock:
+                self._running[job.id] = job
+                enqueued = self._enqueued.pop(job.id, None)
+            if enqueued is not None:
+                QUEUE_WAIT_SECONDS.observe(time.perf_counter() - enqueued)
+            try:
+                self.runner(job)
+            except Exception as e:
+                logger.error(f"Unhandled error running job {job.id}: {str(e)}")
+            finally:
+                with self._lock:
+                    self._running.pop(job.id, None)
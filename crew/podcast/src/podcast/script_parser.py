@@ -0,0 +1,115 @@
+"""
+Incremental parsing of podcast scripts into host segments.
+
+"Host:" starts a segment that runs until the next host marker or markdown
+heading, and text outside any host segment belongs to the narrator. Headings
+such as "## Introduction" are section markers: they close the current
+segment and are recorded in ``sections`` instead of being read aloud.
+
+The script is consumed in chunks and every segment is returned as soon as it
+is closed, so segments can be handed to speech synthesis while the script is
+still being written.
+"""
+import re
+from functools import lru_cache
+
+# Headings are matched with their leading newline rather than "^", every alternative
+# then starts with a literal character and the regex engine can skip ahead quickly
+HEADING = r"\n[ \t]{0,3}#{1,6}[ \t]+(?P<heading>[^\n]*?)[ \t#]*(?=\n|\Z)"
+
+
+@lru_cache(maxsize=32)
+def _compile(hosts):
+    """One pattern matching headings and host markers, compiled once per host list."""
+    markers = "|".join(re.escape(host) for host in sorted(hosts, key=len, reverse=True))
+    return re.compile(f"{HEADING}|(?P<host>{markers}):[ \t]*")
+
+
+class ScriptParser:
+    """Splits a streamed script into {"host", "text"} segments."""
+
+    def __init__(self, hosts):
+        self.hosts = tuple(hosts)
+        self.sections = []
+        self._pattern = _compile(self.hosts)
+        # Text after the last newline, a host marker or heading may still be incomplete
+        self._pending = []
+        self._host = None
+        self._text = []
+
+    def feed(self, chunk):
+        """
+        Add a chunk of the script
+
+        Returns:
+            list: Segments closed by this chunk
+        """
+        cut = chunk.rfind("\n")
+        if cut < 0:
+            self._pending.append(chunk)
+            return []
+
+        self._pending.append(chunk[:cut + 1])
+        block = "".join(self._pending)
+        self._pending = [chunk[cut + 1:]] if cut + 1 < len(chunk) else []
+        return self._consume(block)
+
+    def close(self):
+        """Finish the script and return the remaining segments."""
+        segments = self._consume("".join(self._pending))
+        self._pending = []
+        segment = self._take(None)
+        if segment:
+            segments.append(segment)
+        return segments
+
+    def _consume(self, block):
+        # Blocks always start at the beginning of a line: the newline the heading
+        # pattern expects is only added for matching, text starts after it
+        block = "\n" + block
+        segments = []
+        append = segments.append
+        pieces = self._text
+        host = self._host
+        position = 1
+        for match in self._pattern.finditer(block):
+            start = match.start()
+            if start > position:
+                pieces.append(block[position:start])
+            if pieces:
+                text = "".join(pieces).strip()
+                if text:
+                    append({"host": host or "narrator", "text": text})
+                pieces = []
+            host = match.group("host")
+            if host is None:
+                self.sections.append(match.group("heading"))
+            position = match.end()
+        if position < len(block):
+            pieces.append(block[position:])
+        self._text = pieces
+        self._host = host
+        return segments
+
+    def _take(self, next_host):
+        """Close the current segment, the next one belongs to ``next_host``."""
+        text = "".join(self._text).strip() if self._text else ""
+        host = self._host or "narrator"
+        self._text = []
+        self._host = next_host
+        if text:
+            return {"host": host, "text": text}
+        return None
+
+
+def iter_segments(chunks, hosts):
+    """Yield the segments of a script given as an iterable of chunks."""
+    parser = ScriptParser(hosts)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+def parse_script(script, hosts):
+    """Parse a complete script."""
+    return list(iter_segments([script], hosts))
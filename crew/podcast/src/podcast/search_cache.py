@@ -0,0 +1,237 @@
+"""
+TTL cache for web search results.
+
+Results are keyed on the normalized query and the number of results, kept in
+an in-memory LRU backed by SQLite so they survive restarts and are shared by
+every job. Concurrent identical queries are collapsed into a single request.
+"""
+import os
+import re
+import time
+import hashlib
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+
+from podcast.src.podcast.storage import connect, data_path
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_cache (
+    key TEXT PRIMARY KEY,
+    query TEXT NOT NULL,
+    num_results INTEGER NOT NULL,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_search_cache_created_at ON search_cache (created_at);
+"""
+
+_PUNCTUATION = re.compile(r"[^\w\s]+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query):
+    """Case-fold a query and drop punctuation and repeated whitespace."""
+    query = unicodedata.normalize("NFKC", query or "").casefold()
+    query = _PUNCTUATION.sub(" ", query)
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+def search_key(query, num_results):
+    return hashlib.sha256(f"{normalize_query(query)}\n{int(num_results)}".encode("utf-8")).hexdigest()
+
+
+class _Flight:
+    """A search in progress that identical queries wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SearchCache:
+    """Memory + SQLite TTL cache with single-flight request coalescing."""
+
+    def __init__(self, path=None, ttl=None, memory_entries=None):
+        """
+        Open the cache
+
+        Args:
+            path (str, optional): Database file, defaults to search_cache.db on the data volume
+            ttl (float, optional): Seconds a result stays valid (SEARCH_CACHE_TTL, default 6 hours);
+                0 disables caching but keeps request coalescing
+            memory_entries (int, optional): Results kept in memory (SEARCH_CACHE_MEMORY_ENTRIES, default 512)
+        """
+        self.path = path or data_path('search_cache.db', 'SEARCH_CACHE_DB_PATH')
+        if ttl is None:
+            ttl = float(os.environ.get('SEARCH_CACHE_TTL', 6 * 3600))
+        self.ttl = ttl
+        if memory_entries is None:
+            memory_entries = int(os.environ.get('SEARCH_CACHE_MEMORY_ENTRIES', 512))
+        self.memory_entries = memory_entries
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._flights = {}
+
+        self._conn = None
+        if self.enabled:
+            try:
+                self._conn = connect(self.path)
+                self._conn.executescript(SCHEMA)
+                self._conn.execute("DELETE FROM search_cache WHERE created_at < ?", (time.time() - self.ttl,))
+                self._conn.commit()
+            except Exception as e:
+                logger.warning(f"Search cache database unavailable, using memory only: {str(e)}")
+                self._conn = None
+
+    @property
+    def enabled(self):
+        return self.ttl > 0
+
+    def get(self, query, num_results):
+        """Return the cached result for a query, or None."""
+        key = search_key(query, num_results)
+        with self._lock:
+            value = self._lookup_locked(key)
+            if value is None:
+                self.misses += 1
+            return value
+
+    def put(self, query, num_results, value):
+        """Store a result in memory and on disk."""
+        if not self.enabled:
+            return
+        key = search_key(query, num_results)
+        now = time.time()
+        with self._lock:
+            self._remember_locked(key, value, now)
+            if self._conn is not None:
+                try:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO search_cache (key, query, num_results, value, created_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (key, normalize_query(query), int(num_results), value, now)
+                    )
+                    self._conn.commit()
+                except Exception as e:
+                    logger.warning(f"Could not write search cache entry: {str(e)}")
+
+    def get_or_fetch(self, query, num_results, fetch):
+        """
+        Return a cached result or fetch it, sharing one fetch between identical queries
+
+        Args:
+            query (str): Search query
+            num_results (int): Number of results requested
+            fetch (callable): Performs the search and returns the result string;
+                exceptions are not cached and are raised to every waiting caller
+
+        Returns:
+            str: The search result
+        """
+        key = search_key(query, num_results)
+        with self._lock:
+            value = self._lookup_locked(key)
+            if value is not None:
+                return value
+
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = fetch()
+            self.put(query, num_results, flight.value)
+            return flight.value
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def stats(self):
+        """Return hit/miss counters."""
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses + self.coalesced
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_ratio": round((hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "in_flight": len(self._flights),
+                "ttl": self.ttl,
+            }
+
+    def _lookup_locked(self, key):
+        if not self.enabled:
+            return None
+        now = time.time()
+
+        entry = self._memory.get(key)
+        if entry is not None:
+            value, created_at = entry
+            if now - created_at < self.ttl:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return value
+            del self._memory[key]
+
+        if self._conn is None:
+            return None
+        try:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM search_cache WHERE key = ? AND created_at >= ?",
+                (key, now - self.ttl)
+            ).fetchone()
+        except Exception as e:
+            logger.warning(f"Could not read search cache: {str(e)}")
+            return None
+        if row is None:
+            return None
+
+        self._remember_locked(key, row["value"], row["created_at"])
+        self.disk_hits += 1
+        return row["value"]
+
+    def _remember_locked(self, key, value, created_at):
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_search_cache():
+    """Return the process-wide search cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SearchCache()
+        return _cache
@@ -0,0 +1,42 @@
+"""
+Helpers for files and SQLite databases kept on the data volume.
+"""
+import os
+import sqlite3
+
+
+def data_path(filename, env_var=None):
+    """
+    Resolve the path of a data file.
+
+    Files live next to the CrewAI memory DB (the mounted data volume) unless
+    ``env_var`` is set in the environment.
+
+    Args:
+        filename (str): File name inside the data directory
+        env_var (str, optional): Environment variable overriding the full path
+
+    Returns:
+        str: Path of the file
+    """
+    if env_var and os.environ.get(env_var):
+        return os.environ[env_var]
+    memory_db_path = os.environ.get('CREWAI_MEMORY_DB_PATH', '/app/data/memory.db')
+    return os.path.join(os.path.dirname(memory_db_path), filename)
+
+
+def connect(path):
+    """
+    Open a SQLite database in WAL mode, shareable between threads.
+
+    Callers are responsible for serializing access with their own lock.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
@@ -0,0 +1,134 @@
+"""
+Streaming of LLM tokens into job progress.
+
+CrewAI emits an LLMStreamChunkEvent on its event bus for every token of a
+streaming LLM call. The StreamRouter forwards those chunks to the coalescer
+registered for the LLM that produced them, and each TokenCoalescer batches
+tokens so consumers see a few chunks per second instead of one per token.
+"""
+import os
+import time
+import logging
+import threading
+
+from podcast.src.podcast.metrics import LLM_STREAM_CHUNKS
+
+logger = logging.getLogger(__name__)
+
+
+def streaming_enabled():
+    return os.environ.get('PODCAST_STREAM_TOKENS', 'true').lower() == 'true'
+
+
+class TokenCoalescer:
+    """Buffers tokens and emits them as chunks at a limited rate."""
+
+    def __init__(self, emit, min_interval=None, max_chars=None):
+        """
+        Initialize the coalescer
+
+        Args:
+            emit (callable): Called with (text, offset), offset being the number of characters emitted before
+            min_interval (float, optional): Minimum seconds between chunks (PODCAST_STREAM_INTERVAL, default 0.25)
+            max_chars (int, optional): Buffered characters that force a chunk early (PODCAST_STREAM_MAX_CHARS, default 400)
+        """
+        self.emit = emit
+        self.min_interval = float(min_interval if min_interval is not None
+                                  else os.environ.get('PODCAST_STREAM_INTERVAL', 0.25))
+        self.max_chars = int(max_chars or os.environ.get('PODCAST_STREAM_MAX_CHARS', 400))
+        self.offset = 0
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._buffered = 0
+        self._last_emit = 0.0
+
+    def feed(self, text):
+        """Add tokens, emitting a chunk if the interval has passed or the buffer is full."""
+        if not text:
+            return
+        with self._lock:
+            self._buffer.append(text)
+            self._buffered += len(text)
+            now = time.monotonic()
+            if now - self._last_emit < self.min_interval and self._buffered < self.max_chars:
+                return
+            chunk = self._take_locked(now)
+        self._emit(*chunk)
+
+    def flush(self):
+        """Emit whatever is still buffered."""
+        with self._lock:
+            if not self._buffer:
+                return
+            chunk = self._take_locked(time.monotonic())
+        self._emit(*chunk)
+
+    def _take_locked(self, now):
+        text = "".join(self._buffer)
+        offset = self.offset
+        self._buffer = []
+        self._buffered = 0
+        self.offset += len(text)
+        self._last_emit = now
+        return text, offset
+
+    def _emit(self, text, offset):
+        try:
+            self.emit(text, offset)
+        except Exception as e:
+            logger.error(f"Stream consumer failed: {str(e)}")
+
+
+class StreamRouter:
+    """Routes CrewAI stream chunk events to the coalescer of the emitting LLM."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def register(self, llm, coalescer):
+        with self._lock:
+            self._routes[id(llm)] = coalescer
+
+    def unregister(self, llm):
+        with self._lock:
+            return self._routes.pop(id(llm), None)
+
+    def on_chunk(self, source, event):
+        LLM_STREAM_CHUNKS.inc()
+        with self._lock:
+            coalescer = self._routes.get(id(source))
+        if coalescer is not None:
+            coalescer.feed(getattr(event, "chunk", "") or "")
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_stream_router():
+    """
+    Return the process-wide router, subscribing it to the CrewAI event bus on first use
+
+    Returns:
+        StreamRouter: The router, or None if this CrewAI version has no stream events
+    """
+    global _router
+    with _router_lock:
+        if _router is not None:
+            return _router or None
+
+        try:
+            from crewai.utilities.events import LLMStreamChunkEvent, crewai_event_bus
+        except ImportError:
+            try:
+                from crewai.events import LLMStreamChunkEvent, crewai_event_bus
+            except ImportError:
+                logger.warning("CrewAI has no LLM stream events, token streaming disabled")
+                _router = False
+                return None
+
+        router = StreamRouter()
+        crewai_event_bus.on(LLMStreamChunkEvent)(router.on_chunk)
+        _router = router
+        return router
@@ -0,0 +1,131 @@
+"""
+Bounded-concurrency synthesis of podcast segments.
+
+Segments are fanned out to a thread pool with a limited number of requests
+in flight. Rate limited (429) and server side (5xx) failures are retried with
+exponential backoff, and results are returned in script order.
+
+API requests of every job, from the voice stage or from a pipeline
+synthesizing the script as it streams, also share one process-wide limit
+(ELEVENLABS_MAX_IN_FLIGHT, see get_tts_slots), so concurrent jobs do not
+multiply the load on the TTS API. The limit is taken by the request itself,
+so segments served from the TTS cache never wait for it.
+"""
+import os
+import time
+import random
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from podcast.src.podcast.tracing import span, traced
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+def is_retryable(error):
+    """Return True for rate limits, server errors and connection problems."""
+    response = getattr(error, "response", None)
+    if response is not None:
+        return response.status_code in RETRYABLE_STATUS_CODES
+    return type(error).__name__ in ("ConnectionError", "Timeout", "ConnectTimeout", "ReadTimeout")
+
+
+def retry_delay(error, attempt, backoff):
+    """Delay before the next attempt, honoring a Retry-After header when present."""
+    response = getattr(error, "response", None)
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return min(float(retry_after), 60.0)
+            except ValueError:
+                pass
+    return min(backoff * (2 ** attempt) + random.uniform(0, backoff), 30.0)
+
+
+_slots = None
+_slots_lock = threading.Lock()
+
+
+def get_tts_slots():
+    """Return the process-wide semaphore bounding TTS requests in flight (ELEVENLABS_MAX_IN_FLIGHT)."""
+    global _slots
+    with _slots_lock:
+        if _slots is None:
+            _slots = threading.BoundedSemaphore(max(1, int(os.environ.get('ELEVENLABS_MAX_IN_FLIGHT', 4))))
+        return _slots
+
+
+def call_with_retries(func, retries, backoff):
+    """Call ``func`` and retry it on retryable errors."""
+    attempt = 0
+    while True:
+        try:
+            return func()
+        except Exception as e:
+            if attempt >= retries or not is_retryable(e):
+                raise
+            delay = retry_delay(e, attempt, backoff)
+            logger.warning(f"Retryable TTS error ({str(e)}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+            attempt += 1
+
+
+def synthesize_segments(segments, synthesize, max_in_flight=None, retries=None, backoff=None, progress=None):
+    """
+    Synthesize segments concurrently
+
+    Args:
+        segments (list): Segments to synthesize
+        synthesize (callable): Called with (index, segment), returns the segment result
+        max_in_flight (int, optional): Maximum number of concurrent requests of this call
+        retries (int, optional): Retries per segment on retryable errors
+        backoff (float, optional): Base delay in seconds of the exponential backoff
+        progress (callable, optional): Called with (completed, total, result) as segments finish
+
+    Returns:
+        list: One dict per segment in script order, with "index", "success",
+        "result" and "error" keys
+    """
+    if max_in_flight is None:
+        max_in_flight = int(os.environ.get('ELEVENLABS_MAX_IN_FLIGHT', 4))
+    if retries is None:
+        retries = int(os.environ.get('ELEVENLABS_MAX_RETRIES', 3))
+    if backoff is None:
+        backoff = float(os.environ.get('ELEVENLABS_RETRY_BACKOFF', 1.0))
+
+    total = len(segments)
+    results = [None] * total
+    completed = 0
+    lock = threading.Lock()
+
+    @traced
+    def work(index, segment):
+        nonlocal completed
+        try:
+            with span("synthesize segment", "tts", index=index):
+                value = call_with_retries(lambda: synthesize(index, segment), retries, backoff)
+            result = {"index": index, "success": True, "result": value, "error": None}
+        except Exception as e:
+            result = {"index": index, "success": False, "result": None, "error": str(e)}
+
+        results[index] = result
+        with lock:
+            completed += 1
+            done = completed
+        if progress:
+            try:
+                progress(done, total, result)
+            except Exception as e:
+                logger.error(f"Synthesis progress callback failed: {str(e)}")
+
+    if total:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_in_flight, total)),
+                                thread_name_prefix="tts") as executor:
+            for index, segment in enumerate(segments):
+                executor.submit(work, index, segment)
+
+    return results
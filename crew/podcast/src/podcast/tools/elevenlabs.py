@@ -5,10 +5,15 @@ import os
 import json
 import random
 import time
-import requests
-import re
 from datetime import datetime
-from pydub import AudioSegment
+
+from podcast.src.podcast.audio_assembly import AudioAssembler
+from podcast.src.podcast.http_client import get_http_client
+from podcast.src.podcast.metrics import TTS_CHARACTERS
+from podcast.src.podcast.script_parser import parse_script
+from podcast.src.podcast.synthesis import get_tts_slots, synthesize_segments
+from podcast.src.podcast.tracing import span
+from podcast.src.podcast.tts_cache import cache_key, get_tts_cache
 
 class ElevenLabsInput(BaseModel):
     """Input schema for ElevenLabsTool."""
@@ -26,7 +31,8 @@ class ElevenLabsTool(BaseTool):
     description: str = "Convert text to realistic speech using ElevenLabs voices"
     args_schema: Type[BaseModel] = ElevenLabsInput
     api_key: str = None
-    base_url: str = "https://api.elevenlabs.io/v1"
+    base_url: str = os.environ.get("ELEVENLABS_BASE_URL", "https://api.elevenlabs.io/v1")
+    model_id: str = "eleven_multilingual_v2"  # Use multilingual model for French
     voices: dict = None
     voice_genders: dict = None
     
@@ -96,59 +102,25 @@ class ElevenLabsTool(BaseTool):
         return json.loads(result)
     
     def parse_podcast_script(self, script, hosts):
-        """Parse podcast script into segments by host."""
-        segments = []
-        current_text = ""
-        current_host = None
-        
-        # Create a regex pattern to match any host
-        hosts_pattern = '|'.join([re.escape(host) for host in hosts])
-        pattern = f"({hosts_pattern}):\\s*"
-        
-        # Split the script by host indicators
-        parts = re.split(f"({pattern})", script)
-        
-        # Process the split parts
-        i = 0
-        while i < len(parts):
-            if i + 1 < len(parts) and parts[i+1].strip().endswith(':'):
-                # Found a host indicator
-                if current_host and current_text.strip():
-                    segments.append({"host": current_host, "text": current_text.strip()})
-                
-                # Extract the host name without the colon
-                current_host = parts[i+1].strip()[:-1]
-                current_text = parts[i+2] if i+2 < len(parts) else ""
-                i += 3
-            else:
-                # Continuation of text or unattributed text
-                if not current_host:
-                    # Handle text before any host is specified (e.g., intro)
-                    current_host = "narrator"
-                current_text += parts[i]
-                i += 1
-        
-        # Add the last segment if there is one
-        if current_host and current_text.strip():
-            segments.append({"host": current_host, "text": current_text.strip()})
-            
-        return segments
-        
-    def process_podcast_script(self, script, hosts, output_path="data/podcasts/podcast.mp3"):
+        """Parse podcast script into segments by host (headings are section markers, not narration)."""
+        return parse_script(script, hosts)
+    
+    def process_podcast_script(self, script, hosts, output_path="data/podcasts/podcast.mp3",
+                               progress_callback=None, max_in_flight=None, live=None):
         """
         Process a full podcast script and generate audio with Alex and Simon voices.
         Script will be in French with a Quebec touch.
+        
+        Segments are synthesized concurrently (at most ``max_in_flight`` requests,
+        ELEVENLABS_MAX_IN_FLIGHT by default) and assembled in script order.
+        ``progress_callback`` is called with (message, stage) as segments finish,
+        and each segment is published to the ``live`` episode stream if given.
         """
         # Ensure output directory exists
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
         # Assign voices to hosts - only Alex and Simon
-        host_voices = {}
-        for i, host in enumerate(hosts):
-            if i == 0 or host.lower() == "alex":
-                host_voices[host] = "alex"
-            else:
-                host_voices[host] = "simon"
+        host_voices = self.assign_host_voices(hosts)
         
         # Parse the script to separate by speaker
         segments = self.parse_podcast_script(script, hosts)
@@ -157,44 +129,38 @@ class ElevenLabsTool(BaseTool):
         if not self.api_key:
             return self._simulate_podcast_processing(segments, host_voices, output_path)
             
-        try:
-            # Generate audio for each segment with the appropriate voice
-            temp_audio_files = []
-            combined_audio = None
+        def synthesize(i, segment):
+            # Get voice for this host (default to first available if not found)
+            voice = host_voices.get(segment["host"], list(self.voices.keys())[0])
             
-            for i, segment in enumerate(segments):
-                host = segment["host"]
-                text = segment["text"]
-                
-                # Get voice for this host (default to first available if not found)
-                voice = host_voices.get(host, list(self.voices.keys())[0])
-                
-                # Generate temp file path
-                temp_file = f"{output_path.replace('.mp3', '')}_segment_{i}.mp3"
-                
-                # Generate audio for this segment (in French)
-                result = json.loads(self._run(
-                    text=text,
-                    voice_id=voice,
-                    output_path=temp_file,
-                    language="fr"  # Force French language
-                ))
-                
-                if result["success"]:
-                    temp_audio_files.append(temp_file)
-                    
-                    # Add to combined audio
-                    segment_audio = AudioSegment.from_mp3(temp_file)
-                    if combined_audio is None:
-                        combined_audio = segment_audio
-                    else:
-                        combined_audio += segment_audio
-                else:
-                    print(f"Failed to generate audio for segment {i}: {result.get('message')}")
+            # Generate audio for this segment into a temp file (in French)
+            temp_file = f"{output_path.replace('.mp3', '')}_segment_{i}.mp3"
+            audio = self._request_audio(segment["text"], self._resolve_voice_id(voice))
+            with span("write segment", "io", bytes=len(audio)), open(temp_file, "wb") as f:
+                f.write(audio)
+            if live:
+                live.add(i, audio)
+            return temp_file
+        
+        def report_progress(completed, total, result):
+            if not result["success"]:
+                print(f"Failed to generate audio for segment {result['index']}: {result['error']}")
+                if live:
+                    live.add(result["index"], None)
+            if progress_callback:
+                progress_callback(f"Synthesized {completed}/{total} audio segments", "voice")
+        
+        try:
+            # Generate audio for all segments concurrently, results come back in script order
+            results = synthesize_segments(segments, synthesize, max_in_flight=max_in_flight,
+                                          progress=report_progress)
+            temp_audio_files = [result["result"] for result in results if result["success"]]
+            speakers = [segments[result["index"]]["host"] for result in results if result["success"]]
             
-            # Save the combined audio
-            if combined_audio:
-                combined_audio.export(output_path, format="mp3")
+            # Save the combined audio, assembled in a single pass
+            if temp_audio_files:
+                with span("assemble episode", "audio", segments=len(temp_audio_files)):
+                    assembly = AudioAssembler().assemble(temp_audio_files, output_path, speakers=speakers)
                 
                 # Clean up temp files
                 for temp_file in temp_audio_files:
@@ -203,29 +169,9 @@ class ElevenLabsTool(BaseTool):
                     except Exception as e:
                         print(f"Failed to remove temp file {temp_file}: {str(e)}")
                 
-                # Create metadata
-                metadata = {
-                    "hosts": hosts,
-                    "host_voices": host_voices,
-                    "script_length": len(script),
-                    "segments": len(segments),
-                    "language": "fr",
-                    "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    "output_path": output_path,
-                    "audio_url": f"/audio/{os.path.basename(output_path)}"
-                }
-                
-                metadata_path = output_path.replace(".mp3", "_metadata.json")
-                with open(metadata_path, "w") as f:
-                    json.dump(metadata, f, indent=2)
-                
-                return {
-                    "success": True,
-                    "message": f"Podcast audio generated and saved to {output_path}",
-                    "metadata_path": metadata_path,
-                    "audio_url": f"/audio/{os.path.basename(output_path)}",
-                    "host_voices": host_voices
-                }
+                failed = [result["index"] for result in results if not result["success"]]
+                return self.save_podcast_metadata(script, hosts, host_voices, len(segments),
+                                                  failed, assembly, output_path)
             else:
                 raise Exception("Failed to generate any audio segments")
                 
@@ -233,6 +179,45 @@ class ElevenLabsTool(BaseTool):
             print(f"Error processing podcast script: {str(e)}")
             return self._simulate_podcast_processing(segments, host_voices, output_path)
     
+    def assign_host_voices(self, hosts):
+        """Map each host to a voice - the first host (or Alex) gets Alex, everyone else Simon."""
+        host_voices = {}
+        for i, host in enumerate(hosts):
+            if i == 0 or host.lower() == "alex":
+                host_voices[host] = "alex"
+            else:
+                host_voices[host] = "simon"
+        return host_voices
+    
+    def save_podcast_metadata(self, script, hosts, host_voices, segment_count, failed_segments,
+                              assembly, output_path):
+        """Write the metadata file of an assembled podcast and return the processing result."""
+        metadata = {
+            "hosts": hosts,
+            "host_voices": host_voices,
+            "script_length": len(script),
+            "segments": segment_count,
+            "failed_segments": failed_segments,
+            "duration_ms": assembly["duration_ms"],
+            "assembly": assembly["method"],
+            "language": "fr",
+            "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "output_path": output_path,
+            "audio_url": f"/audio/{os.path.basename(output_path)}"
+        }
+        
+        metadata_path = output_path.replace(".mp3", "_metadata.json")
+        with open(metadata_path, "w") as f:
+            json.dump(metadata, f, indent=2)
+        
+        return {
+            "success": True,
+            "message": f"Podcast audio generated and saved to {output_path}",
+            "metadata_path": metadata_path,
+            "audio_url": f"/audio/{os.path.basename(output_path)}",
+            "host_voices": host_voices
+        }
+    
     def _simulate_podcast_processing(self, segments, host_voices, output_path):
         """Simulate podcast processing when API key is not available or API fails."""
         # Simulate processing time based on script length
@@ -293,15 +278,7 @@ class ElevenLabsTool(BaseTool):
             output_path = f"data/audio/elevenlabs_{timestamp}.mp3"
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
-        # Normalize voice ID (handle case where a name is passed instead of ID)
-        if voice_id:
-            voice_id = voice_id.lower()
-        else:
-            voice_id = "adam"  # Default voice
-        
-        # Get voice ID from name if needed
-        if voice_id in self.voices:
-            voice_id = self.voices[voice_id]
+        voice_id = self._resolve_voice_id(voice_id)
         
         # Check if API key is available
         if not self.api_key:
@@ -309,30 +286,12 @@ class ElevenLabsTool(BaseTool):
             return self._simulate_tts(text, voice_id, stability, clarity, output_path, language)
         
         try:
-            # Prepare request headers and data
-            headers = {
-                "xi-api-key": self.api_key,
-                "Content-Type": "application/json",
-                "Accept": "audio/mpeg"
-            }
-            
-            data = {
-                "text": text,
-                "model_id": "eleven_multilingual_v2",  # Use multilingual model for French
-                "voice_settings": {
-                    "stability": stability,
-                    "similarity_boost": clarity
-                }
-            }
-            
-            # Make the API request
-            url = f"{self.base_url}/text-to-speech/{voice_id}/stream"  # Use streaming endpoint
-            response = requests.post(url, headers=headers, json=data)
-            response.raise_for_status()
+            with span(self.name, "tool", characters=len(text)):
+                audio = self._request_audio(text, voice_id, stability, clarity)
             
             # Save the audio file
-            with open(output_path, "wb") as f:
-                f.write(response.content)
+            with span("write audio", "io", bytes=len(audio)), open(output_path, "wb") as f:
+                f.write(audio)
             
             # Create metadata
             metadata = {
@@ -362,6 +321,65 @@ class ElevenLabsTool(BaseTool):
             print(f"ElevenLabs API error: {str(e)}")
             return self._simulate_tts(text, voice_id, stability, clarity, output_path, language)
     
+    def _resolve_voice_id(self, voice_id):
+        """Normalize a voice name or ID to an ElevenLabs voice ID"""
+        # Normalize voice ID (handle case where a name is passed instead of ID)
+        if voice_id:
+            voice_id = voice_id.lower()
+        else:
+            voice_id = "adam"  # Default voice
+        
+        # Get voice ID from name if needed
+        return self.voices.get(voice_id, voice_id)
+    
+    def _request_audio(self, text, voice_id, stability=0.7, clarity=0.75):
+        """
+        Request speech from the ElevenLabs API, served from the TTS cache when
+        the same text was already synthesized with the same voice and settings.
+        
+        API requests wait for one of the process-wide TTS slots (get_tts_slots),
+        cache hits do not.
+        
+        Returns:
+            bytes: The MP3 audio
+            
+        Raises:
+            requests.RequestException: If the request fails (HTTPError carries the response)
+        """
+        voice_settings = {
+            "stability": stability,
+            "similarity_boost": clarity
+        }
+        
+        cache = get_tts_cache()
+        key = cache_key(text, voice_id, self.model_id, voice_settings)
+        audio = cache.get(key)
+        if audio is not None:
+            return audio
+        
+        # Prepare request headers and data
+        headers = {
+            "xi-api-key": self.api_key,
+            "Content-Type": "application/json",
+            "Accept": "audio/mpeg"
+        }
+        
+        data = {
+            "text": text,
+            "model_id": self.model_id,
+            "voice_settings": voice_settings
+        }
+        
+        # Make the API request
+        url = f"{self.base_url}/text-to-speech/{voice_id}/stream"  # Use streaming endpoint
+        with get_tts_slots():
+            response = get_http_client().post(url, headers=headers, json=data)
+        response.raise_for_status()
+        TTS_CHARACTERS.inc(len(text))
+        
+        cache.put(key, response.content)
+        return response.content
+    
     def _simulate_tts(self, text: str, voice_id: str, stability: float, clarity: float, 
                      output_path: str, language: str = "fr") -> str:
         """Simulate text-to-speech conversion when API key is not available or API fails."""
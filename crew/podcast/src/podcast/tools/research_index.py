@@ -0,0 +1,36 @@
+from crewai.tools import BaseTool
+from typing import Type
+from pydantic import BaseModel, Field
+import json
+
+from podcast.src.podcast.research_index import get_research_index
+from podcast.src.podcast.tracing import span
+
+class ResearchIndexInput(BaseModel):
+    """Input schema for ResearchIndexTool."""
+    topic: str = Field(description="The topic or keywords to look up in past research")
+    num_results: int = Field(default=10, description="Number of results to return")
+
+class ResearchIndexTool(BaseTool):
+    """Tool for looking up results of past web searches in the local research index."""
+
+    name: str = "Past Research Lookup"
+    description: str = ("Instantly find sources already collected by previous web searches, ranked by relevance. "
+                        "Use it before searching the web again")
+    args_schema: Type[BaseModel] = ResearchIndexInput
+
+    def _run(self, topic: str, num_results: int = 10) -> str:
+        """
+        Look up past research on a topic.
+
+        Args:
+            topic: The topic or keywords
+            num_results: Maximum number of results to return
+
+        Returns:
+            JSON string with the matching sources
+        """
+        with span(self.name, "tool", query=topic):
+            results = get_research_index().search(topic, limit=num_results)
+        print(f"Found {len(results)} indexed results for: '{topic}'")
+        return json.dumps({"results": results, "query": topic}, indent=2)
@@ -3,9 +3,13 @@ from typing import Type
 from pydantic import BaseModel, Field
 import json
 import os
-import requests
 from datetime import datetime, timedelta
 
+from podcast.src.podcast.http_client import get_http_client
+from podcast.src.podcast.research_index import get_research_index
+from podcast.src.podcast.search_cache import get_search_cache
+from podcast.src.podcast.tracing import span
+
 class WebSearchInput(BaseModel):
     """Input schema for WebSearchTool."""
     query: str = Field(description="The search query to look up")
@@ -45,42 +49,49 @@ class WebSearchTool(BaseTool):
             return self._simulate_results(query, num_results)
         
         try:
-            # Prepare request headers and data
-            headers = {
-                "X-API-KEY": self.api_key,
-                "Content-Type": "application/json"
-            }
-            data = {
-                "q": query,
-                "num": num_results
-            }
-            
-            # Make the API request
-            response = requests.post(self.base_url, headers=headers, json=data, timeout=10)
-            response.raise_for_status()
-            
-            # Process and return the results
-            results = []
-            raw_results = response.json()
-            
-            # Extract organic search results
-            if "organic" in raw_results:
-                for item in raw_results["organic"][:num_results]:
-                    results.append({
-                        "title": item.get("title", ""),
-                        "url": item.get("link", ""),
-                        "snippet": item.get("snippet", ""),
-                        "date": item.get("date", datetime.now().strftime("%Y-%m-%d"))
-                    })
-            
-            print(f"Found {len(results)} results for query: '{query}'")
-            return json.dumps({"results": results, "query": query}, indent=2)
-            
+            # Identical queries share one request and results are reused across jobs
+            with span(self.name, "tool", query=query):
+                return get_search_cache().get_or_fetch(query, num_results, lambda: self._search(query, num_results))
         except Exception as e:
             # Log the error and fall back to simulated results
             print(f"Serper API error: {str(e)}")
             return self._simulate_results(query, num_results)
     
+    def _search(self, query: str, num_results: int) -> str:
+        """Query the Serper.dev API and return the results as a JSON string."""
+        # Prepare request headers and data
+        headers = {
+            "X-API-KEY": self.api_key,
+            "Content-Type": "application/json"
+        }
+        data = {
+            "q": query,
+            "num": num_results
+        }
+        
+        # Make the API request
+        response = get_http_client().post(self.base_url, headers=headers, json=data, timeout=10)
+        response.raise_for_status()
+        
+        # Process and return the results
+        results = []
+        raw_results = response.json()
+        
+        # Extract organic search results
+        if "organic" in raw_results:
+            for item in raw_results["organic"][:num_results]:
+                results.append({
+                    "title": item.get("title", ""),
+                    "url": item.get("link", ""),
+                    "snippet": item.get("snippet", ""),
+                    "date": item.get("date", datetime.now().strftime("%Y-%m-%d"))
+                })
+        
+        print(f"Found {len(results)} results for query: '{query}'")
+        # Keep every fetched result so later jobs can reuse it without searching
+        get_research_index().add(results, query)
+        return json.dumps({"results": results, "query": query}, indent=2)
+    
     def _simulate_results(self, query: str, num_results: int = 5) -> str:
         """Simulate search results when API key is not available or API fails."""
         # Generate current date for results
@@ -0,0 +1,408 @@
+"""
+Per-job trace timelines.
+
+Spans record where a job spends its time: scheduler stages, crew tasks, tool
+and LLM calls, HTTP requests, audio decoding/encoding and file writes. The
+open span is kept in a context variable, so spans opened further down the
+call stack become its children; work handed to thread pools keeps its parent
+by going through traced(). Outside a traced job span() only reads the
+context variable.
+
+Traces are exported in the Chrome trace-event format (chrome://tracing,
+Perfetto) and stored in SQLite when the job finishes. A sample of the jobs
+can also be run under cProfile (PODCAST_PROFILE_SAMPLE_RATE).
+"""
+import os
+import json
+import time
+import random
+import pstats
+import cProfile
+import logging
+import itertools
+import threading
+import functools
+import contextvars
+from datetime import datetime
+from contextlib import contextmanager
+
+from podcast.src.podcast.storage import connect, data_path
+
+logger = logging.getLogger(__name__)
+
+# Functions listed in the profile summary of a trace
+PROFILE_TOP_FUNCTIONS = 30
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS traces (
+    job_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS traces_created_at ON traces (created_at);
+"""
+
+_current = contextvars.ContextVar("podcast_trace_span", default=None)
+
+
+class Span:
+    """A timed operation of a job, child of the span that was open when it started."""
+
+    __slots__ = ("trace", "id", "parent", "name", "category", "args", "thread", "start", "end")
+
+    def __init__(self, trace, name, category, parent, args):
+        self.trace = trace
+        self.id = next(trace._ids)
+        self.parent = parent
+        self.name = name
+        self.category = category
+        self.args = args
+        self.thread = threading.current_thread()
+        self.start = time.perf_counter()
+        self.end = None
+
+    def set(self, **args):
+        """Attach arguments known only once the operation ran (sizes, status codes)."""
+        self.args.update(args)
+
+    def finish(self):
+        if self.end is None:
+            self.end = time.perf_counter()
+            self.trace._finish(self)
+
+
+class Trace:
+    """Spans of one job, collected in memory while it runs."""
+
+    def __init__(self, job_id, max_spans=None):
+        """
+        Start a trace
+
+        Args:
+            job_id (str): Traced job
+            max_spans (int, optional): Spans kept, later ones are counted as dropped
+                (PODCAST_TRACE_MAX_SPANS, default 5000)
+        """
+        self.job_id = job_id
+        self.max_spans = int(max_spans or os.environ.get('PODCAST_TRACE_MAX_SPANS', 5000))
+        self.started_at = time.time()
+        self.origin = time.perf_counter()
+        self.profile = None
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._open = {}
+        self._spans = []
+        self._events = []
+        self._dropped = 0
+
+    def open(self, name, category, parent=None, **args):
+        span = Span(self, name, category, parent, args)
+        with self._lock:
+            self._open[span.id] = span
+        return span
+
+    def event(self, name, **args):
+        """Record an instant event, such as a progress message."""
+        with self._lock:
+            if len(self._events) < self.max_spans:
+                self._events.append((name, threading.current_thread(), time.perf_counter(), args))
+
+    def _finish(self, span):
+        with self._lock:
+            self._open.pop(span.id, None)
+            if len(self._spans) < self.max_spans:
+                self._spans.append(span)
+            else:
+                self._dropped += 1
+
+    def to_chrome(self):
+        """
+        Export the trace in the Chrome trace-event format
+
+        Spans still running are included with their duration so far.
+
+        Returns:
+            dict: JSON object with "traceEvents" and "otherData"
+        """
+        now = time.perf_counter()
+        with self._lock:
+            spans = self._spans + list(self._open.values())
+            events = list(self._events)
+            dropped = self._dropped
+
+        threads = {}
+
+        def tid(thread):
+            # Keyed by the thread itself, idents are reused once a pool thread exits
+            return threads.setdefault(thread, (len(threads) + 1, thread.name))[0]
+
+        def micros(value):
+            return round((value - self.origin) * 1_000_000)
+
+        trace_events = []
+        for span in sorted(spans, key=lambda s: s.start):
+            args = {"span_id": span.id, "parent_id": span.parent.id if span.parent else None}
+            args.update(span.args)
+            if span.end is None:
+                args["running"] = True
+            trace_events.append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": micros(span.start),
+                "dur": micros(span.end if span.end is not None else now) - micros(span.start),
+                "pid": 1,
+                "tid": tid(span.thread),
+                "args": args,
+            })
+        for name, thread, at, args in events:
+            trace_events.append({
+                "name": name, "cat": "update", "ph": "i", "s": "t",
+                "ts": micros(at), "pid": 1, "tid": tid(thread), "args": args,
+            })
+        trace_events.append({"name": "process_name", "ph": "M", "pid": 1, "args": {"name": f"job {self.job_id}"}})
+        for number, name in threads.values():
+            trace_events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": number, "args": {"name": name}})
+
+        other = {
+            "job_id": self.job_id,
+            "started_at": datetime.fromtimestamp(self.started_at).isoformat(),
+            "dropped_spans": dropped,
+        }
+        if self.profile is not None:
+            other["profile"] = self.profile
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms", "otherData": other}
+
+
+class TraceStore:
+    """SQLite store of the exported traces of finished jobs."""
+
+    def __init__(self, path=None, max_age=None):
+        """
+        Open the trace database
+
+        Args:
+            path (str, optional): Database file, defaults to traces.db on the data volume
+            max_age (float, optional): Seconds traces are kept (PODCAST_TRACE_MAX_AGE_DAYS, default 7 days)
+        """
+        self.path = path or data_path('traces.db', 'PODCAST_TRACE_DB_PATH')
+        self.max_age = float(max_age or float(os.environ.get('PODCAST_TRACE_MAX_AGE_DAYS', 7)) * 86400)
+        self._lock = threading.Lock()
+        self._conn = connect(self.path)
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def save(self, job_id, data):
+        """Store the trace of a job, replacing the one of an earlier run."""
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.execute("INSERT OR REPLACE INTO traces (job_id, data, created_at) VALUES (?, ?, ?)",
+                                   (job_id, json.dumps(data), now))
+                self._conn.execute("DELETE FROM traces WHERE created_at < ?", (now - self.max_age,))
+                self._conn.commit()
+        except Exception as e:
+            logger.warning(f"Could not save the trace of job {job_id}: {str(e)}")
+
+    def load(self, job_id):
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM traces WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row["data"]) if row else None
+
+
+def span(name, category="function", **args):
+    """
+    Context manager timing its block as a child of the current span
+
+    Yields the Span, or None when no job is being traced.
+    """
+    parent = _current.get()
+    if parent is None:
+        return _NOOP
+    return _span(parent, name, category, args)
+
+
+@contextmanager
+def _span(parent, name, category, args):
+    child = parent.trace.open(name, category, parent, **args)
+    token = _current.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.args["error"] = f"{type(e).__name__}: {str(e)}"
+        raise
+    finally:
+        _current.reset(token)
+        child.finish()
+
+
+class _NoopSpan:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+def start_span(name, category="function", **args):
+    """
+    Open a span finished later with finish_span(), for operations that do not fit a block
+
+    The span is current until it is finished. Returns None when no job is being traced.
+    """
+    parent = _current.get()
+    if parent is None:
+        return None
+    child = parent.trace.open(name, category, parent, **args)
+    _current.set(child)
+    return child
+
+
+def finish_span(child):
+    if child is None:
+        return
+    child.finish()
+    if _current.get() is child:
+        _current.set(child.parent)
+
+
+def add_event(name, **args):
+    """Record an instant event on the trace of the current job."""
+    current = _current.get()
+    if current is not None:
+        current.trace.event(name, **args)
+
+
+def traced(func):
+    """
+    Bind ``func`` to the current span, for calls made on other threads
+
+    Spans opened by the function become children of the span that was open
+    when traced() was called.
+    """
+    parent = _current.get()
+    if parent is None:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _current.set(parent)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _current.reset(token)
+
+    return wrapper
+
+
+# cProfile in Python 3.12+ cannot run two profilers at once, so one job is profiled at a time
+_profile_lock = threading.Lock()
+
+
+def profile_sample_rate():
+    return float(os.environ.get('PODCAST_PROFILE_SAMPLE_RATE', 0))
+
+
+def profile_path(job_id):
+    return os.path.join(data_path('profiles', 'PODCAST_PROFILE_DIR'), f"{job_id}.prof")
+
+
+@contextmanager
+def trace_job(job_id, **args):
+    """
+    Trace a job run on the current thread
+
+    The block runs inside the root "job" span. A share of the jobs
+    (PODCAST_PROFILE_SAMPLE_RATE, default 0) also runs under cProfile; the
+    top functions are added to the trace and the full profile is written to
+    the profiles directory of the data volume.
+
+    Yields:
+        Trace: The trace of the job
+    """
+    trace = Trace(job_id)
+    with _active_lock:
+        _active[job_id] = trace
+    profiler = None
+    rate = profile_sample_rate()
+    if rate > 0 and random.random() < rate and _profile_lock.acquire(blocking=False):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:
+            logger.warning(f"Could not profile job {job_id}: {str(e)}")
+            _profile_lock.release()
+            profiler = None
+
+    root = trace.open("job", "job", None, job_id=job_id, **args)
+    token = _current.set(root)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+        root.finish()
+        if profiler is not None:
+            profiler.disable()
+            _profile_lock.release()
+            trace.profile = _summarize_profile(profiler, job_id)
+        try:
+            get_trace_store().save(job_id, trace.to_chrome())
+        finally:
+            with _active_lock:
+                _active.pop(job_id, None)
+
+
+def _summarize_profile(profiler, job_id):
+    """Write the profile of a job and return its most expensive functions."""
+    path = profile_path(job_id)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        profiler.dump_stats(path)
+    except OSError as e:
+        logger.warning(f"Could not write the profile of job {job_id}: {str(e)}")
+
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (filename, line, function), (_, calls, total, cumulative, _) in stats.stats.items():
+        rows.append({
+            "function": f"{function} ({os.path.basename(filename)}:{line})",
+            "calls": calls,
+            "total_ms": round(total * 1000, 1),
+            "cumulative_ms": round(cumulative * 1000, 1),
+        })
+    rows.sort(key=lambda row: row["cumulative_ms"], reverse=True)
+    return rows[:PROFILE_TOP_FUNCTIONS]
+
+
+_active = {}
+_active_lock = threading.Lock()
+
+
+def get_trace(job_id):
+    """
+    Return the trace of a job in the Chrome trace-event format
+
+    Returns the live trace of a running job, or the stored trace of a
+    finished one, or None.
+    """
+    with _active_lock:
+        trace = _active.get(job_id)
+    if trace is not None:
+        return trace.to_chrome()
+    return get_trace_store().load(job_id)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_trace_store():
+    """Return the process-wide trace store."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = TraceStore()
+        return _store
@@ -0,0 +1,192 @@
+"""
+Content-addressed disk cache for synthesized speech.
+
+Audio is stored under the SHA-256 of the request (text, voice, model and voice
+settings), written atomically, and evicted least recently used first once the
+cache grows past its size limit. Temporary files left by a write interrupted
+by a crash are removed when the cache is opened.
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+
+from podcast.src.podcast.storage import data_path
+
+logger = logging.getLogger(__name__)
+
+# Temporary files older than this are leftovers of an interrupted write, younger
+# ones may still be written by another worker process sharing the directory
+STALE_TEMP_SECONDS = 3600
+
+
+def cache_key(text, voice_id, model_id, voice_settings):
+    """Hash of everything that determines the generated audio."""
+    payload = json.dumps({
+        "text": text,
+        "voice_id": voice_id,
+        "model_id": model_id,
+        "voice_settings": voice_settings,
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """Size-bounded LRU cache of MP3 files keyed by content hash."""
+
+    def __init__(self, directory=None, max_bytes=None):
+        """
+        Open the cache, indexing the files already on disk
+
+        Args:
+            directory (str, optional): Cache directory, defaults to TTS_CACHE_DIR or tts_cache on the data volume
+            max_bytes (int, optional): Size limit, defaults to TTS_CACHE_MAX_MB (512 MB); 0 disables the cache
+        """
+        self.directory = directory or data_path('tts_cache', 'TTS_CACHE_DIR')
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get('TTS_CACHE_MAX_MB', 512)) * 1024 * 1024)
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._size = 0
+
+        if self.enabled:
+            os.makedirs(self.directory, exist_ok=True)
+            self._load_index()
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def get(self, key):
+        """Return the cached audio for ``key``, or None on a miss."""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            # Keep the LRU order across restarts
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self._size -= self._entries.pop(key, 0)
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key, data):
+        """Store audio for ``key`` atomically and evict old entries if needed."""
+        if not self.enabled or len(data) > self.max_bytes:
+            return
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write TTS cache entry {key}: {str(e)}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+
+        with self._lock:
+            self._size -= self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._size += len(data)
+            evicted = self._evict_locked()
+
+        for old_key in evicted:
+            try:
+                os.remove(self._path(old_key))
+            except OSError:
+                pass
+
+    def stats(self):
+        """Return hit/miss counters and cache size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.mp3")
+
+    def _evict_locked(self):
+        evicted = []
+        while self._size > self.max_bytes and self._entries:
+            old_key, size = self._entries.popitem(last=False)
+            self._size -= size
+            self.evictions += 1
+            evicted.append(old_key)
+        return evicted
+
+    def _load_index(self):
+        entries = []
+        stale_before = time.time() - STALE_TEMP_SECONDS
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                    if name.endswith(".tmp") and stat.st_mtime < stale_before:
+                        os.remove(path)
+                        continue
+                except OSError:
+                    continue
+                if name.endswith(".mp3"):
+                    entries.append((stat.st_mtime, name[:-4], stat.st_size))
+
+        # Oldest access first
+        for _, key, size in sorted(entries):
+            self._entries[key] = size
+            self._size += size
+        evicted = self._evict_locked()
+        for old_key in evicted:
+            try:
+                os.remove(self._path(old_key))
+            except OSError:
+                pass
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_tts_cache():
+    """Return the process-wide TTS cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = TTSCache()
+        return _cache
@@ -0,0 +1,198 @@
+"""
+Ollama model warm-up and keep-alive.
+
+Ollama loads a model on its first request, so without warm-up the first job
+after a start pays the whole load time. The ModelWarmer preloads the
+configured model at startup, keeps it resident with keep-alive pings while
+jobs are queued or running, and unloads it once the app has been idle for
+OLLAMA_IDLE_UNLOAD seconds to free host RAM.
+"""
+import os
+import time
+import logging
+import threading
+from datetime import datetime
+
+import requests
+
+from podcast.src.podcast.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+
+def warmup_enabled():
+    return os.environ.get('OLLAMA_WARMUP', 'true').lower() == 'true'
+
+
+def ollama_model_name(model):
+    """Model name as Ollama knows it, without a LiteLLM provider prefix."""
+    return model.split("/", 1)[1] if model.startswith("ollama/") else model
+
+
+class ModelWarmer:
+    """Loads, keeps resident and unloads the Ollama model of the agents."""
+
+    def __init__(self, base_url=None, model=None, busy=None, keep_alive=None, interval=None,
+                 idle_unload=None, load_timeout=None):
+        """
+        Initialize the warmer
+
+        Args:
+            base_url (str, optional): Ollama URL, defaults to OLLAMA_BASE_URL
+            model (str, optional): Model to keep loaded, defaults to MODEL
+            busy (callable, optional): Returns True while jobs are queued or running
+            keep_alive (str, optional): How long Ollama keeps the model after a ping (OLLAMA_KEEP_ALIVE, default "30m")
+            interval (float, optional): Seconds between keep-alive checks (OLLAMA_KEEPALIVE_INTERVAL, default 60)
+            idle_unload (float, optional): Idle seconds before the model is unloaded
+                (OLLAMA_IDLE_UNLOAD, default 0 = never unload)
+            load_timeout (float, optional): Seconds allowed for loading the model (OLLAMA_LOAD_TIMEOUT, default 300)
+        """
+        self.base_url = (base_url or os.environ.get('OLLAMA_BASE_URL', 'http://localhost:11434')).rstrip("/")
+        self.model = ollama_model_name(model or os.environ.get('MODEL', 'deepseek-coder:7b'))
+        self.busy = busy or (lambda: False)
+        self.keep_alive = keep_alive or os.environ.get('OLLAMA_KEEP_ALIVE', '30m')
+        self.interval = float(interval or os.environ.get('OLLAMA_KEEPALIVE_INTERVAL', 60))
+        self.idle_unload = float(idle_unload if idle_unload is not None else os.environ.get('OLLAMA_IDLE_UNLOAD', 0))
+        self.load_timeout = float(load_timeout or os.environ.get('OLLAMA_LOAD_TIMEOUT', 300))
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_active = time.time()
+        self._warmed = False
+        self._state = {
+            "state": "unloaded",
+            "resident": False,
+            "load_ms": None,
+            "loaded_at": None,
+            "last_ping": None,
+            "error": None,
+        }
+
+    def start(self):
+        """Preload the model in the background and start the keep-alive loop."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="model-warmer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def touch(self):
+        """Mark activity, loading the model right away if it was unloaded."""
+        with self._lock:
+            self._last_active = time.time()
+            unloaded = self._state["state"] in ("unloaded", "error")
+        if unloaded:
+            self._wake.set()
+
+    def snapshot(self):
+        """Return the load state of the model."""
+        with self._lock:
+            state = dict(self._state)
+            idle = time.time() - self._last_active
+        for key in ("loaded_at", "last_ping"):
+            if state[key] is not None:
+                state[key] = datetime.fromtimestamp(state[key]).isoformat()
+        state.update({
+            "base_url": self.base_url,
+            "model": self.model,
+            "keep_alive": self.keep_alive,
+            "idle_seconds": round(idle, 1),
+            "idle_unload": self.idle_unload,
+        })
+        return state
+
+    def load(self):
+        """Load the model, or extend its keep-alive if it is already loaded."""
+        with self._lock:
+            first = self._state["state"] != "loaded"
+            if first:
+                self._state["state"] = "loading"
+        start = time.perf_counter()
+        try:
+            # A request without prompt only loads the model
+            response = get_http_client().post(f"{self.base_url}/api/generate", json={
+                "model": self.model, "keep_alive": self.keep_alive
+            }, timeout=self.load_timeout)
+            response.raise_for_status()
+        except (requests.RequestException, ValueError) as e:
+            with self._lock:
+                self._state.update({"state": "error", "resident": False, "error": str(e)})
+            logger.warning(f"Could not load Ollama model {self.model}: {str(e)}")
+            return False
+
+        now = time.time()
+        with self._lock:
+            self._warmed = True
+            self._state.update({"state": "loaded", "resident": True, "last_ping": now, "error": None})
+            if first:
+                self._state["load_ms"] = round((time.perf_counter() - start) * 1000, 1)
+                self._state["loaded_at"] = now
+        if first:
+            logger.info(f"Ollama model {self.model} loaded in {self._state['load_ms']} ms")
+        return True
+
+    def unload(self):
+        """Ask Ollama to release the model."""
+        try:
+            response = get_http_client().post(f"{self.base_url}/api/generate", json={
+                "model": self.model, "keep_alive": 0
+            }, timeout=30)
+            response.raise_for_status()
+        except (requests.RequestException, ValueError) as e:
+            logger.warning(f"Could not unload Ollama model {self.model}: {str(e)}")
+            return False
+        with self._lock:
+            self._state.update({"state": "unloaded", "resident": False})
+        logger.info(f"Ollama model {self.model} unloaded after {self.idle_unload:.0f}s idle")
+        return True
+
+    def check_resident(self):
+        """Refresh whether Ollama still holds the model, it may have expired it on its own."""
+        try:
+            response = get_http_client().get(f"{self.base_url}/api/ps", timeout=5)
+            response.raise_for_status()
+            names = [model.get("name", "") for model in response.json().get("models", [])]
+        except (requests.RequestException, ValueError):
+            return None
+        resident = self.model in names or f"{self.model}:latest" in names
+        with self._lock:
+            self._state["resident"] = resident
+            if not resident and self._state["state"] == "loaded":
+                self._state["state"] = "unloaded"
+        return resident
+
+    def tick(self):
+        """One keep-alive step: ping while active, unload once idle long enough."""
+        now = time.time()
+        busy = self.busy()
+        with self._lock:
+            if busy:
+                self._last_active = now
+            idle = now - self._last_active
+            state = self._state["state"]
+
+        if self.idle_unload > 0 and idle >= self.idle_unload:
+            if state == "loaded":
+                self.unload()
+        elif busy or idle < self.interval or not self._warmed:
+            # Active, or the startup warm-up has not succeeded yet
+            self.load()
+        elif state == "loaded":
+            self.check_resident()
+
+    def _run(self):
+        self.load()
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            try:
+                self.tick()
+            except Exception as e:
+                logger.error(f"Model keep-alive failed: {str(e)}")
@@ -63,21 +63,93 @@ podcastForm.addEventListener('submit', async (e) => {
     }
 });
 
+// Podcasts known to the page, in creation order
+let podcasts = [];
+
 // Fetch all podcasts
 async function fetchPodcasts() {
     try {
-        const response = await fetch('/api/podcasts');
+        const response = await fetch('/api/podcasts?view=summary&limit=50');
         if (!response.ok) throw new Error('Failed to fetch podcasts');
         
         const data = await response.json();
-        updatePodcastsList(data.podcasts);
-        updateCurrentJob(data.podcasts, data.current_job);
+        // The API lists newest first
+        podcasts = data.podcasts.reverse();
+        renderPodcasts();
+        loadRecentUpdates();
         
     } catch (error) {
         console.error('Error fetching podcasts:', error);
     }
 }
 
+// The most recently created running job is shown as the current job
+function currentJobId() {
+    const running = podcasts.filter(podcast => podcast.status === 'running');
+    return running.length > 0 ? running[running.length - 1].id : null;
+}
+
+// Render the list and the current job from the known podcasts
+function renderPodcasts() {
+    updatePodcastsList(podcasts);
+    updateCurrentJob(podcasts, currentJobId());
+}
+
+// Summaries carry no updates, fetch the last few for the current job
+async function loadRecentUpdates() {
+    const podcast = podcasts.find(item => item.id === currentJobId());
+    if (!podcast || podcast.updates || podcast.loadingUpdates) return;
+    
+    podcast.loadingUpdates = true;
+    try {
+        const since = Math.max(0, (podcast.updates_count || 0) - 5);
+        const response = await fetch(`/api/podcast/${podcast.id}?fields=updates&updates_since=${since}`);
+        if (!response.ok) throw new Error('Failed to fetch updates');
+        
+        const data = await response.json();
+        podcast.updates = data.updates.concat(podcast.pendingUpdates || []).slice(-5);
+        renderPodcasts();
+    } catch (error) {
+        console.error('Error fetching updates:', error);
+    } finally {
+        podcast.loadingUpdates = false;
+    }
+}
+
+// Apply an update pushed by the server to the known podcasts
+function applyPodcastEvent(data) {
+    const podcast = podcasts.find(item => item.id === data.job_id);
+    if (!podcast) {
+        // A job we have not seen yet, reload the list
+        fetchPodcasts();
+        return;
+    }
+    
+    podcast.status = data.status;
+    podcast.progress = data.progress;
+    podcast.current_stage = data.current_stage;
+    if (podcast.updates) {
+        podcast.updates = podcast.updates.concat([data.update]).slice(-5);
+    } else {
+        // Recent updates are still loading, keep this one until they arrive
+        podcast.pendingUpdates = (podcast.pendingUpdates || []).concat([data.update]);
+    }
+    renderPodcasts();
+    loadRecentUpdates();
+}
+
+// Subscribe to pushed job updates, falling back to polling without EventSource
+function subscribeToPodcastEvents() {
+    if (!window.EventSource) {
+        setInterval(fetchPodcasts, 3000);
+        return;
+    }
+    
+    const events = new EventSource('/api/events');
+    events.addEventListener('update', (e) => applyPodcastEvent(JSON.parse(e.data)));
+    events.addEventListener('reset', () => fetchPodcasts());
+}
+
 // Update the podcasts list
 function updatePodcastsList(podcasts) {
     // Hide the "no podcasts" message if we have podcasts
@@ -179,11 +251,9 @@ function updateCurrentJob(podcasts, currentJobId) {
     currentJobStatus.appendChild(jobDisplay);
 }
 
-// Initial fetch
+// Initial fetch, then follow pushed updates
 fetchPodcasts();
-
-// Set up polling
-setInterval(fetchPodcasts, 3000);
+subscribeToPodcastEvents();
 
 // Voice selection functionality
 document.addEventListener('DOMContentLoaded', () => {
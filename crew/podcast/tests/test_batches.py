@@ -0,0 +1,65 @@
+import threading
+
+import pytest
+
+from podcast.src.podcast import batches
+from podcast.src.podcast.batches import Batch
+
+TOPICS = ["intelligence artificielle au Québec", "intelligence artificielle en santé au Québec", "hockey"]
+
+
+class EmptyIndex:
+    def search(self, topic, limit=10):
+        return []
+
+
+@pytest.fixture(autouse=True)
+def research_index(monkeypatch):
+    monkeypatch.setattr(batches, "get_research_index", lambda: EmptyIndex())
+
+
+def research_for(topic):
+    return {"sources": [{"title": topic, "url": f"https://example.com/{len(topic)}", "snippet": topic,
+                         "date": None, "queries": []}],
+            "topics": [topic], "queries": [topic]}
+
+
+def test_related_episodes_share_the_first_research():
+    batch = Batch(["a", "b", "c"], TOPICS)
+    runs = []
+
+    def run(topic):
+        runs.append(topic)
+        return research_for(topic)
+
+    assert batch.research("a", TOPICS[0], run) == (research_for(TOPICS[0]), None)
+    research, shared_topic = batch.research("b", TOPICS[1], run)
+    assert shared_topic == TOPICS[0]
+    assert research["sources"][0]["url"] == research_for(TOPICS[0])["sources"][0]["url"]
+    assert batch.research("c", TOPICS[2], run)[1] is None
+
+    assert runs == [TOPICS[0], TOPICS[2]]
+    # Every member of the group took the shared research
+    assert batch._research == {}
+
+
+def test_waiting_for_a_stuck_leader_is_bounded():
+    batch = Batch(["a", "b", "c"], TOPICS, research_wait=0.05)
+    started = threading.Event()
+    release = threading.Event()
+
+    def stuck(topic):
+        started.set()
+        release.wait(5)
+        return research_for(topic)
+
+    leader = threading.Thread(target=batch.research, args=("a", TOPICS[0], stuck))
+    leader.start()
+    try:
+        assert started.wait(5)
+        assert batch.research("b", TOPICS[1], research_for) == (research_for(TOPICS[1]), None)
+    finally:
+        release.set()
+        leader.join(5)
+    # The member that stopped waiting is not waited for anymore
+    assert batch._research == {}
@@ -0,0 +1,76 @@
+from podcast.src.podcast.checkpoints import CREW_TASKS, CheckpointStore
+from podcast.src.podcast.crew import PodcastCrew
+
+HOSTS = ["Alex", "Simon"]
+
+
+class TaskOutput:
+    def __init__(self, raw, name=None):
+        self.name = name
+        self.raw = raw
+
+
+def test_save_load_and_clear(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.db"))
+    store.save("job", "research", {"sources": [{"url": "https://example.com"}]})
+    store.save("job", "research_task", "Sources")
+    store.save("job", "research_task", "Sources revues")
+    store.save("other", "research_task", "Autres sources")
+
+    assert store.load("job") == {
+        "research": {"sources": [{"url": "https://example.com"}]},
+        "research_task": "Sources revues",
+    }
+
+    store.clear("job", ["research_task"])
+    assert list(store.load("job")) == ["research"]
+    store.clear("job")
+    assert store.load("job") == {}
+    assert store.load("other") == {"research_task": "Autres sources"}
+
+
+def test_checkpoints_survive_reopening(tmp_path):
+    path = str(tmp_path / "checkpoints.db")
+    CheckpointStore(path).save("job", "script", {"script": "Alex: Bonjour."})
+
+    assert CheckpointStore(path).load("job") == {"script": {"script": "Alex: Bonjour."}}
+
+
+def test_crew_checkpoints_every_task_as_it_completes(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.db"))
+    crew = PodcastCrew("Checkpoints", HOSTS,
+                       task_output_callback=lambda name, output: store.save("job", name, output))
+
+    # Older CrewAI versions do not name task outputs, they complete in order
+    crew._on_task_done(TaskOutput("Sources"))
+    crew._on_task_done(TaskOutput("Sujets", name="topic_curation_task"))
+
+    assert store.load("job") == {"research_task": "Sources", "topic_curation_task": "Sujets"}
+
+
+def test_resumed_crew_skips_checkpointed_tasks(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.db"))
+    store.save("job", "research_task", "Sources")
+    store.save("job", "topic_curation_task", "Sujets")
+
+    saved = []
+    crew = PodcastCrew("Checkpoints", HOSTS, completed=store.load("job"),
+                       task_output_callback=lambda name, output: saved.append(name))
+
+    assert crew.remaining_tasks() == ["script_writing_task", "audio_production_task"]
+    # The crew no longer passes skipped tasks as context, their outputs go in the description
+    earlier = crew._earlier_outputs("script_writing_task")
+    assert "### research_task\nSources" in earlier
+    assert "### topic_curation_task\nSujets" in earlier
+    assert crew._earlier_outputs("research_task") == ""
+
+    crew._on_task_done(TaskOutput("Alex: Bonjour."))
+    assert saved == ["script_writing_task"]
+    assert crew.outputs["research_task"] == "Sources"
+
+
+def test_crew_tasks_follow_the_job_stages():
+    assert [name for name, _ in CREW_TASKS] == [
+        "research_task", "topic_curation_task", "script_writing_task", "audio_production_task",
+    ]
+    assert [stage for _, stage in CREW_TASKS] == ["research", "summarize", "script", "voice"]
@@ -0,0 +1,90 @@
+import threading
+
+import pytest
+
+from podcast.src.podcast.audio_assembly import silence_frame
+from podcast.src.podcast.pipeline import VoicePipeline
+from podcast.src.podcast.tools import elevenlabs
+from podcast.src.podcast.tools.elevenlabs import ElevenLabsTool
+from podcast.src.podcast.tts_cache import TTSCache
+
+FRAME = silence_frame({"version": 3, "layer": 3, "bitrate": 128000, "sample_rate": 44100, "channels": 1})
+
+SCRIPT = """Alex: Bonjour tout le monde.
+Simon: Salut Alex!
+Alex: On commence.
+Simon: C'est parti."""
+
+
+class FakeResponse:
+    content = FRAME * 2
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeClient:
+    """HTTP client recording how many TTS requests are in flight."""
+
+    def __init__(self):
+        self.requests = 0
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def post(self, url, headers=None, json=None):
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        threading.Event().wait(0.01)
+        with self._lock:
+            self.in_flight -= 1
+        return FakeResponse()
+
+
+@pytest.fixture
+def slots(monkeypatch):
+    slots = threading.BoundedSemaphore(1)
+    monkeypatch.setattr(elevenlabs, "get_tts_slots", lambda: slots)
+    return slots
+
+
+@pytest.fixture
+def client(monkeypatch, slots):
+    client = FakeClient()
+    monkeypatch.setattr(elevenlabs, "get_http_client", lambda: client)
+    return client
+
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path):
+    cache = TTSCache(directory=str(tmp_path / "tts_cache"), max_bytes=1024 * 1024)
+    monkeypatch.setattr(elevenlabs, "get_tts_cache", lambda: cache)
+    return cache
+
+
+def test_cache_hits_do_not_wait_for_a_tts_slot(client, cache, slots):
+    tool = ElevenLabsTool(api_key="test")
+    audio = tool._request_audio("Bonjour", "alex")
+
+    assert slots.acquire(blocking=False)
+    try:
+        # Every slot is taken by other requests, the cached segment is still served
+        assert tool._request_audio("Bonjour", "alex") == audio
+    finally:
+        slots.release()
+    assert client.requests == 1
+
+
+def test_pipelines_share_the_process_wide_tts_limit(client, cache, tmp_path):
+    tool = ElevenLabsTool(api_key="test")
+    pipelines = [VoicePipeline(tool, ["Alex", "Simon"], str(tmp_path / f"episode-{i}.mp3"), max_in_flight=4)
+                 for i in range(2)]
+    for i, pipeline in enumerate(pipelines):
+        pipeline.feed(SCRIPT.replace("Bonjour", f"Bonjour {i}") + "\n")
+    for i, pipeline in enumerate(pipelines):
+        assert pipeline.finish(SCRIPT.replace("Bonjour", f"Bonjour {i}"))["success"]
+
+    assert client.requests >= 5
+    assert client.peak == 1
@@ -0,0 +1,86 @@
+import time
+import threading
+
+from podcast.src.podcast.events import EventBroker, format_sse
+
+
+def drain(subscription):
+    events = []
+    while True:
+        event = subscription.get(timeout=0)
+        if event is None:
+            return events
+        events.append(event)
+
+
+def test_concurrent_publishes_are_delivered_in_sequence_order():
+    broker = EventBroker(history_size=10000)
+    subscription = broker.subscribe()
+    deliver = subscription.deliver
+
+    def slow_deliver(event):
+        # Give the other publishers a chance to run between sequencing and delivery
+        time.sleep(0.0001)
+        deliver(event)
+
+    subscription.deliver = slow_deliver
+
+    def publish(worker):
+        for i in range(200):
+            broker.publish("update", {"worker": worker, "i": i}, job_id=f"job-{worker}")
+
+    threads = [threading.Thread(target=publish, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [event.seq for event in drain(subscription)] == list(range(1, 801))
+
+
+def test_resuming_after_last_event_id_replays_the_missed_events():
+    broker = EventBroker()
+    for i in range(5):
+        broker.publish("update", {"i": i}, job_id="job-1" if i % 2 else "job-2")
+
+    assert [event.data["i"] for event in broker.replay(2)] == [2, 3, 4]
+    assert [event.data["i"] for event in broker.replay(0, job_id="job-1")] == [1, 3]
+    assert broker.replay(5) == []
+
+
+def test_replay_past_the_history_asks_for_a_reset():
+    broker = EventBroker(history_size=3)
+    for i in range(6):
+        broker.publish("update", {"i": i})
+
+    assert broker.replay(1) is None
+    assert [event.seq for event in broker.replay(3)] == [4, 5, 6]
+    # An id from another server process
+    assert broker.replay(100) is None
+
+
+def test_transient_events_only_reach_job_subscribers():
+    broker = EventBroker()
+    everything = broker.subscribe()
+    job = broker.subscribe(job_id="job-1")
+    other = broker.subscribe(job_id="job-2")
+
+    assert broker.publish("partial", {"text": "Bonjour"}, job_id="job-1", transient=True) is None
+
+    assert drain(everything) == []
+    assert [event.name for event in drain(job)] == ["partial"]
+    assert drain(other) == []
+    assert broker.replay(0) == []
+
+
+def test_unsubscribed_clients_get_nothing():
+    broker = EventBroker()
+    subscription = broker.subscribe()
+    subscription.close()
+    broker.publish("update", {})
+
+    assert drain(subscription) == []
+
+
+def test_format_sse():
+    assert format_sse("update", {"a": 1}, event_id=7) == 'id: 7\nevent: update\ndata: {"a": 1}\n\n'
@@ -0,0 +1,82 @@
+import pytest
+
+from podcast.src.podcast.job_store import JobStore, decode_cursor, encode_cursor
+
+
+def record(status, version):
+    return {"id": "job-1", "topic": "Sujet", "status": status, "version": version, "created_at": 1.0}
+
+
+def test_buffered_snapshot_does_not_overwrite_a_newer_status(tmp_path):
+    store = JobStore(path=str(tmp_path / "jobs.db"), flush_interval=60)
+    try:
+        store.mark_dirty(record("running", 3))
+        # Saved after the snapshot was buffered, e.g. a status change on another thread
+        store.save_job(record("completed", 4))
+        store.mark_dirty(record("running", 3))
+        store.flush()
+
+        assert store.load("job-1")["status"] == "completed"
+    finally:
+        store.close()
+
+
+def test_newer_buffered_snapshot_is_written(tmp_path):
+    store = JobStore(path=str(tmp_path / "jobs.db"), flush_interval=60)
+    try:
+        store.save_job(record("running", 1))
+        store.mark_dirty(dict(record("running", 2), progress=40))
+        store.flush()
+
+        assert store.load("job-1")["progress"] == 40
+        assert store.page()[0][0]["version"] == 2
+    finally:
+        store.close()
+
+
+def test_interrupted_jobs_are_failed(tmp_path):
+    store = JobStore(path=str(tmp_path / "jobs.db"), flush_interval=60)
+    try:
+        store.save_job(record("running", 5))
+        assert store.mark_interrupted() == ["job-1"]
+        assert store.load("job-1")["status"] == "failed"
+    finally:
+        store.close()
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(1700000000.25, "job-1")) == (1700000000.25, "job-1")
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "W10=", encode_cursor("abc", "job-1")[:-4]])
+def test_invalid_cursor_is_a_value_error(cursor):
+    # GET /api/podcasts answers 400 on this ValueError
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_pages_cover_every_job_once_newest_first(tmp_path):
+    store = JobStore(path=str(tmp_path / "jobs.db"), flush_interval=60)
+    try:
+        # Jobs created in the same second are ordered by id
+        for i in range(7):
+            store.save_job({"id": f"job-{i}", "topic": "Sujet", "status": "completed" if i % 2 else "failed",
+                            "version": 1, "created_at": 100.0 + i // 2})
+
+        seen = []
+        cursor = None
+        while True:
+            page, cursor = store.page(limit=3, cursor=cursor)
+            seen.extend(summary["id"] for summary in page)
+            if cursor is None:
+                break
+        assert seen == ["job-6", "job-5", "job-4", "job-3", "job-2", "job-1", "job-0"]
+
+        page, cursor = store.page(statuses=["completed"], limit=10)
+        assert [summary["id"] for summary in page] == ["job-5", "job-3", "job-1"]
+        assert cursor is None
+
+        with pytest.raises(ValueError):
+            store.page(cursor="not a cursor")
+    finally:
+        store.close()
@@ -0,0 +1,98 @@
+import threading
+
+from podcast.src.podcast.audio_assembly import silence_frame
+from podcast.src.podcast.live_audio import LiveEpisode, LiveEpisodes
+
+
+def frame(bitrate=128000, sample_rate=44100):
+    return silence_frame({"version": 3, "layer": 3, "bitrate": bitrate, "sample_rate": sample_rate, "channels": 1})
+
+
+# Segments told apart by their bitrate, which may change between segments of a stream
+SEGMENTS = [frame(bitrate) * 3 for bitrate in (64000, 128000, 192000)]
+
+
+def test_segments_are_released_in_script_order():
+    episode = LiveEpisode("job")
+
+    episode.add(2, SEGMENTS[2])
+    episode.add(1, SEGMENTS[1])
+    assert episode.chunks == []
+    assert episode.published == 0
+
+    episode.add(0, SEGMENTS[0])
+    assert episode.chunks == SEGMENTS
+    assert episode.published == 3
+
+
+def test_failed_and_incompatible_segments_are_skipped():
+    episode = LiveEpisode("job")
+
+    episode.add(0, SEGMENTS[0])
+    episode.add(1, None)
+    episode.add(2, frame(sample_rate=48000) * 3)
+    episode.add(3, b"not audio")
+    episode.add(4, SEGMENTS[1])
+    # A segment already released is not published again
+    episode.add(0, SEGMENTS[2])
+
+    assert episode.chunks == [SEGMENTS[0], SEGMENTS[1]]
+    assert episode.published == 5
+
+
+def test_listeners_follow_new_segments_until_closed():
+    episode = LiveEpisode("job", read_timeout=5)
+    episode.add(0, SEGMENTS[0])
+    received = []
+    first = threading.Event()
+
+    def listen():
+        for chunk in episode.read():
+            received.append(chunk)
+            first.set()
+
+    listener = threading.Thread(target=listen)
+    listener.start()
+    assert first.wait(5)
+    episode.add(1, SEGMENTS[1])
+    episode.add(2, SEGMENTS[2])
+    episode.close()
+    listener.join(5)
+
+    assert not listener.is_alive()
+    assert received == SEGMENTS
+    # A listener joining after the end reads the whole episode
+    assert list(episode.read()) == SEGMENTS
+
+
+def test_listeners_stop_when_no_segment_arrives():
+    episode = LiveEpisode("job", read_timeout=0.05)
+    episode.add(0, SEGMENTS[0])
+
+    assert list(episode.read()) == [SEGMENTS[0]]
+
+
+def test_segments_after_close_are_ignored():
+    episode = LiveEpisode("job")
+    episode.add(1, SEGMENTS[1])
+    episode.close()
+    episode.add(0, SEGMENTS[0])
+
+    assert episode.chunks == []
+    assert list(episode.read()) == []
+
+
+def test_reopening_a_job_closes_its_earlier_episode():
+    episodes = LiveEpisodes()
+    first = episodes.open("job")
+    second = episodes.open("job")
+
+    assert first.closed
+    assert episodes.get("job") is second
+
+    # Closing the replaced episode leaves the current one registered
+    episodes.close(first)
+    assert episodes.get("job") is second
+    episodes.close(second)
+    assert second.closed
+    assert episodes.get("job") is None
@@ -0,0 +1,105 @@
+from types import SimpleNamespace
+
+import pytest
+
+from podcast.src.podcast import llm_cache
+from podcast.src.podcast.llm_cache import LLMCache, LLMCacheMiss, prompt_key
+
+
+class FakeLLM:
+    def __init__(self, model="ollama/qwen2.5", temperature=0.7):
+        self.model = model
+        self.temperature = temperature
+        self.calls = []
+
+    def call(self, messages, tools=None, **kwargs):
+        self.calls.append(messages)
+        return f"answer {len(self.calls)}"
+
+
+MESSAGES = [{"role": "user", "content": "Write the outline"}]
+
+
+def test_key_depends_on_model_temperature_and_prompt():
+    key = prompt_key("ollama/qwen2.5", 0.7, MESSAGES)
+    assert key == prompt_key("ollama/qwen2.5", 0.7, [dict(m) for m in MESSAGES])
+    assert key != prompt_key("ollama/llama3", 0.7, MESSAGES)
+    assert key != prompt_key("ollama/qwen2.5", 0.2, MESSAGES)
+    assert key != prompt_key("ollama/qwen2.5", 0.7, [{"role": "user", "content": "Write the script"}])
+
+
+def test_readwrite_reuses_responses(tmp_path):
+    cache = LLMCache(path=str(tmp_path / "llm.db"), mode="readwrite")
+    llm = cache.wrap(FakeLLM())
+
+    assert llm.call(MESSAGES) == "answer 1"
+    assert llm.call(MESSAGES) == "answer 1"
+    assert llm.call([{"role": "user", "content": "Other"}]) == "answer 2"
+
+    assert len(llm.calls) == 2
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 2)
+
+
+def test_responses_survive_reopening(tmp_path):
+    path = str(tmp_path / "llm.db")
+    LLMCache(path=path, mode="readwrite").wrap(FakeLLM()).call(MESSAGES)
+
+    llm = LLMCache(path=path, mode="readwrite").wrap(FakeLLM())
+    assert llm.call(MESSAGES) == "answer 1"
+    assert llm.calls == []
+
+
+def test_expired_responses_are_refreshed(tmp_path):
+    cache = LLMCache(path=str(tmp_path / "llm.db"), mode="readwrite", ttl=0)
+    llm = cache.wrap(FakeLLM())
+
+    llm.call(MESSAGES)
+    assert llm.call(MESSAGES) == "answer 2"
+
+
+def test_replay_uses_old_responses_and_fails_on_unrecorded_prompts(tmp_path):
+    path = str(tmp_path / "llm.db")
+    LLMCache(path=path, mode="readwrite").wrap(FakeLLM()).call(MESSAGES)
+
+    llm = LLMCache(path=path, mode="replay", ttl=0).wrap(FakeLLM())
+    assert llm.call(MESSAGES) == "answer 1"
+    with pytest.raises(LLMCacheMiss):
+        llm.call([{"role": "user", "content": "Never recorded"}])
+    assert llm.calls == []
+
+
+def test_least_recently_used_are_evicted(tmp_path, monkeypatch):
+    clock = iter(range(1000, 2000))
+    monkeypatch.setattr(llm_cache, "time", SimpleNamespace(time=lambda: next(clock)))
+    cache = LLMCache(path=str(tmp_path / "llm.db"), mode="readwrite", max_entries=2)
+    cache.put("a", "model", "response a")
+    cache.put("b", "model", "response b")
+    assert cache.get("a") == "response a"
+    cache.put("c", "model", "response c")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "response a"
+    assert cache.get("c") == "response c"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_off_mode_leaves_the_llm_alone(tmp_path):
+    llm = FakeLLM()
+    cache = LLMCache(path=str(tmp_path / "llm.db"), mode="off")
+
+    assert cache.wrap(llm).call(MESSAGES) == "answer 1"
+    assert llm.call(MESSAGES) == "answer 2"
+    assert "call" not in vars(llm)
+
+
+def test_wrapping_twice_does_not_double_cache(tmp_path):
+    cache = LLMCache(path=str(tmp_path / "llm.db"), mode="readwrite")
+    llm = cache.wrap(FakeLLM())
+    call = llm.call
+
+    assert cache.wrap(llm).call is call
+
+
+def test_unknown_mode_disables_the_cache(tmp_path):
+    assert LLMCache(path=str(tmp_path / "llm.db"), mode="sometimes").enabled is False
@@ -0,0 +1,124 @@
+import pytest
+
+from podcast.src.podcast import ollama_pool
+from podcast.src.podcast.ollama_pool import OllamaPool
+
+URLS = ["http://node-a:11434", "http://node-b:11434", "http://node-c:11434"]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ollama_pool.time, "time", lambda: now[0])
+    return now
+
+
+def make_pool(**kwargs):
+    kwargs.setdefault("eject_after", 2)
+    kwargs.setdefault("eject_seconds", 30)
+    return OllamaPool(URLS, probe=False, **kwargs)
+
+
+def call_on(pool, endpoint, ok):
+    """Run one call on ``endpoint``."""
+    assert pool.acquire(exclude=[other for other in pool.endpoints if other is not endpoint]) is endpoint
+    pool.release(endpoint, 5.0, ok=ok)
+
+
+class FakeLLM:
+    model = "ollama/llama3"
+
+    def __init__(self, failing_urls=()):
+        self.failing_urls = set(failing_urls)
+        self.base_url = self.api_base = None
+        self.calls = []
+
+    def call(self, prompt):
+        self.calls.append(self.base_url)
+        if self.base_url in self.failing_urls:
+            raise ConnectionError(f"{self.base_url} unreachable")
+        return f"{prompt} from {self.base_url}"
+
+
+def test_least_in_flight_endpoint_is_picked():
+    pool = make_pool()
+    first = pool.acquire()
+    second = pool.acquire()
+    third = pool.acquire()
+    assert {first.url, second.url, third.url} == set(URLS)
+
+    pool.release(second, 10.0)
+    assert pool.acquire() is second
+
+
+def test_ties_go_to_the_lowest_latency():
+    pool = make_pool()
+    endpoints = [pool.acquire() for _ in URLS]
+    for endpoint, latency in zip(endpoints, (300.0, 50.0, 120.0)):
+        pool.release(endpoint, latency)
+
+    assert pool.acquire() is endpoints[1]
+
+
+def test_endpoint_is_ejected_after_consecutive_failures(clock):
+    pool = make_pool()
+    node_a = pool.endpoints[0]
+    call_on(pool, node_a, ok=False)
+    call_on(pool, node_a, ok=False)
+
+    assert node_a.url not in pool.healthy_urls()
+    assert all(pool.acquire() is not node_a for _ in range(6))
+    assert pool.stats()["endpoints"][0]["ejected_for"] == 30
+
+
+def test_success_resets_the_failure_count(clock):
+    pool = make_pool()
+    node_a = pool.endpoints[0]
+    call_on(pool, node_a, ok=False)
+    call_on(pool, node_a, ok=True)
+    call_on(pool, node_a, ok=False)
+
+    assert node_a.url in pool.healthy_urls()
+
+
+def test_ejected_endpoint_is_readmitted_after_eject_seconds(clock):
+    pool = make_pool()
+    node_a = pool.endpoints[0]
+    call_on(pool, node_a, ok=False)
+    call_on(pool, node_a, ok=False)
+
+    clock[0] += 29
+    assert node_a.url not in pool.healthy_urls()
+    clock[0] += 1
+    assert node_a.url in pool.healthy_urls()
+    assert node_a in [pool.acquire() for _ in URLS]
+
+
+def test_single_endpoint_is_never_ejected(clock):
+    pool = OllamaPool(URLS[:1], probe=False, eject_after=1)
+    call_on(pool, pool.endpoints[0], ok=False)
+
+    assert pool.healthy_urls() == URLS[:1]
+
+
+def test_failed_call_is_retried_once_on_another_endpoint():
+    pool = make_pool()
+    llm = pool.wrap(FakeLLM(failing_urls=[URLS[0]]))
+    # Make node-a the preferred endpoint
+    for endpoint in pool.endpoints[1:]:
+        endpoint.outstanding = 1
+
+    assert llm.call("bonjour") == f"bonjour from {llm.calls[1]}"
+    assert llm.calls[0] == URLS[0] and llm.calls[1] != URLS[0]
+    assert pool.endpoints[0].failures == 1
+
+
+def test_call_fails_after_the_retry():
+    pool = make_pool()
+    llm = pool.wrap(FakeLLM(failing_urls=URLS))
+
+    with pytest.raises(ConnectionError):
+        llm.call("bonjour")
+    assert len(llm.calls) == 2
+    assert len(set(llm.calls)) == 2
+    assert all(endpoint.outstanding == 0 for endpoint in pool.endpoints)
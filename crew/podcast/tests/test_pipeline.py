@@ -0,0 +1,120 @@
+import threading
+
+from podcast.src.podcast.audio_assembly import silence_frame
+from podcast.src.podcast.crew import PodcastCrew
+from podcast.src.podcast.pipeline import VoicePipeline
+from podcast.src.podcast.script_parser import parse_script
+
+HOSTS = ["Alex", "Simon"]
+
+SCRIPT = """# Épisode
+Alex: Bonjour tout le monde.
+Aujourd'hui on parle de pipelines.
+Simon: Salut Alex!
+C'est un sujet
+sur plusieurs lignes.
+## Conclusion
+Alex: Merci d'avoir écouté.
+À bientôt."""
+
+FRAME = silence_frame({"version": 3, "layer": 3, "bitrate": 128000, "sample_rate": 44100, "channels": 1})
+
+
+class FakeTool:
+    """ElevenLabsTool stand-in returning a few silent frames per segment."""
+
+    api_key = "test"
+
+    def __init__(self):
+        self.requests = []
+        self.fallbacks = 0
+        self._lock = threading.Lock()
+
+    def assign_host_voices(self, hosts):
+        return {host: host.lower() for host in hosts}
+
+    def parse_podcast_script(self, script, hosts):
+        return parse_script(script, hosts)
+
+    def _resolve_voice_id(self, voice_id):
+        return voice_id
+
+    def _request_audio(self, text, voice_id):
+        with self._lock:
+            self.requests.append(text)
+        return FRAME * 3
+
+    def save_podcast_metadata(self, script, hosts, host_voices, segment_count, failed_segments,
+                              assembly, output_path):
+        return {"success": True, "segments": segment_count, "failed": failed_segments, "assembly": assembly}
+
+    def process_podcast_script(self, script, hosts, output_path, progress_callback=None, live=None):
+        self.fallbacks += 1
+        return {"success": True, "fallback": True}
+
+
+def test_chunked_multi_line_script_is_not_synthesized_again(tmp_path):
+    tool = FakeTool()
+    pipeline = VoicePipeline(tool, HOSTS, str(tmp_path / "episode.mp3"), max_in_flight=2)
+    for start in range(0, len(SCRIPT), 7):
+        pipeline.feed(SCRIPT[start:start + 7])
+
+    result = pipeline.finish(SCRIPT)
+
+    assert tool.fallbacks == 0
+    assert result["segments"] == 3
+    assert result["failed"] == []
+    assert sorted(tool.requests) == sorted(segment["text"] for segment in parse_script(SCRIPT, HOSTS))
+    assert (tmp_path / "episode.mp3").read_bytes() == FRAME * 9
+
+
+class TaskOutput:
+    def __init__(self, name, raw):
+        self.name = name
+        self.raw = raw
+
+
+AUDIO_NOTES = """Notes de production
+Alex: voix posée, rythme lent.
+Simon: voix énergique."""
+
+
+def test_script_writer_output_is_the_final_script(tmp_path, monkeypatch):
+    tool = FakeTool()
+    pipeline = VoicePipeline(tool, HOSTS, str(tmp_path / "episode.mp3"))
+    crew = PodcastCrew("Pipelines", HOSTS, stream_callback=lambda stage, text, offset: None)
+
+    def kickoff():
+        # The script writer streams the script, the audio director's notes are the crew's final output
+        for start in range(0, len(SCRIPT), 5):
+            pipeline.feed(SCRIPT[start:start + 5])
+        for name, raw in (("research_task", "Sources"), ("topic_curation_task", "Sujets"),
+                          ("script_writing_task", SCRIPT), ("audio_production_task", AUDIO_NOTES)):
+            crew._on_task_done(TaskOutput(name, raw))
+        return crew._convert_string_result(AUDIO_NOTES)
+
+    monkeypatch.setattr(crew, "_kickoff", kickoff)
+    result = crew.run()
+
+    assert result["script"] == SCRIPT
+    assert pipeline.finish(result["script"])["segments"] == 3
+    assert tool.fallbacks == 0
+
+
+def test_resumed_crew_returns_the_checkpointed_script():
+    completed = {"research_task": "Sources", "topic_curation_task": "Sujets",
+                 "script_writing_task": SCRIPT, "audio_production_task": AUDIO_NOTES}
+
+    assert PodcastCrew("Pipelines", HOSTS, completed=completed).run()["script"] == SCRIPT
+
+
+def test_final_script_differing_from_the_stream_falls_back(tmp_path):
+    tool = FakeTool()
+    pipeline = VoicePipeline(tool, HOSTS, str(tmp_path / "episode.mp3"))
+    pipeline.feed("Alex: Une première version.\nSimon: Qui change.\n")
+
+    result = pipeline.finish("Alex: Une autre version.\nSimon: Qui change.")
+
+    assert result["fallback"] is True
+    assert tool.fallbacks == 1
+    assert not (tmp_path / "episode.mp3.part").exists()
@@ -0,0 +1,45 @@
+import json
+import threading
+
+from podcast.src.podcast.research import ResearchEngine, normalize_url
+
+ANGLES = [{"name": f"Angle {i}", "query": f"{{topic}} angle {i}"} for i in range(8)]
+
+
+def search(query, num_results):
+    number = query.rsplit(" ", 1)[-1]
+    return json.dumps({"results": [
+        {"title": f"Résultat {number}", "url": f"https://www.example.com/{number}?utm_source=x", "snippet": query},
+        {"title": "Commun", "url": "https://example.com/commun/", "snippet": query},
+    ]})
+
+
+def test_concurrent_progress_is_reported_one_call_at_a_time():
+    calls = []
+    inside = []
+    overlaps = []
+
+    def progress(message):
+        inside.append(message)
+        if len(inside) > 1:
+            overlaps.append(message)
+        threading.Event().wait(0.005)
+        calls.append(message)
+        inside.remove(message)
+
+    engine = ResearchEngine(search, max_concurrency=8, angles=ANGLES)
+    research = engine.run("IA", progress=progress, current_year="2026")
+
+    assert overlaps == []
+    assert [message.split(" ")[1] for message in calls] == [f"{done}/8" for done in range(1, 9)]
+    assert len(research["topics"]) == 8
+
+
+def test_results_are_merged_by_normalized_url():
+    engine = ResearchEngine(search, max_concurrency=4, angles=ANGLES)
+    research = engine.run("IA", current_year="2026")
+
+    urls = [normalize_url(source["url"]) for source in research["sources"]]
+    assert len(urls) == len(set(urls)) == 9
+    # Found by every query, ranked first
+    assert research["sources"][0]["title"] == "Commun"
@@ -0,0 +1,154 @@
+import threading
+
+from podcast.src.podcast.scheduler import (PRIORITY_HIGH, PRIORITY_LOW, JobQueue, JobScheduler,
+                                           parse_stage_limits)
+
+
+class Job:
+    def __init__(self, job_id):
+        self.id = job_id
+
+
+def jobs(*ids):
+    return [Job(job_id) for job_id in ids]
+
+
+class BlockingRunner:
+    """Runner holding every job until it is released."""
+
+    def __init__(self):
+        self.started = []
+        self.release = threading.Event()
+        self._cond = threading.Condition()
+
+    def __call__(self, job):
+        with self._cond:
+            self.started.append(job.id)
+            self._cond.notify_all()
+        self.release.wait(5)
+
+    def wait_started(self, count):
+        with self._cond:
+            return self._cond.wait_for(lambda: len(self.started) >= count, 5)
+
+
+def test_parse_stage_limits():
+    assert parse_stage_limits("research=8, script=2,voice=0,bad,tts=x") == {"research": 8, "script": 2, "voice": 1}
+    assert parse_stage_limits("") == {}
+
+
+def test_queue_positions_are_fifo():
+    queue = JobQueue()
+    a, b, c = jobs("a", "b", "c")
+
+    assert [queue.put(job) for job in (a, b, c)] == [1, 2, 3]
+    assert queue.position("c") == 3
+    assert queue.get() is a
+    assert queue.position("a") is None
+    assert queue.position("c") == 2
+    assert len(queue) == 2
+
+
+def test_higher_priority_jobs_are_served_first():
+    queue = JobQueue()
+    low, normal, high = jobs("low", "normal", "high")
+    queue.put(low, PRIORITY_LOW)
+    queue.put(normal)
+
+    assert queue.put(high, PRIORITY_HIGH) == 1
+    assert [queue.get().id for _ in range(3)] == ["high", "normal", "low"]
+
+
+def test_groups_take_turns_and_positions_follow_the_turns():
+    queue = JobQueue()
+    for job in jobs("batch-1", "batch-2", "batch-3"):
+        queue.put(job, group="batch")
+    standalone = Job("standalone")
+
+    assert queue.put(standalone) == 2
+    assert [queue.get().id for _ in range(4)] == ["batch-1", "standalone", "batch-2", "batch-3"]
+
+
+def test_submit_reports_the_jobs_ahead_once_workers_are_busy():
+    runner = BlockingRunner()
+    scheduler = JobScheduler(runner, max_workers=2, stage_limits={})
+    scheduler.start()
+    try:
+        assert [scheduler.submit(job) for job in jobs("a", "b")] == [0, 0]
+        assert runner.wait_started(2)
+        assert scheduler.submit(Job("c")) == 1
+        assert scheduler.submit(Job("d")) == 2
+        assert scheduler.position("d") == 2
+        assert sorted(scheduler.running_ids()) == ["a", "b"]
+        assert scheduler.stats()["busy_workers"] == 2
+    finally:
+        runner.release.set()
+        scheduler.shutdown()
+    assert runner.wait_started(4)
+
+
+def test_stage_slots_limit_concurrency():
+    scheduler = JobScheduler(lambda job: None, max_workers=4, stage_limits={"voice": 1})
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def voice():
+        with scheduler.stage("voice"):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            threading.Event().wait(0.01)
+            with lock:
+                active.pop()
+
+    threads = [threading.Thread(target=voice) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert max(peak) == 1
+    assert scheduler.stats()["stage_active"] == {"voice": 0}
+
+
+def test_stages_without_limit_do_not_wait():
+    scheduler = JobScheduler(lambda job: None, max_workers=1, stage_limits={"voice": 1})
+    with scheduler.stage("research"), scheduler.stage("research"):
+        assert scheduler.stats()["stage_active"]["research"] == 2
+
+
+def test_shutdown_lets_queued_and_running_jobs_finish():
+    runner = BlockingRunner()
+    scheduler = JobScheduler(runner, max_workers=1, stage_limits={})
+    scheduler.start()
+    scheduler.submit(Job("running"))
+    assert runner.wait_started(1)
+    scheduler.submit(Job("queued"))
+
+    scheduler.shutdown()
+    runner.release.set()
+
+    for worker in scheduler._workers:
+        worker.join(5)
+        assert not worker.is_alive()
+    assert runner.started == ["running", "queued"]
+    assert scheduler.queue.get() is None
+
+
+def test_failing_jobs_free_their_worker():
+    done = threading.Event()
+
+    def runner(job):
+        if job.id == "fails":
+            raise RuntimeError("boom")
+        done.set()
+
+    scheduler = JobScheduler(runner, max_workers=1, stage_limits={})
+    scheduler.start()
+    try:
+        scheduler.submit(Job("fails"))
+        scheduler.submit(Job("runs"))
+        assert done.wait(5)
+    finally:
+        scheduler.shutdown()
@@ -0,0 +1,56 @@
+import pytest
+
+from podcast.src.podcast.script_parser import ScriptParser, iter_segments, parse_script
+
+HOSTS = ["Alex", "Simon"]
+
+SCRIPT = """# Le podcast
+Intro du narrateur.
+
+Alex: Bonjour tout le monde.
+On parle de techno aujourd'hui.
+  Avec une ligne indentée.
+Simon: Salut Alex!
+
+C'est parti.
+## Première section ##
+Alex: Premier sujet.
+Simon:Sans espace.
+Deuxième ligne.
+### Fin
+Alex: À la semaine prochaine."""
+
+
+def chunks(text, size):
+    return [text[start:start + size] for start in range(0, len(text), size)]
+
+
+def test_multi_line_turn_keeps_its_newlines():
+    assert parse_script("Alex: a\nb", HOSTS) == [{"host": "Alex", "text": "a\nb"}]
+
+
+def test_headings_close_segments_and_are_recorded():
+    parser = ScriptParser(HOSTS)
+    segments = parser.feed(SCRIPT) + parser.close()
+
+    assert parser.sections == ["Le podcast", "Première section", "Fin"]
+    assert segments == [
+        {"host": "narrator", "text": "Intro du narrateur."},
+        {"host": "Alex", "text": "Bonjour tout le monde.\nOn parle de techno aujourd'hui.\n  Avec une ligne indentée."},
+        {"host": "Simon", "text": "Salut Alex!\n\nC'est parti."},
+        {"host": "Alex", "text": "Premier sujet."},
+        {"host": "Simon", "text": "Sans espace.\nDeuxième ligne."},
+        {"host": "Alex", "text": "À la semaine prochaine."},
+    ]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 8, 16, 64, 1000])
+def test_chunked_parsing_matches_whole_script(size):
+    assert list(iter_segments(chunks(SCRIPT, size), HOSTS)) == parse_script(SCRIPT, HOSTS)
+
+
+def test_segments_are_returned_once_closed():
+    parser = ScriptParser(HOSTS)
+    assert parser.feed("Alex: Bonjour\nla suite") == []
+    assert parser.feed("\nSimon: Salut\n") == [{"host": "Alex", "text": "Bonjour\nla suite"}]
+    assert parser.close() == [{"host": "Simon", "text": "Salut"}]
@@ -0,0 +1,134 @@
+import threading
+
+import pytest
+
+from podcast.src.podcast import synthesis
+from podcast.src.podcast.synthesis import call_with_retries, is_retryable, retry_delay, synthesize_segments
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class HTTPError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"{status_code} error")
+        self.response = FakeResponse(status_code, headers)
+
+
+class ConnectionError(Exception):
+    pass
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(synthesis.time, "sleep", delays.append)
+    return delays
+
+
+def failing(errors, result="audio"):
+    """A request raising ``errors`` in turn, then returning ``result``."""
+    calls = []
+
+    def request():
+        calls.append(len(calls))
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+
+    request.calls = calls
+    return request
+
+
+def test_is_retryable():
+    assert is_retryable(HTTPError(429))
+    assert is_retryable(HTTPError(503))
+    assert is_retryable(ConnectionError())
+    assert not is_retryable(HTTPError(400))
+    assert not is_retryable(HTTPError(401))
+    assert not is_retryable(ValueError())
+
+
+def test_retry_delay_honors_retry_after():
+    assert retry_delay(HTTPError(429, {"Retry-After": "7"}), 0, 1.0) == 7.0
+    assert retry_delay(HTTPError(429, {"Retry-After": "3600"}), 0, 1.0) == 60.0
+    # Dates are not parsed, the exponential backoff is used instead
+    assert 4.0 <= retry_delay(HTTPError(429, {"Retry-After": "Wed, 21 Oct 2026 07:28:00 GMT"}), 2, 1.0) <= 5.0
+
+
+def test_rate_limit_waits_for_retry_after(sleeps):
+    request = failing([HTTPError(429, {"Retry-After": "2"})])
+
+    assert call_with_retries(request, retries=3, backoff=1.0) == "audio"
+    assert len(request.calls) == 2
+    assert sleeps == [2.0]
+
+
+def test_server_error_then_success(sleeps):
+    request = failing([HTTPError(502)])
+
+    assert call_with_retries(request, retries=3, backoff=0.5) == "audio"
+    assert len(request.calls) == 2
+    assert len(sleeps) == 1 and 0.5 <= sleeps[0] <= 1.0
+
+
+def test_retries_exhausted(sleeps):
+    request = failing([HTTPError(503)] * 5)
+
+    with pytest.raises(HTTPError):
+        call_with_retries(request, retries=2, backoff=1.0)
+    assert len(request.calls) == 3
+    assert len(sleeps) == 2
+
+
+def test_client_errors_are_not_retried(sleeps):
+    request = failing([HTTPError(401)])
+
+    with pytest.raises(HTTPError):
+        call_with_retries(request, retries=3, backoff=1.0)
+    assert len(request.calls) == 1
+    assert sleeps == []
+
+
+def test_results_are_in_script_order_when_completions_are_not(sleeps):
+    segments = [{"host": "Alex", "text": f"segment {i}"} for i in range(4)]
+    # Segments finish in reverse order: each one waits until the next one is done
+    finished = [threading.Event() for _ in segments]
+    completions = []
+
+    def synthesize(index, segment):
+        if index + 1 < len(segments):
+            assert finished[index + 1].wait(5)
+        completions.append(index)
+        finished[index].set()
+        return segment["text"].upper()
+
+    progress = []
+    results = synthesize_segments(segments, synthesize, max_in_flight=4, retries=0, backoff=0,
+                                  progress=lambda done, total, result: progress.append((done, total)))
+
+    assert completions == [3, 2, 1, 0]
+    assert [result["index"] for result in results] == [0, 1, 2, 3]
+    assert [result["result"] for result in results] == ["SEGMENT 0", "SEGMENT 1", "SEGMENT 2", "SEGMENT 3"]
+    assert all(result["success"] for result in results)
+    assert progress == [(1, 4), (2, 4), (3, 4), (4, 4)]
+
+
+def test_failed_segments_are_reported_in_place(sleeps):
+    segments = [{"host": "Alex", "text": "ok"}, {"host": "Simon", "text": "ko"}, {"host": "Alex", "text": "ok"}]
+    errors = {1: [HTTPError(503)] * 3}
+
+    def synthesize(index, segment):
+        if errors.get(index):
+            raise errors[index].pop()
+        return index
+
+    results = synthesize_segments(segments, synthesize, max_in_flight=2, retries=1, backoff=0)
+
+    assert [result["success"] for result in results] == [True, False, True]
+    assert results[1]["error"] == "503 error"
+    # One attempt and one retry
+    assert len(errors[1]) == 1
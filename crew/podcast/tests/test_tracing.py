@@ -0,0 +1,117 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from podcast.src.podcast import tracing
+from podcast.src.podcast.tracing import (
+    Trace, TraceStore, add_event, finish_span, get_trace, span, start_span, trace_job, traced,
+)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.delenv("PODCAST_PROFILE_SAMPLE_RATE", raising=False)
+    store = TraceStore(str(tmp_path / "traces.db"))
+    monkeypatch.setattr(tracing, "_store", store)
+    return store
+
+
+def spans(trace):
+    """Exported spans keyed by name, with their parent's name."""
+    events = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    names = {event["args"]["span_id"]: event["name"] for event in events}
+    return {event["name"]: names.get(event["args"]["parent_id"]) for event in events}
+
+
+def test_spans_nest_under_the_open_span(store):
+    with trace_job("job") as trace:
+        with span("research", "stage"):
+            with span("search", "tool"):
+                pass
+        with span("script", "stage"):
+            pass
+
+    assert spans(trace.to_chrome()) == {"job": None, "research": "job", "search": "research", "script": "job"}
+
+
+def test_traced_keeps_the_parent_on_pool_threads(store):
+    def synthesize(index):
+        with span(f"segment {index}", "tts"):
+            return threading.current_thread().name
+
+    with trace_job("job") as trace:
+        with span("voice", "stage"):
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                threads = list(pool.map(traced(synthesize), range(6)))
+        # Without traced() the pool threads have no current span
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pool.submit(synthesize, 99).result()
+
+    parents = spans(trace.to_chrome())
+    assert all(parents[f"segment {index}"] == "voice" for index in range(6))
+    assert "segment 99" not in parents
+    assert all(thread != threading.current_thread().name for thread in threads)
+
+
+def test_nothing_is_recorded_outside_a_job():
+    with span("orphan") as current:
+        assert current is None
+    assert start_span("orphan") is None
+    finish_span(None)
+    add_event("ignored")
+
+    def work():
+        return 42
+
+    assert traced(work) is work
+
+
+def test_start_span_is_current_until_finished(store):
+    with trace_job("job") as trace:
+        task = start_span("script_writing_task", "task")
+        with span("llm", "llm"):
+            pass
+        finish_span(task)
+        with span("after", "stage"):
+            pass
+
+    assert spans(trace.to_chrome()) == {
+        "job": None, "script_writing_task": "job", "llm": "script_writing_task", "after": "job",
+    }
+
+
+def test_errors_are_recorded_on_the_span(store):
+    with pytest.raises(ValueError):
+        with trace_job("job") as trace:
+            with span("tts"):
+                raise ValueError("quota")
+
+    (tts,) = [event for event in trace.to_chrome()["traceEvents"] if event["name"] == "tts"]
+    assert tts["args"]["error"] == "ValueError: quota"
+
+
+def test_finished_traces_are_stored(store):
+    with trace_job("job", topic="Pipelines"):
+        assert get_trace("job")["otherData"]["job_id"] == "job"
+        add_event("Research started", stage="research")
+
+    stored = store.load("job")
+    assert stored == get_trace("job")
+    (root,) = [event for event in stored["traceEvents"] if event["name"] == "job"]
+    assert root["args"]["topic"] == "Pipelines"
+    assert [event["name"] for event in stored["traceEvents"] if event["ph"] == "i"] == ["Research started"]
+    assert get_trace("unknown") is None
+
+
+def test_spans_beyond_the_limit_are_dropped():
+    trace = Trace("job", max_spans=2)
+    root = trace.open("job", "job")
+    for index in range(3):
+        trace.open(f"span {index}", "function", root).finish()
+
+    exported = trace.to_chrome()
+    assert exported["otherData"]["dropped_spans"] == 1
+    assert spans(exported) == {"job": None, "span 0": "job", "span 1": "job"}
+    (running,) = [event for event in exported["traceEvents"] if event["name"] == "job"]
+    assert running["args"]["running"] is True
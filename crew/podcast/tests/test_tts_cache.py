@@ -0,0 +1,81 @@
+import os
+import time
+
+from podcast.src.podcast.tts_cache import STALE_TEMP_SECONDS, TTSCache, cache_key
+
+
+def key(text):
+    return cache_key(text, "alex", "eleven_multilingual_v2", {"stability": 0.7, "similarity_boost": 0.75})
+
+
+def test_key_depends_on_every_setting():
+    assert key("Bonjour") == key("Bonjour")
+    assert key("Bonjour") != key("Salut")
+    assert key("Bonjour") != cache_key("Bonjour", "simon", "eleven_multilingual_v2",
+                                       {"stability": 0.7, "similarity_boost": 0.75})
+
+
+def test_hit_and_miss(tmp_path):
+    cache = TTSCache(directory=str(tmp_path), max_bytes=1024)
+
+    assert cache.get(key("Bonjour")) is None
+    cache.put(key("Bonjour"), b"audio")
+    assert cache.get(key("Bonjour")) == b"audio"
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"], stats["bytes"]) == (1, 1, 1, 5)
+
+
+def test_write_is_atomic(tmp_path):
+    cache = TTSCache(directory=str(tmp_path), max_bytes=1024)
+    cache.put(key("Bonjour"), b"audio")
+    cache.put(key("Bonjour"), b"autre audio")
+
+    files = [name for _, _, names in os.walk(tmp_path) for name in names]
+    assert files == [f"{key('Bonjour')}.mp3"]
+    assert cache.get(key("Bonjour")) == b"autre audio"
+    assert cache.stats()["bytes"] == len(b"autre audio")
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = TTSCache(directory=str(tmp_path), max_bytes=10)
+    cache.put(key("un"), b"1111")
+    cache.put(key("deux"), b"2222")
+    assert cache.get(key("un")) == b"1111"
+    cache.put(key("trois"), b"3333")
+
+    assert cache.get(key("deux")) is None
+    assert cache.get(key("un")) == b"1111"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_on_disk_are_indexed_on_open(tmp_path):
+    TTSCache(directory=str(tmp_path), max_bytes=1024).put(key("Bonjour"), b"audio")
+
+    assert TTSCache(directory=str(tmp_path), max_bytes=1024).get(key("Bonjour")) == b"audio"
+
+
+def test_stale_temporary_files_are_removed_on_open(tmp_path):
+    directory = tmp_path / "ab"
+    directory.mkdir()
+    stale = directory / "crashed.tmp"
+    stale.write_bytes(b"partial")
+    old = time.time() - STALE_TEMP_SECONDS - 1
+    os.utime(stale, (old, old))
+    # Possibly still being written by another worker
+    recent = directory / "writing.tmp"
+    recent.write_bytes(b"partial")
+
+    cache = TTSCache(directory=str(tmp_path), max_bytes=1024)
+
+    assert not stale.exists()
+    assert recent.exists()
+    assert cache.stats()["entries"] == 0
+
+
+def test_disabled_cache_stores_nothing(tmp_path):
+    cache = TTSCache(directory=str(tmp_path / "cache"), max_bytes=0)
+    cache.put(key("Bonjour"), b"audio")
+
+    assert cache.get(key("Bonjour")) is None
+    assert not (tmp_path / "cache").exists()
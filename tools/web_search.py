@@ -5,9 +5,27 @@ import json
 import random
 import time
 import os
+import logging
 import requests
 from datetime import datetime, timedelta
 
+logger = logging.getLogger(__name__)
+
+try:
+    # Share the pooled sessions and search cache of the podcast app when it is importable
+    from podcast.src.podcast.search_cache import get_search_cache
+except ModuleNotFoundError as e:
+    # Only a missing podcast app selects the fallback, errors inside the app are raised
+    if e.name != "podcast" and not (e.name or "").startswith("podcast."):
+        raise
+    logger.info("Podcast app not importable, web search uses plain requests without the shared search cache")
+    get_http_client = None
+    get_research_index = None
+    get_search_cache = None
+else:
+    from podcast.src.podcast.http_client import get_http_client
+    from podcast.src.podcast.research_index import get_research_index
+
 class WebSearchInput(BaseModel):
     """Input schema for WebSearchTool."""
     query: str = Field(description="The search query to look up")
@@ -47,42 +65,52 @@ class WebSearchTool(BaseTool):
             return self._simulate_results(query, num_results)
         
         try:
-            # Prepare request headers and data
-            headers = {
-                "X-API-KEY": self.api_key,
-                "Content-Type": "application/json"
-            }
-            data = {
-                "q": query,
-                "num": num_results
-            }
-            
-            # Make the API request
-            response = requests.post(self.base_url, headers=headers, json=data)
-            response.raise_for_status()
-            
-            # Process and return the results
-            results = []
-            raw_results = response.json()
-            
-            # Extract organic search results
-            if "organic" in raw_results:
-                for item in raw_results["organic"][:num_results]:
-                    results.append({
-                        "title": item.get("title", ""),
-                        "url": item.get("link", ""),
-                        "snippet": item.get("snippet", ""),
-                        "date": item.get("date", datetime.now().strftime("%Y-%m-%d"))
-                    })
-            
-            print(f"Found {len(results)} results for query: '{query}'")
-            return json.dumps({"results": results, "query": query}, indent=2)
-            
+            if get_search_cache is None:
+                return self._search(query, num_results)
+            # Identical queries share one request and results are reused across jobs
+            return get_search_cache().get_or_fetch(query, num_results, lambda: self._search(query, num_results))
         except Exception as e:
             # Log the error and fall back to simulated results
             print(f"Serper API error: {str(e)}")
             return self._simulate_results(query, num_results)
     
+    def _search(self, query: str, num_results: int) -> str:
+        """Query the Serper.dev API and return the results as a JSON string."""
+        # Prepare request headers and data
+        headers = {
+            "X-API-KEY": self.api_key,
+            "Content-Type": "application/json"
+        }
+        data = {
+            "q": query,
+            "num": num_results
+        }
+        
+        # Make the API request
+        http = get_http_client() if get_http_client else requests
+        response = http.post(self.base_url, headers=headers, json=data, timeout=10)
+        response.raise_for_status()
+        
+        # Process and return the results
+        results = []
+        raw_results = response.json()
+        
+        # Extract organic search results
+        if "organic" in raw_results:
+            for item in raw_results["organic"][:num_results]:
+                results.append({
+                    "title": item.get("title", ""),
+                    "url": item.get("link", ""),
+                    "snippet": item.get("snippet", ""),
+                    "date": item.get("date", datetime.now().strftime("%Y-%m-%d"))
+                })
+        
+        print(f"Found {len(results)} results for query: '{query}'")
+        if get_research_index is not None:
+            # Keep every fetched result so later jobs can reuse it without searching
+            get_research_index().add(results, query)
+        return json.dumps({"results": results, "query": query}, indent=2)
+    
     def _simulate_results(self, query: str, num_results: int = 5) -> str:
         """Simulate search results when API key is not available or API fails."""
         # Generate current date for results